@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Destination, Hotel, Transport, Attraction, TravelPackage, SearchHistory
+from .models import Destination, CityCode, Hotel, Transport, Attraction, TravelPackage, SearchHistory
 
 
 @admin.register(Destination)
@@ -10,9 +10,18 @@ class DestinationAdmin(admin.ModelAdmin):
     ordering = ['name']
 
 
+@admin.register(CityCode)
+class CityCodeAdmin(admin.ModelAdmin):
+    list_display = ['name', 'iata_code', 'country_code', 'source', 'updated_at']
+    list_filter = ['source', 'country_code']
+    search_fields = ['name', 'iata_code']
+    ordering = ['name']
+
+
 @admin.register(Hotel)
 class HotelAdmin(admin.ModelAdmin):
     list_display = ['name', 'destination', 'star_rating', 'price_per_night', 'rating', 'is_available']
+    list_select_related = ['destination']
     list_filter = ['star_rating', 'is_available', 'destination__country']
     search_fields = ['name', 'destination__city']
     ordering = ['-rating']
@@ -21,6 +30,7 @@ class HotelAdmin(admin.ModelAdmin):
 @admin.register(Transport)
 class TransportAdmin(admin.ModelAdmin):
     list_display = ['name', 'transport_type', 'destination', 'provider', 'price_per_person', 'is_available']
+    list_select_related = ['destination']
     list_filter = ['transport_type', 'is_available']
     search_fields = ['name', 'provider']
     ordering = ['transport_type', 'price_per_person']
@@ -29,6 +39,7 @@ class TransportAdmin(admin.ModelAdmin):
 @admin.register(Attraction)
 class AttractionAdmin(admin.ModelAdmin):
     list_display = ['name', 'destination', 'category', 'price_per_person', 'rating', 'is_available']
+    list_select_related = ['destination']
     list_filter = ['category', 'is_available', 'destination__country']
     search_fields = ['name', 'destination__city']
     ordering = ['-rating']
@@ -37,6 +48,7 @@ class AttractionAdmin(admin.ModelAdmin):
 @admin.register(TravelPackage)
 class TravelPackageAdmin(admin.ModelAdmin):
     list_display = ['name', 'destination', 'duration_days', 'base_price', 'is_featured', 'is_available']
+    list_select_related = ['destination']
     list_filter = ['is_featured', 'is_available', 'destination__country']
     search_fields = ['name', 'destination__city']
     filter_horizontal = ['hotels', 'transports', 'attractions']
@@ -4,9 +4,54 @@ No external AI API required. Fast, reliable, and always available.
 """
 
 import random
-from typing import Dict, List, Any
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterator, List, Any, NamedTuple, Tuple
 from datetime import datetime, timedelta
 
+from .fields import Fields, project, wants
+from .services import mock_rng
+
+
+class TravelTypeConfig(NamedTuple):
+    """Activities of one or more merged travel types"""
+    description: str
+    morning_activities: Tuple[str, ...]
+    afternoon_activities: Tuple[str, ...]
+    evening_activities: Tuple[str, ...]
+
+
+def compile_travel_types(travel_types: Dict[str, Dict]) -> Dict[FrozenSet[str], TravelTypeConfig]:
+    """
+    Merged activity tables for every combination of travel types (including
+    none), built once so requests only look one up.
+    """
+    compiled = {}
+    names = list(travel_types)
+    for size in range(len(names) + 1):
+        for combo in combinations(names, size):
+            configs = [travel_types[name] for name in combo]
+            compiled[frozenset(combo)] = TravelTypeConfig(
+                description='; '.join(config['description'] for config in configs),
+                morning_activities=tuple(a for config in configs for a in config['morning_activities']),
+                afternoon_activities=tuple(a for config in configs for a in config['afternoon_activities']),
+                evening_activities=tuple(a for config in configs for a in config['evening_activities']),
+            )
+    return compiled
+
+
+def schedule_attractions(attractions: List[Dict]) -> Iterator[Dict]:
+    """
+    Attractions in order, skipping any whose name was already handed out.
+    One pass with a set of used names, so a whole itinerary is linear in
+    days + attractions.
+    """
+    used = set()
+    for attraction in attractions:
+        name = attraction.get('name')
+        if name not in used:
+            used.add(name)
+            yield attraction
+
 
 class TravelPlannerService:
     """
@@ -190,6 +235,95 @@ class TravelPlannerService:
         }
     }
     
+    # Every travel-type combination, keyed by frozenset of type names
+    COMPILED_TRAVEL_TYPES = compile_travel_types(TRAVEL_TYPES)
+    
+    AVAILABLE_TRAVEL_TYPES = tuple(
+        {'id': key, 'name': key.title(), 'description': value['description']}
+        for key, value in TRAVEL_TYPES.items()
+    )
+    
+    GENERAL_TIPS = (
+        "Best time to visit {destination}: Check local weather patterns",
+        "Download offline maps before your trip",
+        "Keep emergency contact numbers handy",
+        "Try local cuisine for authentic experiences",
+        "Book popular attractions in advance"
+    )
+    
+    TYPE_TIPS = {
+        'nature': (
+            "Pack layers for changing weather",
+            "Bring a reusable water bottle",
+            "Wear comfortable hiking shoes",
+            "Carry sunscreen and insect repellent"
+        ),
+        'culture': (
+            "Research local customs before visiting",
+            "Dress modestly when visiting religious sites",
+            "Consider hiring a local guide",
+            "Visit museums on weekday mornings to avoid crowds"
+        ),
+        'food': (
+            "Ask locals for restaurant recommendations",
+            "Try street food for authentic flavors",
+            "Book popular restaurants in advance",
+            "Take a cooking class to learn local recipes"
+        ),
+        'adventure': (
+            "Check equipment safety before activities",
+            "Get travel insurance that covers adventure sports",
+            "Stay hydrated during physical activities",
+            "Know your limits and listen to guides"
+        ),
+        'relaxation': (
+            "Book spa treatments in advance",
+            "Bring a good book or download podcasts",
+            "Disconnect from work emails",
+            "Try local wellness practices"
+        )
+    }
+    
+    HOTEL_TIPS = {
+        'luxury': (
+            "Book directly with the hotel for potential upgrades",
+            "Ask about spa packages and fine dining reservations"
+        ),
+        'boutique': (
+            "These hotels often have unique local experiences",
+            "Ask the concierge for insider local recommendations"
+        ),
+        'resort': (
+            "Check what's included in your all-inclusive package",
+            "Book activities early as they fill up fast"
+        ),
+        'mid-range': (
+            "Check for loyalty programs for future discounts",
+            "Ask about included breakfast options"
+        ),
+        'budget': (
+            "Read recent reviews for cleanliness feedback",
+            "Location is key - ensure good public transport access"
+        ),
+        'hostel': (
+            "Bring a lock for your belongings",
+            "Join hostel activities to meet fellow travelers"
+        ),
+        'apartment': (
+            "Stock up on groceries to save on dining",
+            "Ask the host for local tips and recommendations"
+        ),
+        'unique': (
+            "Read carefully what amenities are available",
+            "Book early as unique stays sell out quickly"
+        )
+    }
+    
+    DEFAULT_HOTEL_TIPS = (
+        "Book early for better rates",
+        "Check cancellation policies before booking"
+    )
+    
     def __init__(self):
         pass
     
@@ -205,7 +339,8 @@ class TravelPlannerService:
         hotels: List[Dict] = None,
         transports: List[Dict] = None,
         attractions: List[Dict] = None,
-        user_set_budget: bool = False
+        user_set_budget: bool = False,
+        fields: Fields = None
     ) -> Dict[str, Any]:
         """
         Generate a personalized travel plan using templates and real data.
@@ -222,10 +357,154 @@ class TravelPlannerService:
             transports: List of available transport options
             attractions: List of available attractions
             user_set_budget: Whether user explicitly set the budget
+            fields: Plan fields to return (see fields.py). The itinerary
+                is only kept, and itinerary_text only rendered, when asked for.
         
         Returns:
             Complete travel plan with itinerary
         """
+        context = self._plan_context(
+            origin, destination, travel_type, hotel_preference, budget, num_days, num_people,
+            hotels, transports, attractions, user_set_budget
+        )
+        
+        # Generate day-by-day itinerary; without itinerary fields the days
+        # are only walked for their costs
+        itinerary = self._iter_itinerary(**self._itinerary_kwargs(context))
+        keep_itinerary = wants(fields, 'itinerary')
+        keep_text = wants(fields, 'itinerary_text')
+        if keep_itinerary or keep_text:
+            itinerary = list(itinerary)
+        
+        # Calculate actual attraction costs from the generated itinerary
+        # Sum up all activity costs from each day (these are per-person costs)
+        itinerary_per_person_cost = 0
+        for day in itinerary:
+            for activity in day.get('activities', []):
+                itinerary_per_person_cost += activity.get('estimated_cost', 0)
+        
+        costs = self._plan_costs(context, itinerary_per_person_cost)
+        
+        return {
+            'success': True,
+            'budget_exceeded': costs['budget_exceeded'],
+            'budget_warning': costs['budget_warning'],
+            'plan': project({
+                'origin': origin,
+                'destination': destination,
+                'travel_type': travel_type,
+                'travel_types': context['travel_types'],
+                'hotel_preference': context['hotel_preference'],
+                'hotel_preference_description': context['hotel_pref']['description'],
+                'travel_type_description': context['travel_type_description'],
+                'budget': budget,
+                'budget_exceeded': costs['budget_exceeded'],
+                'budget_warning': costs['budget_warning'],
+                'num_days': num_days,
+                'num_people': num_people,
+                'daily_budget': context['daily_budget'],
+                'per_person_budget': context['per_person_budget'],
+                'itinerary': itinerary if keep_itinerary else None,
+                'itinerary_text': self._format_itinerary_text(itinerary, destination, travel_type, budget, num_people, num_days) if keep_text else None,
+                'recommended_hotel': context['recommended_hotel'],
+                'accommodation': context['accommodation'],
+                'recommended_transport': context['recommended_transport'],
+                'top_attractions': context['top_attractions'],
+                'cost_breakdown': costs['cost_breakdown'],
+                'tips': context['tips']
+            }, fields)
+        }
+    
+    def stream_travel_plan(
+        self,
+        origin: str,
+        destination: str,
+        travel_type: str,
+        hotel_preference: str = 'mid-range',
+        budget: int = 2000,
+        num_days: int = 5,
+        num_people: int = 2,
+        hotels: List[Dict] = None,
+        transports: List[Dict] = None,
+        attractions: List[Dict] = None,
+        user_set_budget: bool = False,
+        fields: Fields = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate the same plan as generate_travel_plan as (event, data) pairs:
+        'summary', 'accommodation', one 'day' per itinerary day, then 'costs'
+        and 'tips'.
+        
+        Days are generated one at a time and not kept, so the first events
+        don't wait on num_days and the whole itinerary is never in memory.
+        Each day carries its part of itinerary_text as 'text'.
+        
+        With fields, event data is projected the same way and events for
+        unrequested sections are left out; 'summary' and 'costs' (with
+        budget_exceeded/budget_warning) are always sent.
+        """
+        context = self._plan_context(
+            origin, destination, travel_type, hotel_preference, budget, num_days, num_people,
+            hotels, transports, attractions, user_set_budget
+        )
+        keep_itinerary = wants(fields, 'itinerary')
+        keep_text = wants(fields, 'itinerary_text')
+        
+        summary = project({
+            'origin': origin,
+            'destination': destination,
+            'travel_type': travel_type,
+            'travel_types': context['travel_types'],
+            'hotel_preference': context['hotel_preference'],
+            'hotel_preference_description': context['hotel_pref']['description'],
+            'travel_type_description': context['travel_type_description'],
+            'budget': budget,
+            'num_days': num_days,
+            'num_people': num_people,
+            'daily_budget': context['daily_budget'],
+            'per_person_budget': context['per_person_budget'],
+            'recommended_hotel': context['recommended_hotel'],
+            'recommended_transport': context['recommended_transport'],
+            'top_attractions': context['top_attractions']
+        }, fields)
+        if keep_text:
+            summary['text'] = "\n".join(self._itinerary_text_header(destination, travel_type, budget, num_people, num_days))
+        yield 'summary', summary
+        if wants(fields, 'accommodation'):
+            yield 'accommodation', {'accommodation': context['accommodation']}
+        
+        itinerary_per_person_cost = 0
+        for day in self._iter_itinerary(**self._itinerary_kwargs(context)):
+            for activity in day.get('activities', []):
+                itinerary_per_person_cost += activity.get('estimated_cost', 0)
+            if keep_itinerary or keep_text:
+                event = dict(day) if keep_itinerary else {'day': day['day']}
+                if keep_text:
+                    event['text'] = "\n".join(self._day_text_lines(day))
+                yield 'day', event
+        
+        yield 'costs', project(
+            self._plan_costs(context, itinerary_per_person_cost), fields,
+            always=('budget_exceeded', 'budget_warning')
+        )
+        if wants(fields, 'tips'):
+            yield 'tips', {'tips': context['tips']}
+    
+    def _plan_context(
+        self,
+        origin: str,
+        destination: str,
+        travel_type: str,
+        hotel_preference: str,
+        budget: int,
+        num_days: int,
+        num_people: int,
+        hotels: List[Dict],
+        transports: List[Dict],
+        attractions: List[Dict],
+        user_set_budget: bool
+    ) -> Dict[str, Any]:
+        """Everything about a plan that doesn't depend on the itinerary"""
         
         # Handle multiple travel types (comma-separated)
         travel_types_list = [t.strip().lower() for t in travel_type.split(',') if t.strip()]
@@ -253,23 +532,9 @@ class TravelPlannerService:
         daily_budget = budget // num_days if num_days > 0 else budget
         per_person_budget = budget // num_people if num_people > 0 else budget
         
-        # Generate day-by-day itinerary
-        itinerary = self._generate_itinerary(
-            destination=destination,
-            travel_type=travel_type,
-            travel_config=merged_config,
-            num_days=num_days,
-            daily_budget=daily_budget,
-            hotels=filtered_hotels,
-            transports=transports or [],
-            attractions=attractions or []
-        )
-        
         # Calculate costs
         hotel_cost = 0
         transport_cost = 0
-        attraction_cost_actual = 0
-        attraction_budget = 0
         
         recommended_hotel = None
         recommended_transport = None
@@ -282,25 +547,6 @@ class TravelPlannerService:
             recommended_transport = transports[0]
             transport_cost = recommended_transport.get('price_per_person', 0) * num_people
         
-        # Calculate actual attraction costs from the generated itinerary
-        # Sum up all activity costs from each day (these are per-person costs)
-        itinerary_per_person_cost = 0
-        for day in itinerary:
-            for activity in day.get('activities', []):
-                itinerary_per_person_cost += activity.get('estimated_cost', 0)
-        
-        # Multiply by num_people to get total activities cost
-        attraction_cost_actual = itinerary_per_person_cost * num_people
-        
-        # Calculate attraction budget (remaining from user's budget)
-        if user_set_budget:
-            attraction_budget = max(0, budget - hotel_cost - transport_cost)
-        else:
-            attraction_budget = attraction_cost_actual
-        
-        # Use actual costs for total estimation
-        total_estimated = hotel_cost + transport_cost + attraction_cost_actual
-        
         # Generate tips
         tips = self._generate_tips(destination, travel_types_list[0] if travel_types_list else 'culture')
         
@@ -333,10 +579,70 @@ class TravelPlannerService:
                 'image': recommended_hotel.get('image', recommended_hotel.get('image_url', ''))
             }
         
+        return {
+            'destination': destination,
+            'travel_type': travel_type,
+            'travel_types': travel_types_list,
+            'travel_config': merged_config,
+            'travel_type_description': combined_description,
+            'hotel_preference': hotel_preference,
+            'hotel_pref': hotel_pref,
+            'hotels': filtered_hotels,
+            'transports': transports or [],
+            'attractions': attractions or [],
+            'top_attractions': attractions[:5] if attractions else [],
+            'budget': budget,
+            'user_set_budget': user_set_budget,
+            'num_days': num_days,
+            'num_people': num_people,
+            'daily_budget': daily_budget,
+            'per_person_budget': per_person_budget,
+            'recommended_hotel': recommended_hotel,
+            'recommended_transport': recommended_transport,
+            'hotel_cost': hotel_cost,
+            'transport_cost': transport_cost,
+            'accommodation': accommodation,
+            'tips': tips
+        }
+    
+    def _itinerary_kwargs(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """_iter_itinerary arguments for a plan context"""
+        return {
+            'destination': context['destination'],
+            'travel_type': context['travel_type'],
+            'travel_config': context['travel_config'],
+            'num_days': context['num_days'],
+            'daily_budget': context['daily_budget'],
+            'hotels': context['hotels'],
+            'transports': context['transports'],
+            'attractions': context['attractions'],
+            # Activity picks come from a per-request RNG (seeded from the
+            # request in deterministic mode)
+            'rng': mock_rng('planner', context['destination'], context['travel_type'], context['num_days'])
+        }
+    
+    def _plan_costs(self, context: Dict[str, Any], itinerary_per_person_cost: float) -> Dict[str, Any]:
+        """Cost breakdown and budget warning once the itinerary's activity costs are known"""
+        budget = context['budget']
+        hotel_cost = context['hotel_cost']
+        transport_cost = context['transport_cost']
+        
+        # Multiply by num_people to get total activities cost
+        attraction_cost_actual = itinerary_per_person_cost * context['num_people']
+        
+        # Calculate attraction budget (remaining from user's budget)
+        if context['user_set_budget']:
+            attraction_budget = max(0, budget - hotel_cost - transport_cost)
+        else:
+            attraction_budget = attraction_cost_actual
+        
+        # Use actual costs for total estimation
+        total_estimated = hotel_cost + transport_cost + attraction_cost_actual
+        
         # Check if trip exceeds budget
         budget_warning = None
         budget_exceeded = False
-        if user_set_budget and total_estimated > budget:
+        if context['user_set_budget'] and total_estimated > budget:
             budget_exceeded = True
             over_budget_amount = total_estimated - budget
             budget_warning = {
@@ -348,85 +654,43 @@ class TravelPlannerService:
             }
         
         return {
-            'success': True,
             'budget_exceeded': budget_exceeded,
             'budget_warning': budget_warning,
-            'plan': {
-                'origin': origin,
-                'destination': destination,
-                'travel_type': travel_type,
-                'travel_types': travel_types_list,
-                'hotel_preference': hotel_preference,
-                'hotel_preference_description': hotel_pref['description'],
-                'travel_type_description': combined_description,
-                'budget': budget,
-                'budget_exceeded': budget_exceeded,
-                'budget_warning': budget_warning,
-                'num_days': num_days,
-                'num_people': num_people,
-                'daily_budget': daily_budget,
-                'per_person_budget': per_person_budget,
-                'itinerary': itinerary,
-                'itinerary_text': self._format_itinerary_text(itinerary, destination, travel_type, budget, num_people, num_days),
-                'recommended_hotel': recommended_hotel,
-                'accommodation': accommodation,
-                'recommended_transport': recommended_transport,
-                'top_attractions': attractions[:5] if attractions else [],
-                'cost_breakdown': {
-                    'hotel': hotel_cost,
-                    'transport': transport_cost,
-                    'activities_budget': attraction_budget,
-                    'activities_actual': attraction_cost_actual,
-                    'activities_per_person': itinerary_per_person_cost,
-                    'estimated_total': total_estimated,
-                    'remaining_budget': budget - total_estimated
-                },
-                'tips': tips
+            'cost_breakdown': {
+                'hotel': hotel_cost,
+                'transport': transport_cost,
+                'activities_budget': attraction_budget,
+                'activities_actual': attraction_cost_actual,
+                'activities_per_person': itinerary_per_person_cost,
+                'estimated_total': total_estimated,
+                'remaining_budget': budget - total_estimated
             }
         }
     
-    def _merge_travel_configs(self, travel_types: List[str]) -> Dict:
-        """Merge activities from multiple travel types"""
-        merged = {
-            'description': '',
-            'morning_activities': [],
-            'afternoon_activities': [],
-            'evening_activities': []
-        }
-        
-        descriptions = []
-        for travel_type in travel_types:
-            config = self.TRAVEL_TYPES.get(travel_type, {})
-            if config:
-                descriptions.append(config.get('description', ''))
-                merged['morning_activities'].extend(config.get('morning_activities', []))
-                merged['afternoon_activities'].extend(config.get('afternoon_activities', []))
-                merged['evening_activities'].extend(config.get('evening_activities', []))
-        
-        merged['description'] = '; '.join(descriptions)
-        
-        # Shuffle to mix activities from different types
-        random.shuffle(merged['morning_activities'])
-        random.shuffle(merged['afternoon_activities'])
-        random.shuffle(merged['evening_activities'])
-        
-        return merged
+    def _merge_travel_configs(self, travel_types: List[str]) -> TravelTypeConfig:
+        """Merged activities of the selected travel types (unknown types are ignored)"""
+        return self.COMPILED_TRAVEL_TYPES[frozenset(t for t in travel_types if t in self.TRAVEL_TYPES)]
+    
+    def _generate_itinerary(self, **kwargs) -> List[Dict]:
+        """Generate day-by-day itinerary"""
+        return list(self._iter_itinerary(**kwargs))
     
-    def _generate_itinerary(
+    def _iter_itinerary(
         self,
         destination: str,
         travel_type: str,
-        travel_config: Dict,
+        travel_config: TravelTypeConfig,
         num_days: int,
         daily_budget: int,
         hotels: List[Dict],
         transports: List[Dict],
-        attractions: List[Dict]
-    ) -> List[Dict]:
-        """Generate day-by-day itinerary"""
+        attractions: List[Dict],
+        rng: random.Random
+    ) -> Iterator[Dict]:
+        """Generate the itinerary one day at a time"""
         
-        itinerary = []
-        used_attractions = []
+        # Each day takes the next attraction with a name not yet scheduled
+        attraction_schedule = schedule_attractions(attractions)
         
         # Calculate actual activity budget from attractions
         total_attraction_cost = sum(a.get('price_per_person', 0) for a in attractions[:5]) if attractions else 0
@@ -469,7 +733,7 @@ class TravelPlannerService:
                         morning['description'] = f"Check into your hotel and settle in"
                     morning['estimated_cost'] = 0
             else:
-                morning['activity'] = random.choice(travel_config['morning_activities'])
+                morning['activity'] = rng.choice(travel_config.morning_activities)
                 morning['description'] = f"Start your day with this {travel_type} experience"
                 # Use free activities for morning walks/explorations
                 morning['estimated_cost'] = 0
@@ -485,15 +749,13 @@ class TravelPlannerService:
             }
             
             # Try to use real attractions
-            available_attractions = [a for a in attractions if a.get('name') not in used_attractions]
-            if available_attractions:
-                attraction = available_attractions[0]
-                used_attractions.append(attraction.get('name'))
+            attraction = next(attraction_schedule, None)
+            if attraction is not None:
                 afternoon['activity'] = f"Visit {attraction.get('name', 'local attraction')}"
                 afternoon['description'] = attraction.get('description', f"Visit the famous {attraction.get('name')} in {destination}")
                 afternoon['estimated_cost'] = attraction.get('price_per_person', 0)
             else:
-                afternoon['activity'] = random.choice(travel_config['afternoon_activities'])
+                afternoon['activity'] = rng.choice(travel_config.afternoon_activities)
                 afternoon['description'] = f"Enjoy {travel_type} activities in {destination}"
                 # Free afternoon activity (walking tour, exploring, etc.)
                 afternoon['estimated_cost'] = 0
@@ -517,7 +779,7 @@ class TravelPlannerService:
                     evening['description'] = "Check out, enjoy a final dinner, and prepare for your journey home"
                 evening['estimated_cost'] = 0
             else:
-                evening['activity'] = random.choice(travel_config['evening_activities'])
+                evening['activity'] = rng.choice(travel_config.evening_activities)
                 evening['description'] = f"End your day with a memorable {travel_type} experience"
                 # Evening activities are typically dining/entertainment, keep as included/free
                 evening['estimated_cost'] = 0
@@ -527,9 +789,7 @@ class TravelPlannerService:
             # Calculate day total (only paid activities)
             day_plan['day_total'] = sum(a['estimated_cost'] for a in day_plan['activities'])
             
-            itinerary.append(day_plan)
-        
-        return itinerary
+            yield day_plan
     
     def _format_itinerary_text(
         self,
@@ -542,77 +802,46 @@ class TravelPlannerService:
     ) -> str:
         """Format itinerary as readable text"""
         
-        lines = [
+        lines = self._itinerary_text_header(destination, travel_type, budget, num_people, num_days)
+        for day in itinerary:
+            lines.extend(self._day_text_lines(day))
+        
+        return "\n".join(lines)
+    
+    def _itinerary_text_header(
+        self,
+        destination: str,
+        travel_type: str,
+        budget: int,
+        num_people: int,
+        num_days: int
+    ) -> List[str]:
+        return [
             f"# {num_days}-Day {travel_type.title()} Trip to {destination}",
             f"**Total Budget:** ${budget} for {num_people} {'person' if num_people == 1 else 'people'}",
             f"**Daily Budget:** ${budget // num_days}",
             ""
         ]
-        
-        for day in itinerary:
-            lines.append(f"## {day['title']}")
-            lines.append("")
-            
-            for activity in day['activities']:
-                lines.append(f"**{activity['time']}**")
-                lines.append(f"- {activity['activity']}")
-                lines.append(f"  _{activity['description']}_")
-                if activity['estimated_cost'] > 0:
-                    lines.append(f"  Est. cost: ${activity['estimated_cost']:.0f}")
-                lines.append("")
-            
-            lines.append(f"**Day Total:** ${day['day_total']:.0f}")
+    
+    def _day_text_lines(self, day: Dict) -> List[str]:
+        lines = [f"## {day['title']}", ""]
+        
+        for activity in day['activities']:
+            lines.append(f"**{activity['time']}**")
+            lines.append(f"- {activity['activity']}")
+            lines.append(f"  _{activity['description']}_")
+            if activity['estimated_cost'] > 0:
+                lines.append(f"  Est. cost: ${activity['estimated_cost']:.0f}")
             lines.append("")
         
-        return "\n".join(lines)
+        lines.append(f"**Day Total:** ${day['day_total']:.0f}")
+        lines.append("")
+        return lines
     
     def _generate_tips(self, destination: str, travel_type: str) -> List[str]:
         """Generate travel tips"""
-        
-        general_tips = [
-            f"Best time to visit {destination}: Check local weather patterns",
-            "Download offline maps before your trip",
-            "Keep emergency contact numbers handy",
-            "Try local cuisine for authentic experiences",
-            "Book popular attractions in advance"
-        ]
-        
-        type_tips = {
-            'nature': [
-                "Pack layers for changing weather",
-                "Bring a reusable water bottle",
-                "Wear comfortable hiking shoes",
-                "Carry sunscreen and insect repellent"
-            ],
-            'culture': [
-                "Research local customs before visiting",
-                "Dress modestly when visiting religious sites",
-                "Consider hiring a local guide",
-                "Visit museums on weekday mornings to avoid crowds"
-            ],
-            'food': [
-                "Ask locals for restaurant recommendations",
-                "Try street food for authentic flavors",
-                "Book popular restaurants in advance",
-                "Take a cooking class to learn local recipes"
-            ],
-            'adventure': [
-                "Check equipment safety before activities",
-                "Get travel insurance that covers adventure sports",
-                "Stay hydrated during physical activities",
-                "Know your limits and listen to guides"
-            ],
-            'relaxation': [
-                "Book spa treatments in advance",
-                "Bring a good book or download podcasts",
-                "Disconnect from work emails",
-                "Try local wellness practices"
-            ]
-        }
-        
-        tips = general_tips[:3]
-        tips.extend(type_tips.get(travel_type.lower(), [])[:2])
-        
+        tips = [self.GENERAL_TIPS[0].format(destination=destination), *self.GENERAL_TIPS[1:3]]
+        tips.extend(self.TYPE_TIPS.get(travel_type.lower(), ())[:2])
         return tips
     
     def _filter_hotels_by_preference(
@@ -686,45 +915,7 @@ class TravelPlannerService:
     
     def _generate_hotel_tips(self, hotel_preference: str) -> List[str]:
         """Generate tips based on hotel preference"""
-        tips_by_preference = {
-            'luxury': [
-                "Book directly with the hotel for potential upgrades",
-                "Ask about spa packages and fine dining reservations"
-            ],
-            'boutique': [
-                "These hotels often have unique local experiences",
-                "Ask the concierge for insider local recommendations"
-            ],
-            'resort': [
-                "Check what's included in your all-inclusive package",
-                "Book activities early as they fill up fast"
-            ],
-            'mid-range': [
-                "Check for loyalty programs for future discounts",
-                "Ask about included breakfast options"
-            ],
-            'budget': [
-                "Read recent reviews for cleanliness feedback",
-                "Location is key - ensure good public transport access"
-            ],
-            'hostel': [
-                "Bring a lock for your belongings",
-                "Join hostel activities to meet fellow travelers"
-            ],
-            'apartment': [
-                "Stock up on groceries to save on dining",
-                "Ask the host for local tips and recommendations"
-            ],
-            'unique': [
-                "Read carefully what amenities are available",
-                "Book early as unique stays sell out quickly"
-            ]
-        }
-        
-        return tips_by_preference.get(hotel_preference, [
-            "Book early for better rates",
-            "Check cancellation policies before booking"
-        ])
+        return list(self.HOTEL_TIPS.get(hotel_preference, self.DEFAULT_HOTEL_TIPS))
     
     def get_conversation_questions(self) -> List[Dict[str, str]]:
         """Get the conversation flow questions for advanced search"""
@@ -771,10 +962,7 @@ class TravelPlannerService:
     
     def get_available_travel_types(self) -> List[Dict[str, str]]:
         """Get list of available travel types with descriptions"""
-        return [
-            {'id': key, 'name': key.title(), 'description': value['description']}
-            for key, value in self.TRAVEL_TYPES.items()
-        ]
+        return [dict(travel_type) for travel_type in self.AVAILABLE_TRAVEL_TYPES]
 
 
 # Alias for backward compatibility
@@ -4,13 +4,138 @@ Sign up for free API keys at: https://developers.amadeus.com/
 """
 
 import os
+import time
+import asyncio
+import hashlib
+import threading
+import weakref
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, List, Any
-from datetime import datetime, timedelta
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from .caching import SingleFlight, TTLCache
+from .city_codes import normalize_city_name
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import httpx
+except ImportError:  # Async methods fall back to the sync client in a thread
+    httpx = None
+
+
+class AccessTokenCache:
+    """
+    Process-wide cache for Amadeus OAuth2 access tokens.
+    
+    Tokens are keyed by API key and shared by every AmadeusService instance,
+    so per-request services no longer POST to the token endpoint each time.
+    A lock makes concurrent requests wait for a single refresh. With
+    AMADEUS_TOKEN_CACHE='django' the token is also stored in Django's cache
+    framework so all workers behind a shared backend reuse one token.
+    """
+    
+    CACHE_KEY_PREFIX = 'amadeus:token:'
+    
+    def __init__(self):
+        self._tokens = {}  # cache key -> (token, expires_at epoch seconds)
+        self._lock = threading.Lock()
+    
+    def _cache_key(self, api_key: str) -> str:
+        return self.CACHE_KEY_PREFIX + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    
+    def _use_django_cache(self) -> bool:
+        return getattr(settings, 'AMADEUS_TOKEN_CACHE', 'local') == 'django'
+    
+    def _lookup(self, key: str) -> Optional[str]:
+        """Return a still-valid token from memory or the shared cache"""
+        entry = self._tokens.get(key)
+        if entry and time.time() < entry[1]:
+            return entry[0]
+        
+        if self._use_django_cache():
+            from django.core.cache import cache
+            entry = cache.get(key)
+            if entry and time.time() < entry[1]:
+                self._tokens[key] = entry
+                return entry[0]
+        
+        return None
+    
+    def peek(self, api_key: str) -> Optional[str]:
+        """Return a valid token held in this process, without any I/O"""
+        entry = self._tokens.get(self._cache_key(api_key))
+        if entry and time.time() < entry[1]:
+            return entry[0]
+        return None
+    
+    def get_token(self, api_key: str, fetch) -> Optional[str]:
+        """
+        Return a valid token for api_key, calling fetch() to refresh if needed.
+        
+        Args:
+            api_key: Amadeus API key the token belongs to
+            fetch: Callable returning (access_token, expires_in) or None
+        """
+        key = self._cache_key(api_key)
+        token = self._lookup(key)
+        if token:
+            return token
+        
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            token = self._lookup(key)
+            if token:
+                return token
+            
+            result = fetch()
+            if not result:
+                return None
+            
+            token, expires_in = result
+            # Refresh shortly before the token actually expires
+            margin = getattr(settings, 'AMADEUS_TOKEN_REFRESH_MARGIN', 60)
+            lifetime = max(0, expires_in - margin)
+            entry = (token, time.time() + lifetime)
+            self._tokens[key] = entry
+            
+            if self._use_django_cache() and lifetime > 0:
+                from django.core.cache import cache
+                cache.set(key, entry, timeout=lifetime)
+            
+            return token
+    
+    def clear(self):
+        """Forget all tokens held in this process"""
+        with self._lock:
+            self._tokens.clear()
+
+
+token_cache = AccessTokenCache()
+
+# Offer caches keyed on normalized search parameters; popular routes are
+# served from memory and refreshed in the background once stale
+flight_offer_cache = TTLCache(
+    'flight_offers',
+    ttl=getattr(settings, 'FLIGHT_OFFER_CACHE_TTL', 300),
+    stale_ttl=getattr(settings, 'OFFER_CACHE_STALE_TTL', 600),
+    max_entries=getattr(settings, 'OFFER_CACHE_MAX_ENTRIES', 1000)
+)
+hotel_offer_cache = TTLCache(
+    'hotel_offers',
+    ttl=getattr(settings, 'HOTEL_OFFER_CACHE_TTL', 900),
+    stale_ttl=getattr(settings, 'OFFER_CACHE_STALE_TTL', 600),
+    max_entries=getattr(settings, 'OFFER_CACHE_MAX_ENTRIES', 1000)
+)
+
+# Identical calls in flight at the same time share one upstream request
+amadeus_calls = SingleFlight('amadeus')
+
 
 class AmadeusService:
     """
@@ -35,25 +160,91 @@ class AmadeusService:
     AUTH_URL = "https://test.api.amadeus.com/v1/security/oauth2/token"
     BASE_URL = "https://test.api.amadeus.com"
     
+    # Status codes worth retrying: rate limiting and transient server errors
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # One keep-alive connection pool per process, shared by all instances
+    _session = None
+    _session_lock = threading.Lock()
+    
+    # Async clients are bound to an event loop, so keep one per loop
+    _async_clients = weakref.WeakKeyDictionary()
   
     def __init__(self):
         self.api_key = os.getenv('AMADEUS_API_KEY', '')
         self.api_secret = os.getenv('AMADEUS_API_SECRET', '')
-        self._access_token = None
-        self._token_expires = None
+        self.timeout = (
+            getattr(settings, 'AMADEUS_CONNECT_TIMEOUT', 5),
+            getattr(settings, 'AMADEUS_READ_TIMEOUT', 30)
+        )
+        # time.monotonic() by which HTTP calls must finish; set per search so
+        # calls for a provider that missed the search deadline stop promptly
+        # instead of holding a pool thread for the full read timeout
+        self.deadline = None
+        self.session = self.get_session()
     
-    def _get_access_token(self) -> Optional[str]:
-        """Get OAuth2 access token from Amadeus"""
-        # Return cached token if still valid
-        if self._access_token and self._token_expires and datetime.now() < self._token_expires:
-            return self._access_token
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Return the shared HTTP session for Amadeus calls.
         
+        Connections are pooled and kept alive, so only the first request per
+        pooled connection pays for the TCP+TLS handshake. Failed requests with
+        a retryable status are retried with exponential backoff, honouring
+        Retry-After on 429 responses.
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry = Retry(
+                        total=getattr(settings, 'AMADEUS_MAX_RETRIES', 3),
+                        backoff_factor=getattr(settings, 'AMADEUS_BACKOFF_FACTOR', 0.5),
+                        status_forcelist=cls.RETRY_STATUSES,
+                        allowed_methods=frozenset(['GET', 'POST']),
+                        respect_retry_after_header=True,
+                        raise_on_status=False
+                    )
+                    pool_size = getattr(settings, 'AMADEUS_POOL_SIZE', 20)
+                    adapter = HTTPAdapter(
+                        pool_connections=pool_size,
+                        pool_maxsize=pool_size,
+                        max_retries=retry
+                    )
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    cls._session = session
+        return cls._session
+    
+    def request_timeout(self, read_timeout: float = None) -> Optional[tuple]:
+        """
+        (connect, read) timeout for the next HTTP call, cut down to the time
+        left before self.deadline. None once the deadline has passed.
+        """
+        connect, read = self.timeout[0], read_timeout or self.timeout[1]
+        if self.deadline is None:
+            return connect, read
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(connect, remaining), min(read, remaining)
+    
+    def _get_access_token(self) -> Optional[str]:
+        """Get OAuth2 access token from Amadeus (shared process-wide cache)"""
         if not self.api_key or not self.api_secret:
             logger.warning("Amadeus API credentials not configured")
             return None
         
+        return token_cache.get_token(self.api_key, self._request_access_token)
+    
+    def _request_access_token(self) -> Optional[tuple]:
+        """Request a new OAuth2 token, returning (access_token, expires_in)"""
+        timeout = self.request_timeout(10)
+        if timeout is None:
+            logger.warning("Search deadline passed, not requesting an Amadeus token")
+            return None
+        
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.AUTH_URL,
                 data={
                     'grant_type': 'client_credentials',
@@ -61,17 +252,13 @@ class AmadeusService:
                     'client_secret': self.api_secret
                 },
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                timeout=10
+                timeout=timeout
             )
             
             if response.status_code == 200:
                 data = response.json()
-                self._access_token = data['access_token']
-                # Token expires in 'expires_in' seconds, subtract 60 for safety margin
-                expires_in = data.get('expires_in', 1799) - 60
-                self._token_expires = datetime.now() + timedelta(seconds=expires_in)
                 logger.info("Amadeus access token obtained successfully")
-                return self._access_token
+                return data['access_token'], data.get('expires_in', 1799)
             else:
                 logger.error(f"Failed to get Amadeus token: {response.status_code} - {response.text}")
                 
@@ -86,13 +273,18 @@ class AmadeusService:
         if not token:
             return None
         
+        timeout = self.request_timeout()
+        if timeout is None:
+            logger.warning(f"Search deadline passed, skipping Amadeus call to {endpoint}")
+            return None
+        
         try:
             url = f"{self.BASE_URL}{endpoint}"
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params=params,
                 headers={'Authorization': f'Bearer {token}'},
-                timeout=30
+                timeout=timeout
             )
             
             if response.status_code == 200:
@@ -106,20 +298,31 @@ class AmadeusService:
         return None
     
     def get_city_code(self, city_name: str) -> Optional[str]:
-        """Get IATA city code for a city name"""
-        data = self._make_request(
-            "/v1/reference-data/locations",
-            params={
-                'keyword': city_name,
-                'subType': 'CITY,AIRPORT',
-                'page[limit]': 1
-            }
+        """Get IATA city code for a city name (cached, API only on first lookup)"""
+        from .city_codes import city_code_resolver
+        return city_code_resolver.resolve(
+            city_name,
+            lambda name: amadeus_calls.do(
+                ('city_code', normalize_city_name(name)),
+                lambda: self._lookup_city_code(name)
+            )
         )
+    
+    def _lookup_city_code(self, city_name: str) -> Optional[str]:
+        """Look up an IATA city code via the reference-data API"""
+        data = self._make_request("/v1/reference-data/locations", params=self._city_code_params(city_name))
         
         if data and data.get('data'):
             return data['data'][0].get('iataCode')
         return None
     
+    def _city_code_params(self, city_name: str) -> Dict:
+        return {
+            'keyword': city_name,
+            'subType': 'CITY,AIRPORT',
+            'page[limit]': 1
+        }
+    
     def search_flights(
         self,
         origin: str,
@@ -143,6 +346,29 @@ class AmadeusService:
         Returns:
             List of flight offers with prices
         """
+        key = (
+            normalize_city_name(origin), normalize_city_name(destination),
+            departure_date, return_date or '', adults, max_results
+        )
+        flights = flight_offer_cache.get_or_load(
+            key,
+            lambda: amadeus_calls.do(
+                ('flights',) + key,
+                lambda: self._fetch_flights(origin, destination, departure_date, return_date, adults, max_results)
+            )
+        )
+        return list(flights)
+    
+    def _fetch_flights(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: str = None,
+        adults: int = 1,
+        max_results: int = 10
+    ) -> List[Dict]:
+        """Fetch flight offers from the API (uncached, see search_flights)"""
         # Get IATA codes if city names provided
         origin_code = origin if len(origin) == 3 else self.get_city_code(origin)
         dest_code = destination if len(destination) == 3 else self.get_city_code(destination)
@@ -151,6 +377,21 @@ class AmadeusService:
             logger.warning(f"Could not find IATA codes for {origin} or {destination}")
             return []
         
+        params = self._flight_params(origin_code, dest_code, departure_date, return_date, adults, max_results)
+        data = self._make_request("/v2/shopping/flight-offers", params)
+        
+        return self._parse_flight_offers(data, origin, destination, origin_code, dest_code)
+    
+    def _flight_params(
+        self,
+        origin_code: str,
+        dest_code: str,
+        departure_date: str,
+        return_date: Optional[str],
+        adults: int,
+        max_results: int
+    ) -> Dict:
+        """Build flight-offers query parameters"""
         params = {
             'originLocationCode': origin_code,
             'destinationLocationCode': dest_code,
@@ -163,8 +404,17 @@ class AmadeusService:
         if return_date:
             params['returnDate'] = return_date
         
-        data = self._make_request("/v2/shopping/flight-offers", params)
-        
+        return params
+    
+    def _parse_flight_offers(
+        self,
+        data: Optional[Dict],
+        origin: str,
+        destination: str,
+        origin_code: str,
+        dest_code: str
+    ) -> List[Dict]:
+        """Convert a flight-offers response into our transport format"""
         if not data or not data.get('data'):
             return []
         
@@ -222,6 +472,26 @@ class AmadeusService:
         Returns:
             List of hotel offers with prices
         """
+        key = (normalize_city_name(city), check_in, check_out, adults, rooms, max_results)
+        hotels = hotel_offer_cache.get_or_load(
+            key,
+            lambda: amadeus_calls.do(
+                ('hotels',) + key,
+                lambda: self._fetch_hotels(city, check_in, check_out, adults, rooms, max_results)
+            )
+        )
+        return list(hotels)
+    
+    def _fetch_hotels(
+        self,
+        city: str,
+        check_in: str,
+        check_out: str,
+        adults: int = 1,
+        rooms: int = 1,
+        max_results: int = 10
+    ) -> List[Dict]:
+        """Fetch hotel offers from the API (uncached, see search_hotels)"""
         # First, get city code
         city_code = city if len(city) == 3 else self.get_city_code(city)
         
@@ -232,48 +502,96 @@ class AmadeusService:
         # Step 1: Get hotels by city
         hotels_data = self._make_request(
             "/v1/reference-data/locations/hotels/by-city",
-            params={
-                'cityCode': city_code,
-                'radius': 10,
-                'radiusUnit': 'KM',
-                'hotelSource': 'ALL'
-            }
+            params=self._hotels_by_city_params(city_code)
         )
         
         if not hotels_data or not hotels_data.get('data'):
             return []
         
-        # Get first N hotel IDs
-        hotel_ids = [h['hotelId'] for h in hotels_data['data'][:min(max_results, 20)]]
+        hotel_ids = self._candidate_hotel_ids(hotels_data['data'], max_results)
         
         if not hotel_ids:
             return []
         
         # Step 2: Get hotel offers
-        offers_data = self._make_request(
-            "/v3/shopping/hotel-offers",
-            params={
-                'hotelIds': ','.join(hotel_ids[:10]),  # API limit
-                'adults': adults,
-                'checkInDate': check_in,
-                'checkOutDate': check_out,
-                'roomQuantity': rooms,
-                'currency': 'USD'
-            }
-        )
+        offer_params = self._hotel_offer_params(adults, check_in, check_out, rooms)
+        if getattr(settings, 'AMADEUS_HOTEL_BATCHING', False):
+            hotel_offers = self._fetch_hotel_offers_batched(hotel_ids, offer_params)
+        else:
+            offers_data = self._make_request(
+                "/v3/shopping/hotel-offers",
+                params={'hotelIds': ','.join(hotel_ids[:10]), **offer_params}  # API limit
+            )
+            hotel_offers = offers_data.get('data', []) if offers_data else []
         
-        if not offers_data or not offers_data.get('data'):
+        if not hotel_offers:
             # Fallback: return hotel list without prices
             return self._format_hotels_without_prices(hotels_data['data'][:max_results], city)
         
+        return self._parse_hotel_offers(hotel_offers, check_in, check_out)
+    
+    def _hotels_by_city_params(self, city_code: str) -> Dict:
+        return {
+            'cityCode': city_code,
+            'radius': 10,
+            'radiusUnit': 'KM',
+            'hotelSource': 'ALL'
+        }
+    
+    def _hotel_offer_params(self, adults: int, check_in: str, check_out: str, rooms: int) -> Dict:
+        return {
+            'adults': adults,
+            'checkInDate': check_in,
+            'checkOutDate': check_out,
+            'roomQuantity': rooms,
+            'currency': 'USD'
+        }
+    
+    def _candidate_hotel_ids(self, hotels: List[Dict], max_results: int) -> List[str]:
+        """First N hotel IDs (all candidates up to the configured cap in batched mode)"""
+        if getattr(settings, 'AMADEUS_HOTEL_BATCHING', False):
+            candidates = hotels[:getattr(settings, 'AMADEUS_HOTEL_MAX_CANDIDATES', 50)]
+        else:
+            candidates = hotels[:min(max_results, 20)]
+        return [h['hotelId'] for h in candidates if h.get('hotelId')]
+    
+    def _hotel_id_chunks(self, hotel_ids: List[str]) -> List[List[str]]:
+        batch_size = getattr(settings, 'AMADEUS_HOTEL_BATCH_SIZE', 10)
+        return [hotel_ids[i:i + batch_size] for i in range(0, len(hotel_ids), batch_size)]
+    
+    def _fetch_hotel_offers_batched(self, hotel_ids: List[str], params: Dict) -> List[Dict]:
+        """
+        Price every candidate hotel by splitting the IDs into API-sized chunks
+        and requesting the chunks concurrently (AMADEUS_HOTEL_BATCH_CONCURRENCY).
+        Chunks that fail are skipped; the rest are merged in candidate order.
+        """
+        chunks = self._hotel_id_chunks(hotel_ids)
+        
+        def fetch_chunk(chunk):
+            data = self._make_request("/v3/shopping/hotel-offers", params={'hotelIds': ','.join(chunk), **params})
+            return data.get('data', []) if data else []
+        
+        if len(chunks) == 1:
+            return fetch_chunk(chunks[0])
+        
+        # A pool per call rather than the shared search pool: this already runs
+        # on a search pool thread, and waiting on the same bounded pool could deadlock
+        max_workers = min(getattr(settings, 'AMADEUS_HOTEL_BATCH_CONCURRENCY', 4), len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hotel-offers') as executor:
+            results = executor.map(fetch_chunk, chunks)
+            return [offer for chunk_offers in results for offer in chunk_offers]
+    
+    def _parse_hotel_offers(self, hotel_offers: List[Dict], check_in: str, check_out: str) -> List[Dict]:
+        """Convert hotel-offers entries into our hotel format, cheapest first"""
+        nights = (datetime.strptime(check_out, '%Y-%m-%d') - datetime.strptime(check_in, '%Y-%m-%d')).days
+        
         hotels = []
-        for i, hotel_offer in enumerate(offers_data['data']):
+        for i, hotel_offer in enumerate(hotel_offers):
             hotel = hotel_offer.get('hotel', {})
             offers = hotel_offer.get('offers', [])
             first_offer = offers[0] if offers else {}
             
             price = float(first_offer.get('price', {}).get('total', 0))
-            nights = (datetime.strptime(check_out, '%Y-%m-%d') - datetime.strptime(check_in, '%Y-%m-%d')).days
             price_per_night = round(price / nights, 2) if nights > 0 else price
             
             hotels.append({
@@ -372,6 +690,216 @@ class AmadeusService:
         
         return amenities if amenities else ['Standard Room']
     
+    # ===========================================
+    # ASYNC API (used by the ASGI views)
+    # ===========================================
+    
+    @classmethod
+    def get_async_client(cls):
+        """Return the pooled httpx.AsyncClient for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = cls._async_clients.get(loop)
+        if client is None:
+            pool_size = getattr(settings, 'AMADEUS_POOL_SIZE', 20)
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(
+                    getattr(settings, 'AMADEUS_READ_TIMEOUT', 30),
+                    connect=getattr(settings, 'AMADEUS_CONNECT_TIMEOUT', 5)
+                )
+            )
+            cls._async_clients[loop] = client
+        return client
+    
+    async def _amake_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """Async version of _make_request, retrying 429/5xx with backoff"""
+        token = token_cache.peek(self.api_key) or await sync_to_async(
+            self._get_access_token, thread_sensitive=False
+        )()
+        if not token:
+            return None
+        
+        max_retries = getattr(settings, 'AMADEUS_MAX_RETRIES', 3)
+        backoff = getattr(settings, 'AMADEUS_BACKOFF_FACTOR', 0.5)
+        
+        try:
+            client = self.get_async_client()
+            for attempt in range(max_retries + 1):
+                response = await client.get(
+                    f"{self.BASE_URL}{endpoint}",
+                    params=params,
+                    headers={'Authorization': f'Bearer {token}'}
+                )
+                
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in self.RETRY_STATUSES or attempt == max_retries:
+                    logger.error(f"Amadeus API error: {response.status_code} - {response.text}")
+                    return None
+                
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else backoff * (2 ** attempt)
+                await asyncio.sleep(delay)
+                
+        except Exception as e:
+            logger.error(f"Error calling Amadeus API: {e}")
+        
+        return None
+    
+    async def aget_city_code(self, city_name: str) -> Optional[str]:
+        """Async version of get_city_code"""
+        from .city_codes import city_code_resolver
+        
+        code = await sync_to_async(city_code_resolver.get_cached)(city_name)
+        if code:
+            return code
+        
+        code = await amadeus_calls.ado(
+            ('city_code', normalize_city_name(city_name)),
+            lambda: self._alookup_city_code(city_name)
+        )
+        if code:
+            await sync_to_async(city_code_resolver.store)(city_name, code)
+        return code
+    
+    async def _alookup_city_code(self, city_name: str) -> Optional[str]:
+        data = await self._amake_request("/v1/reference-data/locations", params=self._city_code_params(city_name))
+        
+        if data and data.get('data'):
+            return data['data'][0].get('iataCode')
+        return None
+    
+    async def asearch_flights(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: str = None,
+        adults: int = 1,
+        max_results: int = 10
+    ) -> List[Dict]:
+        """Async version of search_flights using a non-blocking HTTP client"""
+        if httpx is None:
+            return await sync_to_async(self.search_flights, thread_sensitive=False)(
+                origin, destination, departure_date, return_date, adults, max_results
+            )
+        
+        key = (
+            normalize_city_name(origin), normalize_city_name(destination),
+            departure_date, return_date or '', adults, max_results
+        )
+        flights = await flight_offer_cache.aget_or_load(
+            key,
+            lambda: amadeus_calls.ado(
+                ('flights',) + key,
+                lambda: self._afetch_flights(origin, destination, departure_date, return_date, adults, max_results)
+            )
+        )
+        return list(flights)
+    
+    async def _afetch_flights(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: str = None,
+        adults: int = 1,
+        max_results: int = 10
+    ) -> List[Dict]:
+        origin_code, dest_code = await asyncio.gather(
+            self._aresolve_code(origin),
+            self._aresolve_code(destination)
+        )
+        
+        if not origin_code or not dest_code:
+            logger.warning(f"Could not find IATA codes for {origin} or {destination}")
+            return []
+        
+        params = self._flight_params(origin_code, dest_code, departure_date, return_date, adults, max_results)
+        data = await self._amake_request("/v2/shopping/flight-offers", params)
+        
+        return self._parse_flight_offers(data, origin, destination, origin_code, dest_code)
+    
+    async def _aresolve_code(self, city: str) -> Optional[str]:
+        return city if len(city) == 3 else await self.aget_city_code(city)
+    
+    async def asearch_hotels(
+        self,
+        city: str,
+        check_in: str,
+        check_out: str,
+        adults: int = 1,
+        rooms: int = 1,
+        max_results: int = 10
+    ) -> List[Dict]:
+        """Async version of search_hotels using a non-blocking HTTP client"""
+        if httpx is None:
+            return await sync_to_async(self.search_hotels, thread_sensitive=False)(
+                city, check_in, check_out, adults, rooms, max_results
+            )
+        
+        key = (normalize_city_name(city), check_in, check_out, adults, rooms, max_results)
+        hotels = await hotel_offer_cache.aget_or_load(
+            key,
+            lambda: amadeus_calls.ado(
+                ('hotels',) + key,
+                lambda: self._afetch_hotels(city, check_in, check_out, adults, rooms, max_results)
+            )
+        )
+        return list(hotels)
+    
+    async def _afetch_hotels(
+        self,
+        city: str,
+        check_in: str,
+        check_out: str,
+        adults: int = 1,
+        rooms: int = 1,
+        max_results: int = 10
+    ) -> List[Dict]:
+        city_code = await self._aresolve_code(city)
+        
+        if not city_code:
+            logger.warning(f"Could not find IATA code for {city}")
+            return []
+        
+        hotels_data = await self._amake_request(
+            "/v1/reference-data/locations/hotels/by-city",
+            params=self._hotels_by_city_params(city_code)
+        )
+        
+        if not hotels_data or not hotels_data.get('data'):
+            return []
+        
+        hotel_ids = self._candidate_hotel_ids(hotels_data['data'], max_results)
+        
+        if not hotel_ids:
+            return []
+        
+        offer_params = self._hotel_offer_params(adults, check_in, check_out, rooms)
+        if getattr(settings, 'AMADEUS_HOTEL_BATCHING', False):
+            chunks = self._hotel_id_chunks(hotel_ids)
+        else:
+            chunks = [hotel_ids[:10]]  # API limit
+        
+        semaphore = asyncio.Semaphore(getattr(settings, 'AMADEUS_HOTEL_BATCH_CONCURRENCY', 4))
+        
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                data = await self._amake_request(
+                    "/v3/shopping/hotel-offers",
+                    params={'hotelIds': ','.join(chunk), **offer_params}
+                )
+            return data.get('data', []) if data else []
+        
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        hotel_offers = [offer for chunk_offers in results for offer in chunk_offers]
+        
+        if not hotel_offers:
+            return self._format_hotels_without_prices(hotels_data['data'][:max_results], city)
+        
+        return self._parse_hotel_offers(hotel_offers, check_in, check_out)
+    
     def is_configured(self) -> bool:
         """Check if Amadeus API is properly configured"""
         return bool(self.api_key and self.api_secret)
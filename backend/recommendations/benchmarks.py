@@ -0,0 +1,489 @@
+"""
+Named benchmarks for the hot paths of the API.
+Run with: python manage.py benchmark <name> [--size N]
+
+Each benchmark is a function taking (size, write) registered with
+@benchmark; `write` prints a line to the command output.
+"""
+
+import statistics
+import time
+from typing import Callable, Dict, NamedTuple
+from django.db import connection, transaction
+from django.db.models import Q
+
+
+class Benchmark(NamedTuple):
+    func: Callable
+    description: str
+    default_size: int
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, description: str, default_size: int):
+    """Register a benchmark under name"""
+    def decorator(func):
+        BENCHMARKS[name] = Benchmark(func, description, default_size)
+        return func
+    return decorator
+
+
+def measure(func: Callable, repeat: int = 5) -> Dict[str, float]:
+    """Run func repeat times and return best/median wall time in ms"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': round(min(timings), 3), 'median_ms': round(statistics.median(timings), 3)}
+
+
+def format_timing(label: str, timing: Dict[str, float]) -> str:
+    return f"{label:<40} best {timing['best_ms']:>10.3f} ms   median {timing['median_ms']:>10.3f} ms"
+
+
+class Rollback(Exception):
+    """Raised to discard seeded benchmark rows"""
+
+
+def seeded(seed: Callable[[int], None], size: int, run: Callable[[], None]):
+    """Seed size rows, run the benchmark, then roll everything back"""
+    try:
+        with transaction.atomic():
+            seed(size)
+            run()
+            raise Rollback
+    except Rollback:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Catalog filters
+# ---------------------------------------------------------------------------
+
+BENCH_CITIES = 200
+
+
+def seed_hotels(size: int):
+    from .models import Destination, Hotel
+
+    destinations = [
+        Destination(name=f'Bench City {i}', city=f'Bench City {i}', country=f'Bench Country {i % 20}')
+        for i in range(BENCH_CITIES)
+    ]
+    for destination in destinations:
+        destination.save()
+
+    batch = []
+    for i in range(size):
+        batch.append(Hotel(
+            name=f'Bench Hotel {i}',
+            destination=destinations[i % BENCH_CITIES],
+            address='1 Bench Street',
+            star_rating=i % 5 + 1,
+            price_per_night=50 + (i * 37) % 450,
+            rating=(i * 7) % 100 / 10,
+            is_available=i % 10 != 0,
+        ))
+        if len(batch) == 5000:
+            Hotel.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Hotel.objects.bulk_create(batch)
+
+
+@benchmark('hotel_filters', 'Hotel list filters: icontains scan vs normalized indexed lookup', 100_000)
+def hotel_filters(size: int, write: Callable[[str], None]):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from .models import Hotel
+    from .views import HotelViewSet
+
+    term = 'Bench City 42'
+    params = {'destination': term, 'min_stars': 3, 'max_price': 300, 'sort': 'price'}
+
+    def legacy_queryset():
+        return Hotel.objects.filter(is_available=True).filter(
+            Q(destination__city__icontains=term) | Q(destination__country__icontains=term)
+        ).filter(star_rating__gte=3, price_per_night__lte=300).order_by('price_per_night')
+
+    def current_queryset():
+        request = Request(APIRequestFactory().get('/api/hotels/', params))
+        return HotelViewSet(request=request, format_kwarg=None).get_queryset()
+
+    def run():
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        write(f'{size} hotels across {BENCH_CITIES} destinations ({connection.vendor})\n')
+        for label, build in (('icontains on raw columns', legacy_queryset),
+                             ('normalized columns (current)', current_queryset)):
+            queryset = build()
+            write(f'-- {label}')
+            write(queryset.explain())
+            write(format_timing('first page', measure(lambda: list(queryset.all()[:20]))))
+            write(format_timing('count', measure(lambda: queryset.all().count())))
+            write('')
+
+    write(f'Seeding {size} hotels...')
+    seeded(seed_hotels, size, run)
+
+
+@benchmark('deep_page', 'Hotel listing deep-page latency: page numbers vs keyset cursor', 100_000)
+def deep_page(size: int, write: Callable[[str], None]):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from .models import Hotel
+    from .pagination import KeysetPagination
+    from .views import HotelViewSet
+
+    factory = APIRequestFactory()
+    view = HotelViewSet.as_view({'get': 'list'})
+    page_size = 20
+
+    def run():
+        available = Hotel.objects.filter(is_available=True).count()
+        write(f'{size} hotels, {available} available, page size {page_size} ({connection.vendor})\n')
+        for sort in ('price', 'rating', 'stars'):
+            write(f'-- sort={sort}')
+            request = Request(factory.get('/api/hotels/', {'sort': sort}))
+            paginator = KeysetPagination()
+            ordered = HotelViewSet(request=request, format_kwarg=None).get_queryset()
+            paginator.ordering = paginator.get_ordering(ordered)
+            ordered = ordered.order_by(*paginator.ordering)
+            for fraction in (0.01, 0.5, 0.99):
+                page = max(1, int(available * fraction) // page_size)
+                boundary = ordered[(page - 1) * page_size - 1] if page > 1 else None
+                cursor = paginator.encode_cursor(paginator._position(boundary)) if boundary else ''
+
+                page_request = {'sort': sort, 'pagination': 'page', 'page': page}
+                cursor_request = {'sort': sort, 'pagination': 'cursor', 'cursor': cursor}
+                write(format_timing(f'page {page} by number', measure(lambda: view(factory.get('/api/hotels/', page_request)).render())))
+                write(format_timing(f'page {page} by cursor', measure(lambda: view(factory.get('/api/hotels/', cursor_request)).render())))
+            write('')
+
+    write(f'Seeding {size} hotels...')
+    seeded(seed_hotels, size, run)
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+def seed_packages(size: int):
+    from .models import Attraction, Destination, Transport, TravelPackage
+
+    seed_hotels(size * 5)
+    destinations = list(Destination.objects.filter(name__startswith='Bench City'))
+    Transport.objects.bulk_create([
+        Transport(name=f'Bench Flight {i}', transport_type='flight', destination=destinations[i % BENCH_CITIES],
+                  origin=destinations[(i + 1) % BENCH_CITIES], price_per_person=100 + i % 300, duration_minutes=60 + i % 600)
+        for i in range(size * 3)
+    ])
+    Attraction.objects.bulk_create([
+        Attraction(name=f'Bench Attraction {i}', category='museum', destination=destinations[i % BENCH_CITIES],
+                   price_per_person=i % 50, duration_hours=2)
+        for i in range(size * 3)
+    ])
+    packages = TravelPackage.objects.bulk_create([
+        TravelPackage(name=f'Bench Package {i}', destination=destinations[i % BENCH_CITIES],
+                      base_price=500 + i, discount_percentage=i % 20, is_featured=i % 3 == 0)
+        for i in range(size)
+    ])
+    for relation, per_package in (('hotels', 5), ('transports', 3), ('attractions', 3)):
+        through = getattr(TravelPackage, relation).through
+        related = list(getattr(TravelPackage, relation).field.related_model.objects
+                       .filter(name__startswith='Bench').values_list('pk', flat=True))
+        column = f'{getattr(TravelPackage, relation).field.m2m_reverse_field_name()}_id'
+        through.objects.bulk_create([
+            through(travelpackage_id=package.pk, **{column: related[(index * per_package + offset) % len(related)]})
+            for index, package in enumerate(packages) for offset in range(per_package)
+        ])
+
+
+@benchmark('serializers', 'List serialization: ModelSerializer vs values() read path', 1_000)
+def serializer_throughput(size: int, write: Callable[[str], None]):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from .fast_serializers import ValuesSerializer
+    from .views import HotelViewSet, TravelPackageViewSet
+
+    def run():
+        write(f'{size} packages, {size * 5} hotels ({connection.vendor})\n')
+        for label, viewset_class in (('hotels', HotelViewSet), ('packages', TravelPackageViewSet)):
+            request = Request(APIRequestFactory().get(f'/api/{label}/', {'nights': 3}))
+            viewset = viewset_class(request=request, format_kwarg=None, action='list')
+            queryset = viewset.get_queryset().filter(name__startswith='Bench')
+            rows = queryset.count()
+            serializer_class = viewset.get_serializer_class()
+
+            def drf():
+                return serializer_class(list(queryset.all()), many=True, context=viewset.get_serializer_context()).data
+
+            def fast():
+                values = ValuesSerializer(serializer_class, viewset.get_serializer_context())
+                return values.to_representation(values.values_queryset(queryset.all()))
+
+            assert [dict(item) for item in drf()] == fast(), 'values() output differs from the serializer'
+            write(f'-- {label} ({rows} rows, fetch + serialize)')
+            for name, func in ((serializer_class.__name__, drf), ('ValuesSerializer', fast)):
+                timing = measure(func, repeat=3)
+                write(format_timing(name, timing) + f"   {rows / timing['median_ms'] * 1000:>10.0f} rows/s")
+            write('')
+
+    write(f'Seeding {size} packages...')
+    seeded(seed_packages, size, run)
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def planner_payload(num_days: int):
+    """A planner response (plan + recommendations) built from the mock providers"""
+    from .services import TravelRecommendationService
+    from .views import _build_travel_plan, _planner_search_kwargs
+
+    data = {'origin': 'Hanoi', 'destination': 'Paris', 'travel_type': 'culture',
+            'budget': 5000, 'num_days': num_days, 'num_people': 2}
+    service = TravelRecommendationService()
+    service.api_mode = 'mock'
+    recommendations = service.get_recommendations(**_planner_search_kwargs(data))
+    return _build_travel_plan(data, recommendations)
+
+
+@benchmark('render', 'Planner response: DRF JSONRenderer vs orjson, raw vs gzip/brotli bytes', 7)
+def render_payload(size: int, write: Callable[[str], None]):
+    import gzip
+    from rest_framework.renderers import JSONRenderer
+    from . import renderers
+
+    plan = planner_payload(size)
+    write(f'{size}-day planner response (orjson {"on" if renderers.orjson else "not installed"}, '
+          f'brotli {"on" if renderers.brotli else "not installed"})\n')
+
+    content = JSONRenderer().render(plan)
+    assert renderers.dumps(plan) == content, 'orjson output differs from DRF'
+    write(format_timing('JSONRenderer', measure(lambda: JSONRenderer().render(plan), repeat=50)))
+    write(format_timing('FastJSONRenderer', measure(lambda: renderers.FastJSONRenderer().render(plan), repeat=50)))
+    write('')
+
+    write(f"{'identity':<40} {len(content):>10} bytes")
+    gzipped = gzip.compress(content, compresslevel=renderers.GZIP_LEVEL, mtime=0)
+    write(f"{'gzip':<40} {len(gzipped):>10} bytes  " + format_timing('', measure(
+        lambda: gzip.compress(content, compresslevel=renderers.GZIP_LEVEL, mtime=0), repeat=20)).strip())
+    if renderers.brotli is not None:
+        compressed = renderers.brotli.compress(content, quality=renderers.BROTLI_QUALITY)
+        write(f"{'br':<40} {len(compressed):>10} bytes  " + format_timing('', measure(
+            lambda: renderers.brotli.compress(content, quality=renderers.BROTLI_QUALITY), repeat=20)).strip())
+
+
+# ---------------------------------------------------------------------------
+# Mock providers
+# ---------------------------------------------------------------------------
+
+@benchmark('mock_providers', 'Mock provider result sets per second, and a whole mock search', 2_000)
+def mock_providers(size: int, write: Callable[[str], None]):
+    from django.test import override_settings
+    from .services import TravelRecommendationService
+
+    service = TravelRecommendationService()
+    service.api_mode = 'mock'
+    search = {'destination': 'Paris', 'origin': 'Hanoi', 'check_in': '2026-01-01',
+              'check_out': '2026-01-04', 'people': 2, 'rooms': 1}
+    generators = (
+        ('hotels', lambda: service.hotel_service.get_hotels('Paris')),
+        ('flights', lambda: service.transport_service.get_transport_options('Hanoi', 'Paris')),
+        ('local transport', lambda: service.transport_service.get_local_transport('Paris', 3)),
+        ('attractions', lambda: service._generate_mock_attractions('Paris')),
+        ('get_recommendations', lambda: service.get_recommendations(**search)),
+    )
+
+    def loop(func):
+        return lambda: [func() for _ in range(size)]
+
+    for deterministic in (False, True):
+        with override_settings(MOCK_DETERMINISTIC=deterministic):
+            write(f'-- MOCK_DETERMINISTIC={deterministic} ({size} calls each)')
+            for label, func in generators:
+                timing = measure(loop(func), repeat=3)
+                write(format_timing(label, timing) + f"   {size / timing['median_ms'] * 1000:>10.0f} calls/s")
+            write('')
+
+
+# ---------------------------------------------------------------------------
+# Pricing
+# ---------------------------------------------------------------------------
+
+def synthetic_offers(size: int, seed: int = 0):
+    """size hotels, transports and local transports with random prices"""
+    import random
+
+    rng = random.Random(seed)
+    hotels = [{'id': i, 'price_per_night': round(rng.uniform(30, 600), 2)} for i in range(size)]
+    transports = [{'id': i, 'price_per_person': round(rng.uniform(20, 1200), 2)} for i in range(size)]
+    local_transports = [{'id': i, 'total_price': round(rng.uniform(0, 400), 2)} for i in range(size)]
+    return hotels, transports, local_transports
+
+
+@benchmark('pricing', 'Budget split and cheapest option: per-list comprehensions vs price columns', 10_000)
+def pricing(size: int, write: Callable[[str], None]):
+    from .pricing import evaluate_prices
+
+    hotels, transports, local_transports = synthetic_offers(size)
+    nights, people, rooms, budget = 3, 2, 1, 2500
+
+    def comprehensions():
+        # Filtering as done before price columns, plus a min() per kind
+        # since the lists are not ordered by price
+        kept_hotels = [h for h in hotels if h['price_per_night'] * nights * rooms <= budget * 0.6]
+        if not kept_hotels:
+            kept_hotels = sorted(hotels, key=lambda x: x['price_per_night'])
+        kept_transports = [t for t in transports if t['price_per_person'] * people <= budget * 0.3] or transports
+        kept_local = [lt for lt in local_transports if lt.get('total_price', 0) <= budget * 0.1] or local_transports
+        return (
+            (kept_hotels, min(kept_hotels, key=lambda h: h['price_per_night'] * nights * rooms)),
+            (kept_transports, min(kept_transports, key=lambda t: t['price_per_person'] * people)),
+            (kept_local, min(kept_local, key=lambda lt: lt.get('total_price', 0))),
+        )
+
+    def columns():
+        return evaluate_prices(hotels, transports, local_transports, nights, people, rooms, budget)
+
+    assert [tuple(priced) for priced in columns()] == list(comprehensions()), 'price columns disagree'
+    write(f'{size} offers of each kind, budget {budget}\n')
+    write(format_timing('comprehensions + min', measure(comprehensions, repeat=20)))
+    write(format_timing('evaluate_prices', measure(columns, repeat=20)))
+
+
+# ---------------------------------------------------------------------------
+# Bundles
+# ---------------------------------------------------------------------------
+
+def synthetic_catalog(size: int, seed: int = 0):
+    """Rated hotels and attractions plus transports for the bundle optimizer"""
+    import random
+
+    rng = random.Random(seed)
+    hotels, transports, local_transports = synthetic_offers(size, seed)
+    for hotel in hotels:
+        hotel['rating'] = round(rng.uniform(5, 10), 1)
+    attractions = [
+        {'id': i, 'price_per_person': rng.choice([0, 0, rng.randint(5, 80)]), 'rating': round(rng.uniform(6, 9.8), 1)}
+        for i in range(max(8, size // 20))
+    ]
+    return hotels, transports, local_transports, attractions
+
+
+def exhaustive_bundle_scores(hotels, transports, local_transports, attractions, nights, people, rooms, budget, top_n):
+    """Scores of the top_n bundles by trying every combination and attraction subset"""
+    from itertools import combinations, product
+    from .bundles import HOTEL_RATING_WEIGHT
+
+    subsets = []
+    for size in range(len(attractions) + 1):
+        for subset in combinations(attractions, size):
+            subsets.append((sum(a['price_per_person'] for a in subset) * people, sum(a['rating'] for a in subset)))
+    scores = []
+    for hotel, transport, local in product(hotels, transports, local_transports):
+        cost = hotel['price_per_night'] * nights * rooms + transport['price_per_person'] * people + local['total_price']
+        fitting = [value for price, value in subsets if cost + price <= budget]
+        if fitting:
+            scores.append(round(hotel['rating'] * HOTEL_RATING_WEIGHT + max(fitting), 2))
+    return sorted(scores, reverse=True)[:top_n]
+
+
+@benchmark('bundles', 'Budget-optimal bundle search over large offer sets', 5_000)
+def bundles(size: int, write: Callable[[str], None]):
+    from .bundles import best_bundles
+
+    nights, people, rooms, budget = 3, 2, 1, 3000
+
+    small = synthetic_catalog(8, seed=1)
+    small_args = (*small[:3], small[3][:8], nights, people, rooms, budget, 5)
+    found = [bundle['score'] for bundle in best_bundles(*small_args)]
+    assert found == exhaustive_bundle_scores(*small_args), 'optimizer disagrees with exhaustive search'
+
+    hotels, transports, local_transports, attractions = synthetic_catalog(size)
+    write(f'{size} hotels, {size} transports, {size} local transports, {len(attractions)} attractions, '
+          f'budget {budget} ({len(hotels) * len(transports) * len(local_transports):,} combinations)\n')
+    for top_n in (1, 3, 10):
+        timing = measure(lambda: best_bundles(
+            hotels, transports, local_transports, attractions, nights, people, rooms, budget, top_n), repeat=5)
+        write(format_timing(f'top {top_n}', timing))
+
+
+# ---------------------------------------------------------------------------
+# Planner
+# ---------------------------------------------------------------------------
+
+@benchmark('planner', 'TravelPlannerService.generate_travel_plan throughput for 1, 3 and 5 travel types', 7)
+def planner(size: int, write: Callable[[str], None]):
+    from .ai_planner_service import TravelPlannerService
+    from .services import TravelRecommendationService
+    from .views import _planner_search_kwargs
+
+    data = {'origin': 'Hanoi', 'destination': 'Paris', 'budget': 5000, 'num_days': size, 'num_people': 2}
+    service = TravelRecommendationService()
+    service.api_mode = 'mock'
+    recommendations = service.get_recommendations(**_planner_search_kwargs(data))
+    planner = TravelPlannerService()
+    repeat = 200
+
+    write(f'{size}-day plans, {repeat} per run\n')
+    for travel_type in ('culture', 'culture,food,nature', 'nature,culture,food,adventure,relaxation'):
+        def run():
+            for _ in range(repeat):
+                planner.generate_travel_plan(
+                    origin=data['origin'], destination=data['destination'], travel_type=travel_type,
+                    budget=data['budget'], num_days=size, num_people=data['num_people'],
+                    hotels=recommendations['hotels'], transports=recommendations['transports'],
+                    attractions=recommendations['attractions']
+                )
+        timing = measure(run, repeat=5)
+        label = f"{len(travel_type.split(','))} type(s)"
+        write(format_timing(label, timing) + f"   {repeat / timing['median_ms'] * 1000:>10.0f} plans/s")
+
+
+@benchmark('itinerary', 'Attraction scheduling for long itineraries: per-day list rebuild vs single pass', 365)
+def itinerary(size: int, write: Callable[[str], None]):
+    from .ai_planner_service import TravelPlannerService, schedule_attractions
+    from .services import mock_rng
+
+    num_attractions = 5_000
+    # Real attraction feeds repeat names; every fifth one here is a duplicate
+    attractions = [
+        {'name': f'Attraction {i - i % 5 if i % 5 == 4 else i}', 'price_per_person': i % 40,
+         'description': f'Attraction number {i}'}
+        for i in range(num_attractions)
+    ]
+    planner = TravelPlannerService()
+
+    def list_rebuild():
+        # Scheduling as done before schedule_attractions
+        used, picked = [], []
+        for _ in range(size):
+            available = [a for a in attractions if a.get('name') not in used]
+            if available:
+                used.append(available[0].get('name'))
+                picked.append(available[0])
+        return picked
+
+    def single_pass():
+        schedule = schedule_attractions(attractions)
+        return [attraction for _, attraction in zip(range(size), schedule)]
+
+    def full_itinerary():
+        planner._generate_itinerary(
+            destination='Paris', travel_type='culture', travel_config=planner._merge_travel_configs(['culture']),
+            num_days=size, daily_budget=100, hotels=[], transports=[], attractions=attractions,
+            rng=mock_rng('benchmark')
+        )
+
+    write(f'{size} days, {num_attractions} attractions\n')
+    assert list_rebuild() == single_pass(), 'schedules differ'
+    write(format_timing('per-day list rebuild', measure(list_rebuild, repeat=1)))
+    write(format_timing('schedule_attractions', measure(single_pass, repeat=5)))
+    write(format_timing('whole _generate_itinerary', measure(full_itinerary, repeat=5)))
@@ -0,0 +1,193 @@
+"""
+Budget-constrained trip bundles.
+
+A bundle is one hotel, one inter-city transport, one local transport and a
+subset of attractions whose combined trip cost fits the user's budget. The
+optimizer returns the top-N bundles by score, where the score is
+
+    hotel rating * HOTEL_RATING_WEIGHT
+    + transport ratings (when the provider has them) * TRANSPORT_RATING_WEIGHT
+    + the sum of the chosen attractions' ratings
+
+Search strategy:
+- attractions: 0/1 knapsack over whole-dollar costs, solved once per search
+  for every remaining budget, so each (hotel, transport, local) combination
+  looks its best attraction subset up in O(1)
+- hotels, transports, local transports: options that at least N others beat
+  on both price and score can't appear in the top N and are dropped
+  (k-skyline); transport x local pairs are pruned the same way, then
+  hotels are crossed with the pairs in price order with an upper-bound cut
+"""
+
+import heapq
+import math
+from itertools import count, repeat
+from operator import add, gt
+from typing import Dict, List, NamedTuple, Optional
+
+from .pricing import price_columns
+
+
+# One hotel rating point is worth this many attraction rating points
+HOTEL_RATING_WEIGHT = 5.0
+TRANSPORT_RATING_WEIGHT = 1.0
+
+
+class Choice(NamedTuple):
+    cost: float
+    value: float
+    option: Optional[Dict]
+
+
+NO_CHOICE = Choice(0.0, 0.0, None)
+
+
+def _rating(option: Dict) -> float:
+    return option.get('rating') or 0.0
+
+
+def skyline(choices: List[Choice], keep: int) -> List[Choice]:
+    """
+    Choices dominated (no cheaper and no better) by fewer than `keep`
+    others, ordered by cost. With keep=1 this is the Pareto frontier.
+    """
+    kept = []
+    best_values = []  # min-heap of the `keep` highest values seen so far
+    for choice in sorted(choices, key=lambda c: (c.cost, -c.value)):
+        if len(best_values) < keep:
+            heapq.heappush(best_values, choice.value)
+        elif choice.value > best_values[0]:
+            heapq.heapreplace(best_values, choice.value)
+        else:
+            continue
+        kept.append(choice)
+    return kept
+
+
+class AttractionKnapsack:
+    """
+    Best attraction subset for every whole-dollar budget up to `capacity`.
+
+    Free attractions are always included. Paid ones go through a 0/1
+    knapsack whose rows are updated with map/slice operations, so the work
+    per item runs in C rather than in a Python loop over budgets.
+    """
+
+    def __init__(self, attractions: List[Dict], people: int, capacity: int):
+        self.free = [a for a in attractions if a['price_per_person'] <= 0]
+        self.free_value = sum(_rating(a) for a in self.free)
+        self.items = [
+            (math.ceil(a['price_per_person'] * people), _rating(a), a)
+            for a in attractions if a['price_per_person'] > 0 and _rating(a) > 0
+        ]
+        self.capacity = max(0, min(capacity, sum(cost for cost, _, _ in self.items)))
+
+        best = [0.0] * (self.capacity + 1)
+        self.taken = []
+        for cost, value, _ in self.items:
+            if cost > self.capacity:
+                self.taken.append(None)
+                continue
+            candidates = list(map(add, best[:len(best) - cost], repeat(value)))
+            take = bytes(map(gt, candidates, best[cost:]))
+            best[cost:] = map(max, candidates, best[cost:])
+            self.taken.append(take)
+        self.best = best
+
+    def value(self, budget: float) -> float:
+        return self.free_value + self.best[min(int(budget), self.capacity)] if budget >= 0 else 0.0
+
+    def choose(self, budget: float) -> List[Dict]:
+        """Attractions of the best subset within budget, in input order"""
+        remaining = min(int(budget), self.capacity)
+        chosen = []
+        for (cost, _, attraction), take in zip(reversed(self.items), reversed(self.taken)):
+            if take is not None and remaining >= cost and take[remaining - cost]:
+                chosen.append(attraction)
+                remaining -= cost
+        chosen.reverse()
+        return self.free + chosen
+
+
+def best_bundles(
+    hotels: List[Dict],
+    transports: List[Dict],
+    local_transports: List[Dict],
+    attractions: List[Dict],
+    nights: int,
+    people: int,
+    rooms: int,
+    budget: float,
+    top_n: int = 3
+) -> List[Dict]:
+    """Top-N bundles within budget, best score first (cheaper first on ties)"""
+    if not budget or budget <= 0 or top_n <= 0:
+        return []
+
+    hotel_column, transport_column, local_column = price_columns(
+        hotels, transports, local_transports, nights, people, rooms
+    )
+
+    def choices(column, weight):
+        # A kind the providers returned nothing for is left out of bundles
+        if not len(column):
+            return [NO_CHOICE]
+        return [
+            Choice(total, _rating(option) * weight, option)
+            for total, option in zip(column.totals, column.options) if total <= budget
+        ]
+
+    hotel_choices = skyline(choices(hotel_column, HOTEL_RATING_WEIGHT), top_n)
+    pairs = skyline([
+        Choice(transport.cost + local.cost, transport.value + local.value, (transport, local))
+        for transport in skyline(choices(transport_column, TRANSPORT_RATING_WEIGHT), top_n)
+        for local in skyline(choices(local_column, TRANSPORT_RATING_WEIGHT), top_n)
+        if transport.cost + local.cost <= budget
+    ], top_n)
+    if not hotel_choices or not pairs:
+        return []
+
+    knapsack = AttractionKnapsack(attractions, people, int(budget))
+    best_pair_value = max(pair.value for pair in pairs)
+    best_attraction_value = knapsack.value(budget)
+
+    heap = []  # (score, -cost, seq, hotel, pair) min-heap of the top N
+    seq = count()
+    for hotel in hotel_choices:
+        if len(heap) == top_n and hotel.value + best_pair_value + best_attraction_value < heap[0][0]:
+            continue
+        for pair in pairs:
+            cost = hotel.cost + pair.cost
+            if cost > budget:
+                break  # pairs are ordered by cost
+            score = hotel.value + pair.value + knapsack.value(budget - cost)
+            entry = (score, -cost, -next(seq), hotel, pair)
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            elif entry[:3] > heap[0][:3]:
+                heapq.heapreplace(heap, entry)
+
+    bundles = []
+    for score, _, _, hotel, pair in sorted(heap, key=lambda entry: entry[:3], reverse=True):
+        transport, local = pair.option
+        remaining = budget - hotel.cost - pair.cost
+        chosen = knapsack.choose(remaining)
+        attractions_total = sum(a['price_per_person'] for a in chosen) * people
+        total = hotel.cost + pair.cost + attractions_total
+        bundles.append({
+            'score': round(score, 2),
+            'hotel': hotel.option,
+            'transport': transport.option,
+            'local_transport': local.option,
+            'attractions': chosen,
+            'price_breakdown': {
+                'hotel': round(hotel.cost, 2),
+                'transport': round(transport.cost, 2),
+                'local_transport': round(local.cost, 2),
+                'attractions': round(attractions_total, 2),
+                'total': round(total, 2),
+                'remaining_budget': round(budget - total, 2),
+                'currency': 'USD'
+            }
+        })
+    return bundles
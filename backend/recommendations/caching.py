@@ -0,0 +1,254 @@
+"""
+In-process caching helpers for provider calls.
+"""
+
+import time
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from django.db import close_old_connections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    """Small shared pool for background stale-while-revalidate refreshes"""
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _refresh_executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+    return _refresh_executor
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with a TTL and stale-while-revalidate.
+
+    An entry is fresh for `ttl` seconds and then stale for another
+    `stale_ttl` seconds. Stale entries are still returned immediately while
+    a single background refresh reloads them; after that they expire.
+    Empty results are not cached, since providers return [] on errors.
+    A ttl of 0 disables caching.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0, max_entries: int = 1000):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, fresh_until, stale_until)
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _store(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader() on a miss"""
+        if self.ttl <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now >= entry[2]:
+                del self._entries[key]
+                entry = None
+
+        if entry:
+            value, fresh_until, _ = entry
+            if now < fresh_until:
+                self._count('hits')
+            else:
+                self._count('stale_hits')
+                self._schedule_refresh(key, loader)
+            return value
+
+        self._count('misses')
+        value = loader()
+        if value:
+            self._store(key, value)
+        return value
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of get_or_load; stale entries are refreshed in a task"""
+        if self.ttl <= 0:
+            return await loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now >= entry[2]:
+                del self._entries[key]
+                entry = None
+
+        if entry:
+            value, fresh_until, _ = entry
+            if now < fresh_until:
+                self._count('hits')
+            else:
+                self._count('stale_hits')
+                with self._lock:
+                    schedule = key not in self._refreshing
+                    self._refreshing.add(key)
+                if schedule:
+                    task = asyncio.get_running_loop().create_task(self._arefresh(key, loader))
+                    # Hold a reference so the task isn't garbage collected mid-flight
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            return value
+
+        self._count('misses')
+        value = await loader()
+        if value:
+            self._store(key, value)
+        return value
+
+    async def _arefresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        try:
+            value = await loader()
+            if value:
+                self._store(key, value)
+            self._count('refreshes')
+        except Exception as e:
+            self._count('refresh_errors')
+            logger.error(f"Background refresh of {self.name} cache failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        _get_refresh_executor().submit(self._refresh, key, loader)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]):
+        try:
+            value = loader()
+            if value:
+                self._store(key, value)
+            self._count('refreshes')
+        except Exception as e:
+            self._count('refresh_errors')
+            logger.error(f"Background refresh of {self.name} cache failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+            close_old_connections()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['stale_hits']) / lookups, 4) if lookups else 0.0
+        stats['ttl'] = self.ttl
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent identical calls within a process.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for and share its result (or exception) instead of
+    issuing their own upstream request.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}  # key -> Future of the in-flight call
+        self._async_calls = {}  # (event loop, key) -> asyncio.Task of the in-flight call
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Run func() for key, or join an identical call already in flight"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self._stats['calls'] += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of do(); coalesces calls made on the same event loop.
+        The call runs in its own task, so cancelling any caller (the first
+        one included, e.g. on a search deadline) doesn't cancel it for the
+        others.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+        with self._lock:
+            task = self._async_calls.get(loop_key)
+            if task is not None:
+                self._stats['coalesced'] += 1
+            else:
+                task = loop.create_task(func())
+                self._async_calls[loop_key] = task
+                self._stats['calls'] += 1
+                task.add_done_callback(functools.partial(self._async_call_done, loop_key))
+
+        return await asyncio.shield(task)
+
+    def _async_call_done(self, loop_key, task: asyncio.Task):
+        with self._lock:
+            if self._async_calls.get(loop_key) is task:
+                del self._async_calls[loop_key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody is still awaiting doesn't log a warning
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Upstream calls made, calls that joined one in flight, and current in-flight count"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls) + len(self._async_calls)
+        return stats
@@ -0,0 +1,158 @@
+"""
+IATA code resolution with an in-memory LRU in front of the CityCode table.
+City-to-IATA mappings almost never change, so once a city has been resolved
+(or preloaded from CSV) searches no longer call the reference-data API.
+"""
+
+import csv
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from django.conf import settings
+from django.db import DatabaseError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_city_name(name: str) -> str:
+    """Normalize a city name for lookups: trimmed, single-spaced, lowercase"""
+    return ' '.join((name or '').split()).lower()
+
+
+class CityCodeResolver:
+    """
+    Resolve city names to IATA codes.
+
+    Lookup order:
+    1. In-memory LRU (per process)
+    2. CityCode table (shared by all workers)
+    3. The supplied lookup callable (Amadeus reference-data API); the result
+       is persisted so later searches are served from steps 1-2
+    """
+
+    # Column names accepted by load_csv, e.g. OurAirports uses 'municipality'
+    CITY_COLUMNS = ('city', 'name', 'municipality')
+    CODE_COLUMNS = ('iata_code', 'iata', 'code')
+    COUNTRY_COLUMNS = ('country_code', 'iso_country', 'country')
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or getattr(settings, 'CITY_CODE_CACHE_SIZE', 2048)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, code: str):
+        with self._lock:
+            self._entries[key] = code
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[str]:
+        with self._lock:
+            code = self._entries.get(key)
+            if code:
+                self._entries.move_to_end(key)
+            return code
+
+    def resolve(self, city_name: str, lookup: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        Return the IATA code for city_name.
+
+        Args:
+            city_name: City name as entered by the user
+            lookup: Fallback resolving a name via the API, returns code or None
+        """
+        code = self.get_cached(city_name)
+        if code:
+            return code
+
+        code = lookup(city_name)
+        if code:
+            self.store(city_name, code)
+        return code
+
+    def get_cached(self, city_name: str) -> Optional[str]:
+        """Return the code from memory or the CityCode table, without calling the API"""
+        from .models import CityCode
+
+        key = normalize_city_name(city_name)
+        if not key:
+            return None
+
+        code = self._recall(key)
+        if code:
+            return code
+
+        try:
+            code = CityCode.objects.filter(name=key).values_list('iata_code', flat=True).first()
+        except DatabaseError as e:
+            logger.warning(f"City code table unavailable: {e}")
+            return None
+
+        if code:
+            self._remember(key, code)
+        return code
+
+    def store(self, city_name: str, code: str, source: str = 'api'):
+        """Persist a resolved code and keep it in memory"""
+        from .models import CityCode
+
+        key = normalize_city_name(city_name)
+        if not key:
+            return
+        try:
+            CityCode.objects.update_or_create(name=key, defaults={'iata_code': code, 'source': source})
+        except DatabaseError as e:
+            logger.warning(f"Could not persist city code for {city_name}: {e}")
+        self._remember(key, code)
+
+    def load_csv(self, path: str, source: str = 'csv') -> int:
+        """
+        Bulk upsert city codes from a CSV file into the CityCode table.
+
+        The file needs a header row with a city column (city/name/municipality)
+        and an IATA column (iata_code/iata/code); a country column is optional.
+        Rows without a 3-letter code are skipped. The first row wins when a
+        city appears more than once.
+
+        Returns:
+            Number of cities written
+        """
+        from .models import CityCode
+
+        rows = {}
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            fields = reader.fieldnames or []
+            city_col = next((c for c in self.CITY_COLUMNS if c in fields), None)
+            code_col = next((c for c in self.CODE_COLUMNS if c in fields), None)
+            country_col = next((c for c in self.COUNTRY_COLUMNS if c in fields), None)
+            if not city_col or not code_col:
+                raise ValueError(f"CSV must have a city column {self.CITY_COLUMNS} and an IATA column {self.CODE_COLUMNS}")
+
+            for row in reader:
+                key = normalize_city_name(row.get(city_col))
+                code = (row.get(code_col) or '').strip().upper()
+                if not key or len(code) != 3 or key in rows:
+                    continue
+                country = (row.get(country_col) or '').strip().upper()[:2] if country_col else ''
+                rows[key] = CityCode(name=key, iata_code=code, country_code=country, source=source)
+
+        CityCode.objects.bulk_create(
+            rows.values(),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['iata_code', 'country_code', 'source', 'updated_at']
+        )
+        self.clear()
+        return len(rows)
+
+    def clear(self):
+        """Drop the in-memory entries (the table is left untouched)"""
+        with self._lock:
+            self._entries.clear()
+
+
+city_code_resolver = CityCodeResolver()
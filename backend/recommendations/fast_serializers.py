@@ -0,0 +1,208 @@
+"""
+values()-based read path for list endpoints.
+
+ValuesSerializer reproduces the output of a DRF ModelSerializer from plain
+values() rows instead of model instances. The field list, the values()
+columns and a converter per field are worked out once per serializer class
+from the serializer's own field definitions, so the JSON shape stays in
+sync with the regular serializers.
+
+Supported serializer fields:
+- model fields (Decimal and datetime are formatted like DRF does)
+- nested serializers on a foreign key (fetched through the same query)
+- nested many=True serializers on a many-to-many field (one query per
+  field, whatever the page size)
+- SerializerMethodFields, computed by a values_<name>(row) method on the
+  serializer, or read from a queryset annotation of the same name
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Tuple
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+VALUE, NESTED, MANY, METHOD = range(4)
+
+# DRF fields whose to_representation returns DB values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField, serializers.CharField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.JSONField, serializers.ReadOnlyField,
+    serializers.FloatField,
+)
+
+
+class Plan(NamedTuple):
+    model: Any
+    columns: Tuple[str, ...]
+    fields: Tuple[Tuple[str, int, Any], ...]  # (name, kind, column/converter/sub-plan)
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or getattr(field, 'normalize_output', False):
+        return field.to_representation
+    exponent = Decimal(1).scaleb(-field.decimal_places) if field.decimal_places is not None else None
+
+    def convert(value):
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value).strip())
+        if exponent is not None:
+            value = value.quantize(exponent, rounding=field.rounding)
+        return '{:f}'.format(value)
+    return convert
+
+
+def _converter(field):
+    """Callable formatting a non-null DB value like field.to_representation, or None for as-is"""
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, PASSTHROUGH_FIELDS) and not getattr(field, 'binary', False):
+        return None
+    return field.to_representation
+
+
+_plans: Dict[type, Plan] = {}
+
+
+def get_plan(serializer_class) -> Plan:
+    """Columns and per-field handling for serializer_class, built once"""
+    plan = _plans.get(serializer_class)
+    if plan is None:
+        plan = _plans[serializer_class] = _build_plan(serializer_class)
+    return plan
+
+
+def _build_plan(serializer_class) -> Plan:
+    serializer = serializer_class()
+    columns = []
+    fields = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            fields.append((name, METHOD, None))
+        elif isinstance(field, serializers.ListSerializer):
+            fields.append((name, MANY, (field.source, type(field.child))))
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = get_plan(type(field))
+            if any(kind != VALUE for _, kind, _ in nested.fields):
+                raise TypeError(f'{serializer_class.__name__}.{name}: nested serializers may only contain model fields')
+            prefix = f'{field.source}__'
+            columns.extend(prefix + column for column in nested.columns)
+            fields.append((name, NESTED, (prefix, nested)))
+        else:
+            columns.append(field.source)
+            fields.append((name, VALUE, (field.source, _converter(field))))
+    return Plan(serializer_class.Meta.model, tuple(columns), tuple(fields))
+
+
+class ValuesSerializer:
+    """
+    Serialize a queryset through values() with the output of serializer_class.
+
+    Usage:
+        values = ValuesSerializer(HotelSerializer, context)
+        rows = values.values_queryset(queryset)  # can be paginated
+        data = values.to_representation(rows)
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.serializer_class = serializer_class
+        self.context = context if context is not None else {}
+        self.plan = get_plan(serializer_class)
+        # Bound values_<name> hooks share the context (and its parsed params)
+        self.serializer = serializer_class(context=self.context)
+        self.hooks = {
+            name: getattr(self.serializer, f'values_{name}')
+            for name, kind, _ in self.plan.fields if kind == METHOD
+        }
+
+    def values_queryset(self, queryset):
+        """values() queryset with the plan's columns plus matching annotations"""
+        annotations = [
+            name for name, kind, _ in self.plan.fields
+            if kind == METHOD and name in queryset.query.annotations
+        ]
+        return queryset.prefetch_related(None).values(*self.plan.columns, *annotations)
+
+    def to_representation(self, rows) -> List[Dict[str, Any]]:
+        rows = list(rows)
+        many = {
+            name: self._fetch_many(*info, rows)
+            for name, kind, info in self.plan.fields if kind == MANY
+        }
+        return [self._row(row, many) for row in rows]
+
+    def _row(self, row, many) -> Dict[str, Any]:
+        data = {}
+        for name, kind, info in self.plan.fields:
+            if kind == VALUE:
+                column, convert = info
+                value = row[column]
+                data[name] = value if value is None or convert is None else convert(value)
+            elif kind == NESTED:
+                prefix, nested = info
+                data[name] = self._nested(row, prefix, nested)
+            elif kind == METHOD:
+                data[name] = self.hooks[name](row)
+            else:
+                data[name] = many[name].get(row['id'], [])
+        return data
+
+    def _nested(self, row, prefix, nested):
+        if row[prefix + nested.columns[0]] is None:
+            return None
+        data = {}
+        for name, _, (column, convert) in nested.fields:
+            value = row[prefix + column]
+            data[name] = value if value is None or convert is None else convert(value)
+        return data
+
+    def _fetch_many(self, source, child_class, rows) -> Dict[Any, List[Dict[str, Any]]]:
+        """Related rows of a many-to-many field grouped by parent id, in the related model's ordering"""
+        if not rows:
+            return {}
+        m2m = self.plan.model._meta.get_field(source)
+        parent = m2m.related_query_name()
+        child = ValuesSerializer(child_class, self.context)
+        children = child.values_queryset(
+            m2m.related_model.objects.filter(**{f'{parent}__in': [row['id'] for row in rows]})
+        ).annotate(_parent_id=F(parent))
+
+        grouped = {}
+        converted = {}
+        for row in children:
+            data = converted.get(row['id'])
+            if data is None:
+                data = converted[row['id']] = child._row(row, {})
+            grouped.setdefault(row['_parent_id'], []).append(data)
+        return grouped
+
+
+class FastListMixin:
+    """
+    Opt-in values() read path for a viewset's list action.
+
+    Set fast_list = True on a viewset to serialize list pages (and other
+    list-shaped actions using get_list_response) with ValuesSerializer
+    instead of the model serializer. Output is identical.
+    """
+    fast_list = False
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+        return self.get_list_response(self.filter_queryset(self.get_queryset()), paginate=True)
+
+    def get_list_response(self, queryset, paginate=False):
+        if not self.fast_list:
+            return Response(self.get_serializer(queryset, many=True).data)
+        values = ValuesSerializer(self.get_serializer_class(), self.get_serializer_context())
+        rows = values.values_queryset(queryset)
+        page = self.paginate_queryset(rows) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(values.to_representation(page))
+        return Response(values.to_representation(rows))
@@ -0,0 +1,57 @@
+"""
+Field selection for search and planner responses.
+
+Clients pass ?fields=a,b (or ?include=a,b, or the same keys in the JSON
+body) to receive only the sections they render. Dotted names select inside
+a section, e.g. recommendations.hotels. Services check wants() before
+building an optional section so unrequested ones are never computed;
+project() then trims the response. Unknown names are ignored.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+
+Fields = Optional[FrozenSet[str]]  # None means every field
+
+
+def parse_fields(value) -> Fields:
+    """Field names from a comma-separated string or a list; None when none are given"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    elif not isinstance(value, (list, tuple)):
+        return None
+    names = frozenset(name.strip() for name in value if isinstance(name, str) and name.strip())
+    return names or None
+
+
+def wants(fields: Fields, name: str) -> bool:
+    """Whether a field, or something inside it, was requested"""
+    if fields is None or name in fields:
+        return True
+    prefix = name + '.'
+    return any(field.startswith(prefix) for field in fields)
+
+
+def subfields(fields: Fields, name: str) -> Fields:
+    """Requested fields inside `name` (None when it was requested whole)"""
+    if fields is None or name in fields:
+        return None
+    prefix = name + '.'
+    return frozenset(field[len(prefix):] for field in fields if field.startswith(prefix))
+
+
+def project(data: Dict[str, Any], fields: Fields, always: Iterable[str] = ()) -> Dict[str, Any]:
+    """Copy of data with only the requested fields (plus `always`), in their original order"""
+    if fields is None:
+        return data
+    always = frozenset(always)
+    projected = {}
+    for key, value in data.items():
+        if key in always:
+            projected[key] = value
+        elif wants(fields, key):
+            inner = subfields(fields, key)
+            projected[key] = project(value, inner) if inner is not None and isinstance(value, dict) else value
+    return projected
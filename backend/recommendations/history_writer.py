@@ -0,0 +1,162 @@
+"""
+Buffered SearchHistory writer.
+Searches queue their history row in memory and a background thread writes
+the rows in batches, so the search request path no longer waits on an INSERT.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+from django.conf import settings
+from django.db import close_old_connections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SearchHistoryWriter:
+    """
+    Queue SearchHistory entries and flush them with bulk_create.
+
+    A batch is written once SEARCH_HISTORY_BATCH_SIZE entries are queued or
+    SEARCH_HISTORY_FLUSH_INTERVAL seconds have passed. The queue is bounded by
+    SEARCH_HISTORY_MAX_QUEUE; entries arriving while it is full are dropped
+    and counted rather than slowing searches down. Whatever is still queued is
+    written when the process exits.
+
+    Note that created_at is set when the batch is written, so it can lag the
+    search by up to the flush interval.
+    """
+
+    def __init__(self):
+        self.enabled = getattr(settings, 'SEARCH_HISTORY_BUFFERED', True)
+        self.batch_size = getattr(settings, 'SEARCH_HISTORY_BATCH_SIZE', 100)
+        self.flush_interval = getattr(settings, 'SEARCH_HISTORY_FLUSH_INTERVAL', 2.0)
+        self._queue = queue.Queue(maxsize=getattr(settings, 'SEARCH_HISTORY_MAX_QUEUE', 10000))
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {'queued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'flushes': 0}
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    def record(self, entry) -> bool:
+        """
+        Queue an unsaved SearchHistory instance for writing.
+        Writes it immediately when buffering is disabled.
+
+        Returns:
+            False if the entry was dropped because the queue is full
+        """
+        if not self.enabled:
+            entry.save()
+            return True
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count('dropped')
+            return False
+
+        self._count('queued')
+        return True
+
+    async def arecord(self, entry) -> bool:
+        """Async version of record for the ASGI views"""
+        if not self.enabled:
+            await entry.asave()
+            return True
+        return self.record(entry)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='search-history-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+        close_old_connections()
+
+    def _collect(self) -> List[Any]:
+        """Wait for up to batch_size entries or until the flush interval passes"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if entry is None:  # Wake-up sentinel from stop()
+                break
+            batch.append(entry)
+        return batch
+
+    def _drain(self) -> List[Any]:
+        batch = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if entry is not None:
+                batch.append(entry)
+
+    def _write(self, batch: List[Any]):
+        from .models import SearchHistory
+
+        with self._write_lock:
+            try:
+                SearchHistory.objects.bulk_create(batch, batch_size=self.batch_size)
+                self._count('written', len(batch))
+            except Exception as e:
+                self._count('failed', len(batch))
+                logger.error(f"Failed to write {len(batch)} search history entries: {e}")
+            finally:
+                self._count('flushes')
+                close_old_connections()
+
+    def flush(self):
+        """Write everything queued right now from the calling thread"""
+        batch = self._drain()
+        if batch:
+            self._write(batch)
+
+    def stop(self, timeout: float = 10):
+        """Stop the background thread and write whatever is still queued"""
+        if self._thread is None or self._stopping.is_set():
+            return
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # The writer is busy and will see the stop flag after this batch
+        self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queued/written/dropped counters and current queue depth"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        stats['buffered'] = self.enabled
+        return stats
+
+
+search_history_writer = SearchHistoryWriter()
@@ -0,0 +1,31 @@
+"""
+Management command running the benchmarks in recommendations/benchmarks.py.
+Run with: python manage.py benchmark <name> [--size N]
+List them with: python manage.py benchmark
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from recommendations.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = 'Run a named performance benchmark (seeded rows are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Benchmark to run; omit to list them')
+        parser.add_argument('--size', type=int, default=None,
+                            help='Dataset size (default depends on the benchmark)')
+
+    def handle(self, *args, **options):
+        name = options['name']
+        if not name:
+            for key, bench in sorted(BENCHMARKS.items()):
+                self.stdout.write(f'{key:<20} {bench.description} (default size {bench.default_size})')
+            return
+
+        bench = BENCHMARKS.get(name)
+        if bench is None:
+            raise CommandError(f"Unknown benchmark '{name}'. Available: {', '.join(sorted(BENCHMARKS))}")
+
+        size = options['size'] or bench.default_size
+        bench.func(size, self.stdout.write)
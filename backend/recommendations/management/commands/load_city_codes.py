@@ -0,0 +1,22 @@
+"""
+Management command to preload IATA city codes from a CSV file.
+Run with: python manage.py load_city_codes path/to/cities.csv
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from recommendations.city_codes import city_code_resolver
+
+
+class Command(BaseCommand):
+    help = 'Load city to IATA code mappings from a CSV file (city, iata_code[, country_code])'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='Path to a CSV file with a header row')
+
+    def handle(self, *args, **options):
+        try:
+            count = city_code_resolver.load_csv(options['csv_path'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f'Loaded {count} city codes'))
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:26
+
+from django.db import migrations, models
+
+
+TRIGRAM_INDEXES = {
+    'dest_city_norm_trgm_idx': 'city_normalized',
+    'dest_country_norm_trgm_idx': 'country_normalized',
+}
+
+
+def normalize(value):
+    return ' '.join((value or '').split()).lower()
+
+
+def populate_normalized_names(apps, schema_editor):
+    Destination = apps.get_model('recommendations', 'Destination')
+    destinations = list(Destination.objects.using(schema_editor.connection.alias).all())
+    for destination in destinations:
+        destination.city_normalized = normalize(destination.city)
+        destination.country_normalized = normalize(destination.country)
+    Destination.objects.using(schema_editor.connection.alias).bulk_update(
+        destinations, ['city_normalized', 'country_normalized'], batch_size=1000
+    )
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Substring filters (LIKE '%term%') can only use an index through pg_trgm;
+    # other databases keep the plain B-tree indexes on the normalized columns.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON recommendations_destination '
+            f'USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0002_citycode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='destination',
+            name='city_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='destination',
+            name='country_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(populate_normalized_names, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+        migrations.AddIndex(
+            model_name='attraction',
+            index=models.Index(fields=['destination', 'is_available', 'category'], name='attr_dest_avail_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attraction',
+            index=models.Index(fields=['is_available', '-rating', 'name'], name='attr_avail_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['is_popular', 'name'], name='dest_popular_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['destination', 'is_available', 'price_per_night'], name='hotel_dest_avail_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['is_available', 'price_per_night'], name='hotel_avail_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['is_available', '-rating'], name='hotel_avail_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['is_available', '-star_rating'], name='hotel_avail_stars_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transport',
+            index=models.Index(fields=['destination', 'is_available', 'transport_type'], name='transport_dest_avail_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transport',
+            index=models.Index(fields=['is_available', 'price_per_person'], name='transport_avail_price_idx'),
+        ),
+    ]
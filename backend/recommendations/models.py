@@ -1,5 +1,39 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .city_codes import normalize_city_name
+
+
+class DestinationQuerySet(models.QuerySet):
+    """
+    Keeps the normalized name columns in sync for bulk writes, which skip
+    save(). update() only accepts plain city/country values (unless the
+    normalized column is set alongside, as bulk_update does); an expression
+    can't be normalized here, so it is rejected rather than leaving the
+    search columns stale.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.normalize_names()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if {'city', 'country'} & set(fields):
+            objs = list(objs)
+            for obj in objs:
+                obj.normalize_names()
+            fields += [f for f in ('city_normalized', 'country_normalized') if f not in fields]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        for field in ('city', 'country'):
+            if field in kwargs and f'{field}_normalized' not in kwargs:
+                if not isinstance(kwargs[field], str):
+                    raise ValueError(f"Destination.{field} must be updated with a plain value to keep {field}_normalized in sync")
+                kwargs[f'{field}_normalized'] = normalize_city_name(kwargs[field])
+        return super().update(**kwargs)
 
 
 class Destination(models.Model):
@@ -12,16 +46,58 @@ class Destination(models.Model):
     longitude = models.DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
     image_url = models.URLField(blank=True)
     is_popular = models.BooleanField(default=False)
+    # Lowercased copies used by the search filters; kept in sync by save()
+    # and the DestinationQuerySet bulk writes (raw SQL bypasses both)
+    city_normalized = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    country_normalized = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = DestinationQuerySet.as_manager()
+
     class Meta:
         ordering = ['name']
         unique_together = ['city', 'country']
+        indexes = [
+            models.Index(fields=['is_popular', 'name'], name='dest_popular_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.city}, {self.country}"
 
+    def normalize_names(self):
+        self.city_normalized = normalize_city_name(self.city)
+        self.country_normalized = normalize_city_name(self.country)
+
+    def save(self, *args, **kwargs):
+        self.normalize_names()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and ({'city', 'country'} & set(update_fields)):
+            kwargs['update_fields'] = set(update_fields) | {'city_normalized', 'country_normalized'}
+        super().save(*args, **kwargs)
+
+
+class CityCode(models.Model):
+    """Resolved IATA city/airport codes, cached so searches skip reference-data lookups"""
+    SOURCE_CHOICES = [
+        ('api', 'Amadeus API'),
+        ('csv', 'CSV Import'),
+        ('manual', 'Manual'),
+    ]
+    
+    name = models.CharField(max_length=200, unique=True)  # Normalized city name (lowercase)
+    iata_code = models.CharField(max_length=3)
+    country_code = models.CharField(max_length=2, blank=True)
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='api')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.iata_code})"
+
 
 class Hotel(models.Model):
     """Hotel information"""
@@ -47,6 +123,12 @@ class Hotel(models.Model):
 
     class Meta:
         ordering = ['-rating', 'price_per_night']
+        indexes = [
+            models.Index(fields=['destination', 'is_available', 'price_per_night'], name='hotel_dest_avail_price_idx'),
+            models.Index(fields=['is_available', 'price_per_night'], name='hotel_avail_price_idx'),
+            models.Index(fields=['is_available', '-rating'], name='hotel_avail_rating_idx'),
+            models.Index(fields=['is_available', '-star_rating'], name='hotel_avail_stars_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.destination.city}"
@@ -81,6 +163,10 @@ class Transport(models.Model):
 
     class Meta:
         ordering = ['price_per_person']
+        indexes = [
+            models.Index(fields=['destination', 'is_available', 'transport_type'], name='transport_dest_avail_type_idx'),
+            models.Index(fields=['is_available', 'price_per_person'], name='transport_avail_price_idx'),
+        ]
 
     def __str__(self):
         return f"{self.transport_type} - {self.name}"
@@ -125,6 +211,10 @@ class Attraction(models.Model):
 
     class Meta:
         ordering = ['-rating', 'name']
+        indexes = [
+            models.Index(fields=['destination', 'is_available', 'category'], name='attr_dest_avail_cat_idx'),
+            models.Index(fields=['is_available', '-rating', 'name'], name='attr_avail_rating_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.destination.city}"
@@ -133,6 +223,11 @@ class Attraction(models.Model):
         return float(self.price_per_person) * people
 
 
+def discounted_price(base_price, discount_percentage):
+    discount = float(base_price) * float(discount_percentage) / 100
+    return float(base_price) - discount
+
+
 class TravelPackage(models.Model):
     """Pre-built travel packages"""
     name = models.CharField(max_length=200)
@@ -158,8 +253,7 @@ class TravelPackage(models.Model):
         return f"{self.name} - {self.destination.city}"
 
     def get_discounted_price(self):
-        discount = float(self.base_price) * float(self.discount_percentage) / 100
-        return float(self.base_price) - discount
+        return discounted_price(self.base_price, self.discount_percentage)
 
 
 class SearchHistory(models.Model):
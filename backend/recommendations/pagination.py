@@ -0,0 +1,173 @@
+"""
+Pagination for the catalog endpoints.
+
+Page-number pagination runs a COUNT(*) and an OFFSET scan that grows with
+the page number. Keyset (cursor) pagination instead filters on the sort
+key of the last row seen, so every page costs the same index range scan.
+"""
+
+import base64
+import json
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the queryset's own ordering.
+
+    Works with whatever order_by the viewset applied (e.g. price_per_night,
+    -rating, -star_rating, price_per_person), with the primary key appended
+    as a tie-breaker so rows sharing a sort value are never skipped or
+    repeated. The cursor is an opaque base64 token holding the sort values
+    of the boundary row and the direction.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'REST_FRAMEWORK', {}).get('PAGE_SIZE', 20)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """Ordering fields of the queryset plus a pk tie-breaker"""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+        ordering = [field for field in ordering if isinstance(field, str)]
+        pk = queryset.model._meta.pk.attname
+        ordering = [field.replace('pk', pk) if field.lstrip('-') == 'pk' else field for field in ordering]
+        if not any(field.lstrip('-') == pk for field in ordering):
+            ordering.append(f'-{pk}' if ordering and ordering[0].startswith('-') else pk)
+        return ordering
+
+    def encode_cursor(self, values, reverse=False):
+        payload = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            values, reverse = payload['v'], bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def _position(self, obj):
+        """Sort values of a row, which may be a model instance or a values() dict"""
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            values.append(value if isinstance(value, (int, float, str, type(None))) else str(value))
+        return values
+
+    def _after(self, values, reverse):
+        """Q selecting rows strictly after (or before, if reverse) the cursor position"""
+        query = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            query |= equal & Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            equal &= Q(**{name: value})
+        return query
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        values, reverse = self.decode_cursor(request)
+
+        order_by = self.ordering
+        if reverse:
+            order_by = [field[1:] if field.startswith('-') else f'-{field}' for field in order_by]
+        queryset = queryset.order_by(*order_by)
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Moving forward there is a next page if we over-fetched; moving
+        # backward there always is one (the page we came from), and the
+        # same holds in mirror image for the previous page.
+        has_next = has_more if not reverse else values is not None
+        has_previous = (values is not None) if not reverse else has_more
+        self.next_position = self._position(rows[-1]) if rows and has_next else None
+        self.previous_position = self._position(rows[0]) if rows and has_previous else None
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.previous_position, reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class CatalogPaginationMixin:
+    """
+    Lets catalog viewsets switch between page-number and keyset pagination.
+
+    The mode comes from the `pagination` query param ('page' or 'cursor'),
+    falling back to the CATALOG_PAGINATION setting.
+    """
+    pagination_classes = {
+        'page': PageNumberPagination,
+        'cursor': KeysetPagination,
+    }
+
+    def get_pagination_mode(self):
+        mode = self.request.query_params.get('pagination') if self.request else None
+        if mode not in self.pagination_classes:
+            mode = getattr(settings, 'CATALOG_PAGINATION', 'page')
+        return mode if mode in self.pagination_classes else 'page'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.pagination_classes[self.get_pagination_mode()]()
+        return self._paginator
+
@@ -0,0 +1,132 @@
+"""
+Columnar price evaluation for search results.
+
+Each option list (hotels, inter-city transports, local transports) is
+reduced once to a column of trip totals for the search's nights, people
+and rooms. Budget filtering and the cheapest option then run over that
+column with C-level iterator chains (map, compress, min) instead of
+re-reading and re-multiplying prices from the option dicts at every step.
+"""
+
+from itertools import compress, repeat
+from operator import ge
+from typing import Dict, List, NamedTuple, Optional
+
+
+# Share of the trip budget available to each kind of option
+HOTEL_BUDGET_SHARE = 0.6
+TRANSPORT_BUDGET_SHARE = 0.3
+LOCAL_TRANSPORT_BUDGET_SHARE = 0.1
+
+
+class PriceColumn:
+    """
+    Options of one kind alongside their trip totals.
+
+    Totals are a plain list: array('d') re-boxes every float on iteration,
+    which makes these passes slower, not faster.
+    """
+
+    __slots__ = ('options', 'totals')
+
+    def __init__(self, options: List[Dict], totals: List[float]):
+        self.options = options
+        self.totals = totals
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def select(self, limit: float) -> tuple:
+        """(options within limit in provider order, cheapest of them) from one mask"""
+        totals = self.totals
+        mask = list(map(ge, repeat(limit), totals))
+        lowest = min(compress(totals, mask), default=None)
+        if lowest is None:
+            return [], None
+        # The first option at the lowest total is itself within limit
+        return list(compress(self.options, mask)), self.options[totals.index(lowest)]
+
+    def cheapest(self) -> Optional[Dict]:
+        """Cheapest option (the first one on ties)"""
+        if not self.totals:
+            return None
+        return self.options[self.totals.index(min(self.totals))]
+
+    def by_price(self) -> List[Dict]:
+        """All options ordered by total (stable)"""
+        options = self.options
+        return [options[i] for i in sorted(range(len(options)), key=self.totals.__getitem__)]
+
+
+class PricedOptions(NamedTuple):
+    options: List[Dict]
+    cheapest: Optional[Dict]
+
+
+def select(column: PriceColumn, limit: Optional[float], sort_fallback: bool = False) -> PricedOptions:
+    """
+    Options within limit (all of them when none fit, or when there is no
+    limit) and the cheapest of those. With sort_fallback, the fallback list
+    is ordered by price.
+    """
+    if limit is not None:
+        options, cheapest = column.select(limit)
+        if options:
+            return PricedOptions(options, cheapest)
+        if sort_fallback:
+            options = column.by_price()
+            return PricedOptions(options, options[0] if options else None)
+    return PricedOptions(column.options, column.cheapest())
+
+
+class PriceEvaluation(NamedTuple):
+    hotels: PricedOptions
+    transports: PricedOptions
+    local_transports: PricedOptions
+
+
+def price_columns(
+    hotels: List[Dict],
+    transports: List[Dict],
+    local_transports: List[Dict],
+    nights: int,
+    people: int,
+    rooms: int
+) -> tuple:
+    """Trip totals per option: hotels for all nights and rooms, transports for all people"""
+    return (
+        PriceColumn(hotels, [h['price_per_night'] * nights * rooms for h in hotels]),
+        PriceColumn(transports, [t['price_per_person'] * people for t in transports]),
+        PriceColumn(local_transports, [lt.get('total_price', 0) for lt in local_transports]),
+    )
+
+
+def evaluate_prices(
+    hotels: List[Dict],
+    transports: List[Dict],
+    local_transports: List[Dict],
+    nights: int,
+    people: int,
+    rooms: int,
+    budget: Optional[float] = None
+) -> PriceEvaluation:
+    """
+    Apply the 60/30/10 budget split and pick the cheapest option of each kind.
+
+    Without a budget every option is kept. With one, options over their
+    share are dropped unless none fit; hotels then fall back to the full
+    list ordered by price.
+    """
+    hotel_column, transport_column, local_column = price_columns(
+        hotels, transports, local_transports, nights, people, rooms
+    )
+    has_budget = bool(budget and budget > 0)
+
+    def limit(share):
+        return budget * share if has_budget else None
+
+    return PriceEvaluation(
+        hotels=select(hotel_column, limit(HOTEL_BUDGET_SHARE), sort_fallback=True),
+        transports=select(transport_column, limit(TRANSPORT_BUDGET_SHARE)),
+        local_transports=select(local_column, limit(LOCAL_TRANSPORT_BUDGET_SHARE)),
+    )
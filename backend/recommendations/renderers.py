@@ -0,0 +1,229 @@
+"""
+Fast JSON rendering and negotiated response compression for the search
+and planner endpoints, whose responses are large nested dicts, plus
+server-sent events / NDJSON framing for streamed planner responses.
+
+orjson and brotli are optional: without orjson rendering falls back to
+DRF's JSON renderer, and without brotli only gzip is offered.
+"""
+
+import asyncio
+import gzip
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Mid-range levels: most of the size win for a fraction of the CPU of the maximum
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+_drf_encoder = JSONEncoder()
+_drf_renderer = JSONRenderer()
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder so they keep DRF's format
+    # (millisecond precision, 'Z' suffix); int dict keys become strings
+    # like with the json module.
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def fast_json_enabled() -> bool:
+    return orjson is not None and getattr(settings, 'FAST_JSON_RENDERER', True)
+
+
+def dumps(data) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, identical to DRF's compact output"""
+    if fast_json_enabled():
+        try:
+            content = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the json module handle it
+        else:
+            # DRF escapes these for JavaScript compatibility
+            if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+                content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+            return content
+    return _drf_renderer.render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using orjson when it is installed.
+    Indented output (?indent / Accept: application/json; indent=2) still
+    goes through the standard renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJsonResponse(HttpResponse):
+    """JsonResponse equivalent for the plain Django (async) views"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Base for renderers that frame a response as a sequence of (event, data)
+    messages. A plain Response renders as one message: 'error' for 4xx/5xx
+    statuses, 'message' otherwise.
+    """
+    charset = 'utf-8'
+
+    def frame(self, event: str, data) -> bytes:
+        raise NotImplementedError
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        event = 'error' if response is not None and response.status_code >= 400 else 'message'
+        return self.frame(event, data)
+
+
+class EventStreamRenderer(StreamRenderer):
+    """Server-sent events: `event: <name>` and one JSON `data:` line per message"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def frame(self, event, data):
+        return b'event: ' + event.encode() + b'\ndata: ' + dumps(data) + b'\n\n'
+
+
+class NDJSONRenderer(StreamRenderer):
+    """Newline-delimited JSON: one {"event": ..., "data": ...} object per line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def frame(self, event, data):
+        return dumps({'event': event, 'data': data}) + b'\n'
+
+
+STREAM_RENDERERS = (EventStreamRenderer, NDJSONRenderer)
+
+
+def stream_renderer(request):
+    """
+    Streaming renderer requested by ?format=sse|ndjson or the Accept header,
+    or None. For the plain Django views; DRF views negotiate it themselves.
+    """
+    requested = request.GET.get('format')
+    accept = request.META.get('HTTP_ACCEPT', '')
+    for renderer_class in STREAM_RENDERERS:
+        if requested == renderer_class.format or (not requested and renderer_class.media_type in accept):
+            return renderer_class()
+    return None
+
+
+def stream_response(renderer, events, asynchronous=False, headers=None):
+    """
+    StreamingHttpResponse sending each (event, data) pair as soon as it is
+    produced. With asynchronous=True the frames come from an async
+    generator, which ASGI servers stream instead of buffering.
+    """
+    if asynchronous:
+        async def frames():
+            for event, data in events:
+                yield renderer.frame(event, data)
+        content = frames()
+    else:
+        content = (renderer.frame(event, data) for event, data in events)
+
+    response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}', headers=headers)
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts, with q=0 entries removed"""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress_response(request, response):
+    """
+    Compress a rendered response with brotli or gzip if the client accepts
+    it. Streaming, small and already-encoded responses are left alone.
+    """
+    if not getattr(settings, 'RESPONSE_COMPRESSION', True):
+        return response
+    if response.streaming or response.has_header('Content-Encoding'):
+        return response
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if len(response.content) < getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024):
+        return response
+
+    accepted = accepted_encodings(request)
+    if brotli is not None and 'br' in accepted:
+        coding = 'br'
+        content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+    elif 'gzip' in accepted:
+        coding = 'gzip'
+        content = gzip.compress(response.content, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        return response
+
+    if len(content) >= len(response.content):
+        return response
+
+    response.content = content
+    response['Content-Length'] = str(len(content))
+    response['Content-Encoding'] = coding
+    # The representation changed, so a strong ETag no longer applies
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
+
+
+class CompressedResponseMixin:
+    """
+    Negotiated gzip/brotli compression for a view's responses.
+    Works with sync and async class-based views (DRF or plain Django).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            return self._acompress(request, response)
+        return self._compress(request, response)
+
+    async def _acompress(self, request, response):
+        return self._compress(request, await response)
+
+    def _compress(self, request, response):
+        if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+            response.render()
+        return compress_response(request, response)
@@ -0,0 +1,209 @@
+"""
+Response-level cache for travel searches.
+
+Whole /api/search/ responses are stored in Django's cache framework (shared
+by all workers when CACHES points at Redis), keyed on the normalized search
+parameters and namespaced by API_MODE so mock and live results never mix.
+
+The digest of the normalized parameters doubles as a public search_id:
+searches return it, and the AI planner accepts it to reuse the stored
+recommendations instead of calling the providers again. Entries keep the
+normalized parameters next to the response so the planner only reuses a
+search made for the same trip (see matches_search).
+"""
+
+import hashlib
+import json
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, NamedTuple, Optional
+from django.conf import settings
+from django.core.cache import caches
+from .city_codes import normalize_city_name
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSearch(NamedTuple):
+    search: Dict[str, Any]  # normalized get_recommendations kwargs
+    response: Dict[str, Any]
+
+
+class SearchResponseCache:
+    """
+    Cache of search responses keyed on (origin, destination, dates, people,
+    rooms, budget), with city names normalized for case and whitespace.
+
+    Responses with partial results (a provider missed the deadline) are not
+    stored. Cache backend errors count as misses so a cache outage never
+    fails a search. Hit/miss counters are per process.
+    """
+
+    KEY_VERSION = 3
+    SEARCH_ID_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+    def __init__(self):
+        self.ttl = getattr(settings, 'SEARCH_RESPONSE_CACHE_TTL', 120)
+        self.alias = getattr(settings, 'SEARCH_RESPONSE_CACHE_ALIAS', 'default')
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'skipped': 0, 'errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def normalize(self, search: Dict[str, Any]) -> Dict[str, Any]:
+        """get_recommendations kwargs with city names normalized"""
+        return {
+            'origin': normalize_city_name(search.get('origin')),
+            'destination': normalize_city_name(search['destination']),
+            'check_in': str(search['check_in']),
+            'check_out': str(search['check_out']),
+            'people': int(search['people']),
+            'rooms': int(search['rooms']),
+            'budget': search.get('budget'),
+        }
+
+    def search_id(self, search: Dict[str, Any]) -> str:
+        """Digest of normalized get_recommendations kwargs"""
+        return hashlib.sha256(json.dumps(self.normalize(search), sort_keys=True).encode()).hexdigest()
+
+    def key_for(self, search_id: str) -> Optional[str]:
+        """Cache key for a search_id, or None if it is malformed"""
+        if not isinstance(search_id, str) or not self.SEARCH_ID_PATTERN.fullmatch(search_id):
+            return None
+        mode = getattr(settings, 'API_MODE', 'mock')
+        return f'search:{mode}:v{self.KEY_VERSION}:{search_id}'
+
+    def make_key(self, search: Dict[str, Any]) -> str:
+        """Cache key for get_recommendations kwargs"""
+        return self.key_for(self.search_id(search))
+
+    def _cacheable(self, response: Dict[str, Any]) -> bool:
+        if response.get('summary', {}).get('partial_results'):
+            self._count('skipped')
+            return False
+        return True
+
+    def get_entry(self, key: str) -> Optional[CachedSearch]:
+        """Stored response with the search it was made for"""
+        try:
+            entry = self.cache.get(key)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Search response cache unavailable: {e}")
+            return None
+        self._count('hits' if entry is not None else 'misses')
+        return CachedSearch(*entry) if entry is not None else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entry(key)
+        return entry.response if entry is not None else None
+
+    def set(self, key: str, response: Dict[str, Any], search: Dict[str, Any]):
+        if not self._cacheable(response):
+            return
+        try:
+            self.cache.set(key, (self.normalize(search), response), self.ttl)
+            self._count('stores')
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Could not cache search response: {e}")
+
+    async def aget_entry(self, key: str) -> Optional[CachedSearch]:
+        try:
+            entry = await self.cache.aget(key)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Search response cache unavailable: {e}")
+            return None
+        self._count('hits' if entry is not None else 'misses')
+        return CachedSearch(*entry) if entry is not None else None
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = await self.aget_entry(key)
+        return entry.response if entry is not None else None
+
+    async def aset(self, key: str, response: Dict[str, Any], search: Dict[str, Any]):
+        if not self._cacheable(response):
+            return
+        try:
+            await self.cache.aset(key, (self.normalize(search), response), self.ttl)
+            self._count('stores')
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Could not cache search response: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['ttl'] = self.ttl
+        stats['enabled'] = self.enabled
+        return stats
+
+
+def _nights(search: Dict[str, Any]) -> int:
+    return (date.fromisoformat(str(search['check_out'])) - date.fromisoformat(str(search['check_in']))).days
+
+
+def matches_search(stored: Dict[str, Any], search: Dict[str, Any]) -> bool:
+    """
+    Whether results stored for `stored` (normalized kwargs) can stand in for
+    `search`: same origin, destination, people, rooms, budget and number of
+    nights, so the transports, budget-filtered lists and prices were
+    computed for the same trip.
+    """
+    return (
+        stored['origin'] == normalize_city_name(search.get('origin'))
+        and stored['destination'] == normalize_city_name(search['destination'])
+        and stored['people'] == int(search['people'])
+        and stored['rooms'] == int(search['rooms'])
+        and (stored['budget'] or 0) == (search.get('budget') or 0)
+        and _nights(stored) == _nights(search)
+    )
+
+
+def origin_display_name(origin: str) -> str:
+    """Origin as shown in search summaries"""
+    return origin if origin else 'Not specified'
+
+
+def with_request_names(response: Dict[str, Any], search: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a cached response echoing this request's origin/destination as
+    typed, since requests differing only in case or spacing share an entry.
+    Every summary field the service fills from the names is rewritten the
+    same way the service writes it.
+    """
+    summary = response.get('summary')
+    if not summary:
+        return response
+    origin = origin_display_name(search.get('origin'))
+    destination = search['destination']
+    summary = dict(summary)
+    if isinstance(summary.get('origin'), dict):
+        summary['origin'] = {**summary['origin'], 'name': origin}
+    if isinstance(summary.get('destination'), dict):
+        summary['destination'] = {**summary['destination'], 'name': destination}
+        coordinates = summary['destination'].get('coordinates')
+        if isinstance(coordinates, dict):
+            summary['destination']['coordinates'] = {**coordinates, 'name': destination}
+    if isinstance(summary.get('trip_details'), dict):
+        summary['trip_details'] = {**summary['trip_details'], 'origin': origin}
+    return {**response, 'summary': summary}
+
+
+search_response_cache = SearchResponseCache()
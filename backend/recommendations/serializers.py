@@ -1,11 +1,11 @@
 from rest_framework import serializers
-from .models import Destination, Hotel, Transport, Attraction, TravelPackage, SearchHistory
+from .models import Destination, Hotel, Transport, Attraction, TravelPackage, SearchHistory, discounted_price
 
 
 class DestinationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Destination
-        fields = '__all__'
+        exclude = ['city_normalized', 'country_normalized']
 
 
 class DestinationSimpleSerializer(serializers.ModelSerializer):
@@ -15,7 +15,64 @@ class DestinationSimpleSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'city', 'country']
 
 
-class HotelSerializer(serializers.ModelSerializer):
+class PricingParamsSerializer(serializers.Serializer):
+    """Query params used to price catalog listings, parsed once per request"""
+    nights = serializers.IntegerField(min_value=1, default=1)
+    rooms = serializers.IntegerField(min_value=1, default=1)
+    people = serializers.IntegerField(min_value=1, default=1)
+    max_total = serializers.FloatField(min_value=0, required=False)
+
+
+def format_duration(duration_minutes):
+    if duration_minutes:
+        hours = duration_minutes // 60
+        minutes = duration_minutes % 60
+        if hours > 0:
+            return f"{hours}h {minutes}m"
+        return f"{minutes}m"
+    return None
+
+
+class TotalPriceFieldMixin:
+    """
+    Reads total_price from the queryset annotation when the view added one,
+    otherwise (nested or unannotated rows) prices the row from the pricing
+    params, which are parsed once and shared through the serializer context.
+    
+    values_total_price does the same for the values() read path, where rows
+    are dicts: total = price_field * the price_multipliers params.
+    """
+    price_field = None
+    price_multipliers = ()
+    
+    def get_pricing(self):
+        pricing = self.context.get('pricing')
+        if pricing is None:
+            request = self.context.get('request')
+            data = request.query_params if request else {}
+            params = PricingParamsSerializer(data=data)
+            params.is_valid(raise_exception=True)
+            pricing = self.context['pricing'] = params.validated_data
+        return pricing
+    
+    def get_total_price(self, obj):
+        total = getattr(obj, 'total_price', None)
+        if total is not None:
+            return total
+        return self.compute_total_price(obj, self.get_pricing())
+    
+    def values_total_price(self, row):
+        total = row.get('total_price')
+        if total is not None:
+            return total
+        pricing = self.get_pricing()
+        total = float(row[self.price_field])
+        for param in self.price_multipliers:
+            total *= pricing[param]
+        return total
+
+
+class HotelSerializer(TotalPriceFieldMixin, serializers.ModelSerializer):
     destination = DestinationSimpleSerializer(read_only=True)
     total_price = serializers.SerializerMethodField()
     
@@ -23,16 +80,14 @@ class HotelSerializer(serializers.ModelSerializer):
         model = Hotel
         fields = '__all__'
     
-    def get_total_price(self, obj):
-        request = self.context.get('request')
-        if request:
-            nights = int(request.query_params.get('nights', 1))
-            rooms = int(request.query_params.get('rooms', 1))
-            return obj.get_total_price(nights, rooms)
-        return float(obj.price_per_night)
+    price_field = 'price_per_night'
+    price_multipliers = ('nights', 'rooms')
+    
+    def compute_total_price(self, obj, pricing):
+        return obj.get_total_price(pricing['nights'], pricing['rooms'])
 
 
-class TransportSerializer(serializers.ModelSerializer):
+class TransportSerializer(TotalPriceFieldMixin, serializers.ModelSerializer):
     origin = DestinationSimpleSerializer(read_only=True)
     destination = DestinationSimpleSerializer(read_only=True)
     total_price = serializers.SerializerMethodField()
@@ -42,24 +97,20 @@ class TransportSerializer(serializers.ModelSerializer):
         model = Transport
         fields = '__all__'
     
-    def get_total_price(self, obj):
-        request = self.context.get('request')
-        if request:
-            people = int(request.query_params.get('people', 1))
-            return obj.get_total_price(people)
-        return float(obj.price_per_person)
+    price_field = 'price_per_person'
+    price_multipliers = ('people',)
+    
+    def compute_total_price(self, obj, pricing):
+        return obj.get_total_price(pricing['people'])
     
     def get_duration_formatted(self, obj):
-        if obj.duration_minutes:
-            hours = obj.duration_minutes // 60
-            minutes = obj.duration_minutes % 60
-            if hours > 0:
-                return f"{hours}h {minutes}m"
-            return f"{minutes}m"
-        return None
+        return format_duration(obj.duration_minutes)
+    
+    def values_duration_formatted(self, row):
+        return format_duration(row['duration_minutes'])
 
 
-class AttractionSerializer(serializers.ModelSerializer):
+class AttractionSerializer(TotalPriceFieldMixin, serializers.ModelSerializer):
     destination = DestinationSimpleSerializer(read_only=True)
     total_price = serializers.SerializerMethodField()
     
@@ -67,12 +118,11 @@ class AttractionSerializer(serializers.ModelSerializer):
         model = Attraction
         fields = '__all__'
     
-    def get_total_price(self, obj):
-        request = self.context.get('request')
-        if request:
-            people = int(request.query_params.get('people', 1))
-            return obj.get_total_price(people)
-        return float(obj.price_per_person)
+    price_field = 'price_per_person'
+    price_multipliers = ('people',)
+    
+    def compute_total_price(self, obj, pricing):
+        return obj.get_total_price(pricing['people'])
 
 
 class TravelPackageSerializer(serializers.ModelSerializer):
@@ -88,6 +138,9 @@ class TravelPackageSerializer(serializers.ModelSerializer):
     
     def get_discounted_price(self, obj):
         return obj.get_discounted_price()
+    
+    def values_discounted_price(self, row):
+        return discounted_price(row['base_price'], row['discount_percentage'])
 
 
 class SearchHistorySerializer(serializers.ModelSerializer):
@@ -6,10 +6,131 @@ Supports switching between Mock and Amadeus API for real data.
 
 import os
 import requests
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, NamedTuple, Tuple
 from decimal import Decimal
 import random
+import hashlib
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from django.conf import settings
+from django.db import close_old_connections
+from .caching import TTLCache
+from .city_codes import normalize_city_name
+from .pricing import evaluate_prices
+from .bundles import best_bundles
+from .fields import Fields, wants
+from .response_cache import origin_display_name
+
+
+_provider_executor = None
+_provider_executor_lock = threading.Lock()
+
+
+def get_provider_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide thread pool used for provider calls.
+    Created lazily so management commands and migrations don't spawn threads.
+    """
+    global _provider_executor
+    if _provider_executor is None:
+        with _provider_executor_lock:
+            if _provider_executor is None:
+                _provider_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SEARCH_MAX_WORKERS', 16),
+                    thread_name_prefix='search-provider'
+                )
+    return _provider_executor
+
+
+def _run_provider(func, *args):
+    """Run a provider call on a pool thread, releasing stale DB connections after"""
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+# Generated mock result sets per (city, dates), only used in deterministic mode
+mock_inventory_cache = TTLCache(
+    'mock_inventory',
+    ttl=getattr(settings, 'MOCK_INVENTORY_CACHE_TTL', 3600),
+    max_entries=getattr(settings, 'MOCK_INVENTORY_CACHE_SIZE', 1000)
+)
+
+
+def mock_deterministic() -> bool:
+    return getattr(settings, 'MOCK_DETERMINISTIC', False)
+
+
+_thread_rng = threading.local()
+
+
+def mock_rng(*key) -> random.Random:
+    """
+    Private RNG for one mock result set; never touches the global random
+    state, which is shared by every request thread.
+    
+    With MOCK_DETERMINISTIC the seed is a digest of the search key (city
+    names normalized), so identical searches get identical data. Otherwise
+    each thread reuses one OS-seeded generator.
+    """
+    if not mock_deterministic():
+        rng = getattr(_thread_rng, 'rng', None)
+        if rng is None:
+            rng = _thread_rng.rng = random.Random()
+        return rng
+    parts = [normalize_city_name(str(part)) for part in key]
+    digest = hashlib.sha256('|'.join(parts).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+
+def mock_inventory(key: tuple, generate) -> List[Dict]:
+    """
+    Memoize a generated mock result set in deterministic mode.
+    Callers get fresh dicts so they can't alter the cached copy.
+    """
+    if not mock_deterministic():
+        return generate()
+    items = mock_inventory_cache.get_or_load(key, generate)
+    return [dict(item) for item in items]
+
+
+# Mock template tables: immutable records built once at import, so a result
+# set is a single pass over a tuple with no per-call copying or re-parsing.
+
+class HotelTemplate(NamedTuple):
+    name: str
+    stars: int
+    base_price: float
+    num_amenities: int
+
+
+class IntercityTemplate(NamedTuple):
+    type: str
+    name: str
+    base_price: float
+    duration_range: Tuple[int, int]
+
+
+class LocalTransportTemplate(NamedTuple):
+    type: str
+    name: str
+    base_price: float
+    per_day: bool
+
+
+class AttractionTemplate(NamedTuple):
+    name: str
+    category: str
+    price: float
+
+
+def shuffled_orders(items: Tuple, count: int) -> Tuple[Tuple, ...]:
+    """count fixed random permutations of items, from a private seeded RNG"""
+    rng = random.Random(0)
+    return tuple(tuple(rng.sample(items, len(items))) for _ in range(count))
 
 
 class MockAttractionService:
@@ -18,23 +139,23 @@ class MockAttractionService:
     Generates realistic attraction recommendations without external API.
     """
     
-    ATTRACTION_TEMPLATES = [
-        {'name': 'City Museum', 'category': 'museum', 'base_price': 15},
-        {'name': 'Central Park', 'category': 'nature', 'base_price': 0},
-        {'name': 'Historic Castle', 'category': 'landmark', 'base_price': 20},
-        {'name': 'Local Market', 'category': 'shopping', 'base_price': 0},
-        {'name': 'Beach Resort', 'category': 'beach', 'base_price': 10},
-        {'name': 'Adventure Park', 'category': 'adventure', 'base_price': 45},
-        {'name': 'Cultural Center', 'category': 'cultural', 'base_price': 12},
-        {'name': 'Botanical Garden', 'category': 'nature', 'base_price': 8},
-        {'name': 'Art Gallery', 'category': 'museum', 'base_price': 18},
-        {'name': 'Food Street', 'category': 'food', 'base_price': 0},
-        {'name': 'Historic Cathedral', 'category': 'landmark', 'base_price': 5},
-        {'name': 'Zoo & Aquarium', 'category': 'entertainment', 'base_price': 25},
-        {'name': 'Sunset Viewpoint', 'category': 'nature', 'base_price': 0},
-        {'name': 'Night Market', 'category': 'shopping', 'base_price': 0},
-        {'name': 'Water Sports Center', 'category': 'adventure', 'base_price': 35},
-    ]
+    ATTRACTION_TEMPLATES = (
+        AttractionTemplate('City Museum', 'museum', 15),
+        AttractionTemplate('Central Park', 'nature', 0),
+        AttractionTemplate('Historic Castle', 'landmark', 20),
+        AttractionTemplate('Local Market', 'shopping', 0),
+        AttractionTemplate('Beach Resort', 'beach', 10),
+        AttractionTemplate('Adventure Park', 'adventure', 45),
+        AttractionTemplate('Cultural Center', 'cultural', 12),
+        AttractionTemplate('Botanical Garden', 'nature', 8),
+        AttractionTemplate('Art Gallery', 'museum', 18),
+        AttractionTemplate('Food Street', 'food', 0),
+        AttractionTemplate('Historic Cathedral', 'landmark', 5),
+        AttractionTemplate('Zoo & Aquarium', 'entertainment', 25),
+        AttractionTemplate('Sunset Viewpoint', 'nature', 0),
+        AttractionTemplate('Night Market', 'shopping', 0),
+        AttractionTemplate('Water Sports Center', 'adventure', 35),
+    )
     
     def get_coordinates(self, city: str) -> Optional[Dict[str, float]]:
         """Return mock coordinates for a city"""
@@ -76,52 +197,59 @@ class MockHotelService:
     - Hotels.com API
     """
     
-    HOTEL_TEMPLATES = [
-        {"name": "Grand Plaza Hotel", "stars": 5, "base_price": 250},
-        {"name": "City Center Inn", "stars": 4, "base_price": 150},
-        {"name": "Budget Stay Express", "stars": 3, "base_price": 80},
-        {"name": "Luxury Resort & Spa", "stars": 5, "base_price": 350},
-        {"name": "Comfort Suites", "stars": 4, "base_price": 120},
-        {"name": "Backpacker's Haven", "stars": 2, "base_price": 40},
-        {"name": "Business Hotel Premier", "stars": 4, "base_price": 180},
-        {"name": "Family Resort Paradise", "stars": 4, "base_price": 200},
-        {"name": "Boutique Hotel Artisan", "stars": 4, "base_price": 160},
-        {"name": "Economy Lodge", "stars": 2, "base_price": 50},
-    ]
-    
-    AMENITIES = [
+    AMENITIES = (
         "Free WiFi", "Pool", "Gym", "Spa", "Restaurant", "Bar",
         "Room Service", "Parking", "Airport Shuttle", "Pet Friendly",
         "Business Center", "Laundry", "Concierge", "Beach Access"
-    ]
+    )
+    # Pre-shuffled amenity orders; a hotel takes the first num_amenities of
+    # one, which is much cheaper than sampling per hotel
+    AMENITY_ORDERS = shuffled_orders(AMENITIES, 256)
+    
+    # Amenity count is twice the star rating
+    HOTEL_TEMPLATES = (
+        HotelTemplate("Grand Plaza Hotel", 5, 250, 10),
+        HotelTemplate("City Center Inn", 4, 150, 8),
+        HotelTemplate("Budget Stay Express", 3, 80, 6),
+        HotelTemplate("Luxury Resort & Spa", 5, 350, 10),
+        HotelTemplate("Comfort Suites", 4, 120, 8),
+        HotelTemplate("Backpacker's Haven", 2, 40, 4),
+        HotelTemplate("Business Hotel Premier", 4, 180, 8),
+        HotelTemplate("Family Resort Paradise", 4, 200, 8),
+        HotelTemplate("Boutique Hotel Artisan", 4, 160, 8),
+        HotelTemplate("Economy Lodge", 2, 50, 4),
+    )
     
-    def get_hotels(self, city: str, num_results: int = 10) -> List[Dict]:
+    def get_hotels(self, city: str, num_results: int = 10, check_in: str = '', check_out: str = '') -> List[Dict]:
         """Generate mock hotel data for a city"""
-        hotels = []
-        for i, template in enumerate(self.HOTEL_TEMPLATES[:num_results]):
-            # Add some randomness to prices
-            price_variance = random.uniform(0.8, 1.3)
-            price = round(template['base_price'] * price_variance, 2)
-            
-            # Random amenities based on star rating
-            num_amenities = min(template['stars'] * 2, len(self.AMENITIES))
-            amenities = random.sample(self.AMENITIES, num_amenities)
-            
-            hotels.append({
+        return mock_inventory(
+            ('hotels', city, check_in, check_out, num_results),
+            lambda: self._generate_hotels(mock_rng('hotels', city, check_in, check_out), city, num_results)
+        )
+    
+    def _generate_hotels(self, rng: random.Random, city: str, num_results: int) -> List[Dict]:
+        rand = rng.random
+        orders = self.AMENITY_ORDERS
+        image_seed = city.lower()
+        hotels = [
+            {
                 'id': i + 1,
-                'name': f"{template['name']} {city}",
-                'star_rating': template['stars'],
-                'price_per_night': price,
+                'name': f"{template.name} {city}",
+                'star_rating': template.stars,
+                # Price varies 0.8x-1.3x around the template's base price
+                'price_per_night': round(template.base_price * (0.8 + 0.5 * rand()), 2),
                 'currency': 'USD',
-                'rating': round(random.uniform(6.0, 9.8), 1),
-                'reviews_count': random.randint(50, 2000),
-                'amenities': amenities,
-                'address': f"{random.randint(1, 999)} Main Street, {city}",
-                'description': f"Experience comfort and hospitality at {template['name']} located in the heart of {city}.",
-                'image_url': f"https://picsum.photos/seed/{city.lower()}{i}/400/300"
-            })
-        
-        return sorted(hotels, key=lambda x: x['price_per_night'])
+                'rating': round(6.0 + 3.8 * rand(), 1),
+                'reviews_count': 50 + int(rand() * 1951),
+                'amenities': list(orders[int(rand() * len(orders))][:template.num_amenities]),
+                'address': f"{1 + int(rand() * 999)} Main Street, {city}",
+                'description': f"Experience comfort and hospitality at {template.name} located in the heart of {city}.",
+                'image_url': f"https://picsum.photos/seed/{image_seed}{i}/400/300"
+            }
+            for i, template in enumerate(self.HOTEL_TEMPLATES[:num_results])
+        ]
+        hotels.sort(key=lambda x: x['price_per_night'])
+        return hotels
 
 
 class MockTransportService:
@@ -131,52 +259,61 @@ class MockTransportService:
     """
     
     # Inter-city transport: Getting FROM origin TO destination
-    INTERCITY_TRANSPORT = [
-        {'type': 'flight', 'name': 'Economy Flight', 'base_price': 200, 'duration_range': (60, 180)},
-        {'type': 'flight', 'name': 'Business Class Flight', 'base_price': 500, 'duration_range': (60, 180)},
-        {'type': 'flight', 'name': 'Premium Economy Flight', 'base_price': 350, 'duration_range': (60, 180)},
-        {'type': 'train', 'name': 'High-Speed Train', 'base_price': 80, 'duration_range': (120, 360)},
-        {'type': 'train', 'name': 'Standard Train', 'base_price': 40, 'duration_range': (180, 480)},
-        {'type': 'bus', 'name': 'Luxury Coach', 'base_price': 50, 'duration_range': (240, 720)},
-        {'type': 'bus', 'name': 'Standard Bus', 'base_price': 25, 'duration_range': (300, 840)},
-    ]
+    INTERCITY_TRANSPORT = (
+        IntercityTemplate('flight', 'Economy Flight', 200, (60, 180)),
+        IntercityTemplate('flight', 'Business Class Flight', 500, (60, 180)),
+        IntercityTemplate('flight', 'Premium Economy Flight', 350, (60, 180)),
+        IntercityTemplate('train', 'High-Speed Train', 80, (120, 360)),
+        IntercityTemplate('train', 'Standard Train', 40, (180, 480)),
+        IntercityTemplate('bus', 'Luxury Coach', 50, (240, 720)),
+        IntercityTemplate('bus', 'Standard Bus', 25, (300, 840)),
+    )
     
     # Local transport: Getting around AT the destination
-    LOCAL_TRANSPORT = [
-        {'type': 'car_rental', 'name': 'Economy Car Rental', 'base_price': 35, 'per_day': True},
-        {'type': 'car_rental', 'name': 'SUV Rental', 'base_price': 70, 'per_day': True},
-        {'type': 'car_rental', 'name': 'Luxury Car Rental', 'base_price': 120, 'per_day': True},
-        {'type': 'taxi', 'name': 'Airport Transfer', 'base_price': 45, 'per_day': False},
-        {'type': 'taxi', 'name': 'Private Driver (Full Day)', 'base_price': 150, 'per_day': True},
-        {'type': 'metro', 'name': 'Metro Day Pass', 'base_price': 10, 'per_day': True},
-        {'type': 'metro', 'name': 'Weekly Transit Pass', 'base_price': 35, 'per_day': False},
-        {'type': 'shuttle', 'name': 'Hotel Shuttle Service', 'base_price': 0, 'per_day': False},
-        {'type': 'bike', 'name': 'Bike Rental', 'base_price': 15, 'per_day': True},
-        {'type': 'scooter', 'name': 'Scooter Rental', 'base_price': 25, 'per_day': True},
-    ]
-    
-    INTERCITY_PROVIDERS = ['SkyWings', 'AirConnect', 'GlobalAir', 'JetBlue', 'AirExpress', 'FlyDirect']
-    GROUND_PROVIDERS = ['EuroRail', 'SpeedTrain', 'ExpressBus', 'TransGlobal', 'RailConnect', 'CoachLine']
-    LOCAL_PROVIDERS = ['CityRentals', 'LocalMove', 'EasyRide', 'QuickTransit', 'UrbanGo', 'MetroPass']
+    LOCAL_TRANSPORT = (
+        LocalTransportTemplate('car_rental', 'Economy Car Rental', 35, True),
+        LocalTransportTemplate('car_rental', 'SUV Rental', 70, True),
+        LocalTransportTemplate('car_rental', 'Luxury Car Rental', 120, True),
+        LocalTransportTemplate('taxi', 'Airport Transfer', 45, False),
+        LocalTransportTemplate('taxi', 'Private Driver (Full Day)', 150, True),
+        LocalTransportTemplate('metro', 'Metro Day Pass', 10, True),
+        LocalTransportTemplate('metro', 'Weekly Transit Pass', 35, False),
+        LocalTransportTemplate('shuttle', 'Hotel Shuttle Service', 0, False),
+        LocalTransportTemplate('bike', 'Bike Rental', 15, True),
+        LocalTransportTemplate('scooter', 'Scooter Rental', 25, True),
+    )
+    
+    INTERCITY_PROVIDERS = ('SkyWings', 'AirConnect', 'GlobalAir', 'JetBlue', 'AirExpress', 'FlyDirect')
+    GROUND_PROVIDERS = ('EuroRail', 'SpeedTrain', 'ExpressBus', 'TransGlobal', 'RailConnect', 'CoachLine')
+    LOCAL_PROVIDERS = ('CityRentals', 'LocalMove', 'EasyRide', 'QuickTransit', 'UrbanGo', 'MetroPass')
+    DEPARTURE_MINUTES = (0, 15, 30, 45)
     
     # Flight-only templates (primary transport)
-    FLIGHT_OPTIONS = [
-        {'type': 'flight', 'name': 'Economy Flight', 'base_price': 200, 'duration_range': (60, 180)},
-        {'type': 'flight', 'name': 'Economy Plus Flight', 'base_price': 280, 'duration_range': (60, 180)},
-        {'type': 'flight', 'name': 'Premium Economy Flight', 'base_price': 350, 'duration_range': (60, 180)},
-        {'type': 'flight', 'name': 'Business Class Flight', 'base_price': 500, 'duration_range': (60, 180)},
-        {'type': 'flight', 'name': 'First Class Flight', 'base_price': 800, 'duration_range': (60, 180)},
-    ]
+    FLIGHT_OPTIONS = (
+        IntercityTemplate('flight', 'Economy Flight', 200, (60, 180)),
+        IntercityTemplate('flight', 'Economy Plus Flight', 280, (60, 180)),
+        IntercityTemplate('flight', 'Premium Economy Flight', 350, (60, 180)),
+        IntercityTemplate('flight', 'Business Class Flight', 500, (60, 180)),
+        IntercityTemplate('flight', 'First Class Flight', 800, (60, 180)),
+    )
     
     # Ground transport alternatives (only if no flights)
-    GROUND_TRANSPORT = [
-        {'type': 'train', 'name': 'High-Speed Train', 'base_price': 80, 'duration_range': (120, 360)},
-        {'type': 'train', 'name': 'Standard Train', 'base_price': 40, 'duration_range': (180, 480)},
-        {'type': 'bus', 'name': 'Luxury Coach', 'base_price': 50, 'duration_range': (240, 720)},
-        {'type': 'bus', 'name': 'Standard Bus', 'base_price': 25, 'duration_range': (300, 840)},
-    ]
-    
-    def get_transport_options(self, origin: str, destination: str, num_results: int = 8, flights_only: bool = True) -> List[Dict]:
+    GROUND_TRANSPORT = (
+        IntercityTemplate('train', 'High-Speed Train', 80, (120, 360)),
+        IntercityTemplate('train', 'Standard Train', 40, (180, 480)),
+        IntercityTemplate('bus', 'Luxury Coach', 50, (240, 720)),
+        IntercityTemplate('bus', 'Standard Bus', 25, (300, 840)),
+    )
+    
+    def get_transport_options(
+        self,
+        origin: str,
+        destination: str,
+        num_results: int = 8,
+        flights_only: bool = True,
+        departure_date: str = '',
+        return_date: str = ''
+    ) -> List[Dict]:
         """
         Generate mock inter-city transport options from origin to destination.
         
@@ -185,51 +322,60 @@ class MockTransportService:
             destination: Destination city
             num_results: Max number of results
             flights_only: If True, only return flights. If False, include ground transport.
+            departure_date, return_date: Part of the seed in deterministic mode
         """
-        options = []
+        key = ('transports', origin, destination, departure_date, return_date)
+        return mock_inventory(
+            key + (num_results,),
+            lambda: self._generate_transport_options(mock_rng(*key), origin, destination, num_results)
+        )
+    
+    def _generate_transport_options(self, rng: random.Random, origin: str, destination: str, num_results: int) -> List[Dict]:
+        rand = rng.random
+        providers = self.INTERCITY_PROVIDERS
+        minutes = self.DEPARTURE_MINUTES
         origin_display = origin if origin else "Your City"
         
-        # Primary: Generate flight options
-        flight_templates = self.FLIGHT_OPTIONS.copy()
-        random.shuffle(flight_templates)
-        
-        for i, template in enumerate(flight_templates[:num_results]):
-            price_variance = random.uniform(0.7, 1.4)
-            price = round(template['base_price'] * price_variance, 2)
-            
-            duration = random.randint(template['duration_range'][0], template['duration_range'][1])
-            
-            # Generate departure and arrival times
-            departure_hour = random.randint(6, 20)
-            departure_minute = random.choice([0, 15, 30, 45])
-            
-            options.append({
+        # Primary: flight options, a random subset when fewer are requested
+        flights = rng.sample(self.FLIGHT_OPTIONS, min(num_results, len(self.FLIGHT_OPTIONS)))
+        options = [
+            {
                 'id': i + 1,
-                'type': template['type'],
+                'type': template.type,
                 'category': 'intercity',  # Mark as inter-city transport
-                'name': template['name'],
-                'provider': random.choice(self.INTERCITY_PROVIDERS),
-                'price_per_person': price,
+                'name': template.name,
+                'provider': providers[int(rand() * len(providers))],
+                'price_per_person': round(template.base_price * (0.7 + 0.7 * rand()), 2),
                 'currency': 'USD',
-                'duration_minutes': duration,
+                'duration_minutes': template.duration_range[0] + int(rand() * (template.duration_range[1] - template.duration_range[0] + 1)),
                 'origin': origin_display,
                 'destination': destination,
-                'departure_time': f"{departure_hour:02d}:{departure_minute:02d}",
-                'description': f"{template['name']} from {origin_display} to {destination}"
-            })
-        
-        return sorted(options, key=lambda x: x['price_per_person'])
+                'departure_time': f"{6 + int(rand() * 15):02d}:{minutes[int(rand() * 4)]:02d}",
+                'description': f"{template.name} from {origin_display} to {destination}"
+            }
+            for i, template in enumerate(flights)
+        ]
+        options.sort(key=lambda x: x['price_per_person'])
+        return options
     
     def get_local_transport(self, destination: str, num_days: int = 1, num_results: int = 6) -> List[Dict]:
         """Generate mock local transport options at the destination"""
+        key = ('local_transports', destination, num_days)
+        return mock_inventory(
+            key + (num_results,),
+            lambda: self._generate_local_transport(mock_rng(*key), destination, num_days, num_results)
+        )
+    
+    def _generate_local_transport(self, rng: random.Random, destination: str, num_days: int, num_results: int) -> List[Dict]:
+        rand = rng.random
+        providers = self.LOCAL_PROVIDERS
         options = []
         
-        for i, template in enumerate(random.sample(self.LOCAL_TRANSPORT, min(num_results, len(self.LOCAL_TRANSPORT)))):
-            price_variance = random.uniform(0.8, 1.2)
-            base_price = round(template['base_price'] * price_variance, 2)
+        for i, template in enumerate(rng.sample(self.LOCAL_TRANSPORT, min(num_results, len(self.LOCAL_TRANSPORT)))):
+            base_price = round(template.base_price * (0.8 + 0.4 * rand()), 2)
             
             # Calculate total price based on whether it's per-day pricing
-            if template['per_day']:
+            if template.per_day:
                 total_price = base_price * num_days
                 price_note = f"${base_price}/day × {num_days} days"
             else:
@@ -238,23 +384,24 @@ class MockTransportService:
             
             options.append({
                 'id': 100 + i,  # Offset ID to avoid conflicts
-                'type': template['type'],
+                'type': template.type,
                 'category': 'local',  # Mark as local transport
-                'name': template['name'],
-                'provider': random.choice(self.LOCAL_PROVIDERS),
+                'name': template.name,
+                'provider': providers[int(rand() * len(providers))],
                 'price_per_person': base_price,
                 'total_price': total_price,
                 'price_note': price_note,
-                'per_day': template['per_day'],
+                'per_day': template.per_day,
                 'currency': 'USD',
                 'duration_minutes': None,
                 'origin': destination,
                 'destination': destination,
                 'departure_time': None,
-                'description': f"{template['name']} in {destination}"
+                'description': f"{template.name} in {destination}"
             })
         
-        return sorted(options, key=lambda x: x['total_price'])
+        options.sort(key=lambda x: x['total_price'])
+        return options
 
 
 class TravelRecommendationService:
@@ -277,6 +424,10 @@ class TravelRecommendationService:
         # Get API mode from settings
         self.api_mode = getattr(settings, 'API_MODE', 'mock')
         
+        # Concurrent provider fan-out with an overall per-search deadline
+        self.concurrent = getattr(settings, 'SEARCH_CONCURRENT', True)
+        self.deadline = getattr(settings, 'SEARCH_DEADLINE_SECONDS', 20)
+        
         # Initialize Amadeus service if needed
         self.amadeus_service = None
         if self.api_mode in ['amadeus', 'hybrid']:
@@ -295,7 +446,8 @@ class TravelRecommendationService:
         people: int = 1,
         rooms: int = 1,
         origin: str = '',
-        budget: int = None
+        budget: int = None,
+        fields: Fields = None
     ) -> Dict[str, Any]:
         """
         Get comprehensive travel recommendations for a destination.
@@ -303,57 +455,103 @@ class TravelRecommendationService:
         
         Args:
             budget: Maximum total budget in USD. If provided, filters results.
+            fields: Response fields the caller will use (see fields.py);
+                trip bundles are only searched for when they are wanted.
         """
+        nights = self._count_nights(check_in, check_out)
+        
+        # Fetch hotels, inter-city transport (flights, trains, buses), local
+        # transport (car rental, taxi, metro) and attractions
+        results, timed_out = self._fetch_providers({
+            'hotels': (self._get_hotels, (destination, check_in, check_out, people, rooms)),
+            'transports': (self._get_transports, (origin, destination, check_in, check_out, people)),
+            'local_transports': (self.transport_service.get_local_transport, (destination, nights)),
+            'attractions': (self._generate_mock_attractions, (destination,)),
+        })
+        
+        return self._build_recommendations(
+            results, timed_out, destination, check_in, check_out, nights, people, rooms, origin, budget, fields
+        )
+    
+    async def aget_recommendations(
+        self,
+        destination: str,
+        check_in: str,
+        check_out: str,
+        people: int = 1,
+        rooms: int = 1,
+        origin: str = '',
+        budget: int = None,
+        fields: Fields = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of get_recommendations for the ASGI views.
+        Amadeus calls use the non-blocking client and share the same overall
+        deadline; the in-memory mock providers run inline.
+        """
+        nights = self._count_nights(check_in, check_out)
+        
+        results, timed_out = await self._afetch_providers({
+            'hotels': self._aget_hotels(destination, check_in, check_out, people, rooms),
+            'transports': self._aget_transports(origin, destination, check_in, check_out, people),
+        })
+        results['local_transports'] = self.transport_service.get_local_transport(destination, nights)
+        results['attractions'] = self._generate_mock_attractions(destination)
+        
+        return self._build_recommendations(
+            results, timed_out, destination, check_in, check_out, nights, people, rooms, origin, budget, fields
+        )
+    
+    def _count_nights(self, check_in: str, check_out: str) -> int:
         from datetime import datetime
         
-        # Calculate nights
         check_in_date = datetime.strptime(check_in, '%Y-%m-%d')
         check_out_date = datetime.strptime(check_out, '%Y-%m-%d')
-        nights = (check_out_date - check_in_date).days
-        
+        return (check_out_date - check_in_date).days
+    
+    def _build_recommendations(
+        self,
+        results: Dict[str, List[Dict]],
+        timed_out: List[str],
+        destination: str,
+        check_in: str,
+        check_out: str,
+        nights: int,
+        people: int,
+        rooms: int,
+        origin: str,
+        budget: Optional[int],
+        fields: Fields = None
+    ) -> Dict[str, Any]:
+        """Apply the budget filter and assemble the price summary from provider results"""
         # Get coordinates for the destination (mock)
         coords = self.attraction_service.get_coordinates(destination)
         
-        # Get hotels based on API mode
-        hotels = self._get_hotels(destination, check_in, check_out, people, rooms)
+        hotels = results['hotels']
+        transports = results['transports']
+        local_transports = results['local_transports']
+        attractions = results['attractions']
         
-        # Get inter-city transport (flights, trains, buses) based on API mode
-        transports = self._get_transports(origin, destination, check_in, check_out, people)
+        # Best full-trip combinations within budget, searched over every
+        # offer before the per-category split below narrows the lists
+        bundle_count = getattr(settings, 'SEARCH_BUNDLES', 3)
+        bundles = None
+        if budget and budget > 0 and bundle_count > 0 and wants(fields, 'bundles'):
+            bundles = best_bundles(
+                hotels, transports, local_transports, attractions, nights, people, rooms, budget, bundle_count
+            )
         
-        # Get local transport options (car rental, taxi, metro) at destination
-        local_transports = self.transport_service.get_local_transport(destination, num_days=nights)
-        
-        # Generate mock attractions
-        attractions = self._generate_mock_attractions(destination)
-        
-        # Apply budget filter if specified
-        if budget and budget > 0:
-            # Filter hotels: total cost (per night * nights * rooms) must be within budget portion
-            hotel_budget = budget * 0.6  # Allocate 60% of budget to hotels (increased from 50%)
-            transport_budget = budget * 0.3  # Allocate 30% to transport
-            
-            # Filter but keep at least some hotels
-            filtered_hotels = [h for h in hotels if h['price_per_night'] * nights * rooms <= hotel_budget]
-            if filtered_hotels:
-                hotels = filtered_hotels
-            # If no hotels match budget, keep all but sort by price
-            else:
-                hotels = sorted(hotels, key=lambda x: x['price_per_night'])
-            
-            filtered_transports = [t for t in transports if t['price_per_person'] * people <= transport_budget]
-            if filtered_transports:
-                transports = filtered_transports
-            
-            # Filter local transport too
-            local_transport_budget = budget * 0.1  # 10% for local transport
-            filtered_local = [lt for lt in local_transports if lt.get('total_price', 0) <= local_transport_budget]
-            if filtered_local:
-                local_transports = filtered_local
+        # Budget filter (60% hotels, 30% transport, 10% local transport)
+        # and cheapest option of each kind, from one price evaluation
+        priced = evaluate_prices(hotels, transports, local_transports, nights, people, rooms, budget)
+        hotels = priced.hotels.options
+        transports = priced.transports.options
+        local_transports = priced.local_transports.options
         
         # Calculate price summary
-        cheapest_hotel = hotels[0] if hotels else None
-        cheapest_transport = transports[0] if transports else None
-        cheapest_local = local_transports[0] if local_transports else None
+        cheapest_hotel = priced.hotels.cheapest
+        cheapest_transport = priced.transports.cheapest
+        cheapest_local = priced.local_transports.cheapest
         
         hotel_total = cheapest_hotel['price_per_night'] * nights * rooms if cheapest_hotel else 0
         transport_total = cheapest_transport['price_per_person'] * people if cheapest_transport else 0
@@ -362,14 +560,14 @@ class TravelRecommendationService:
         
         summary = {
             'origin': {
-                'name': origin if origin else 'Not specified'
+                'name': origin_display_name(origin)
             },
             'destination': {
                 'name': destination,
                 'coordinates': coords
             },
             'trip_details': {
-                'origin': origin if origin else 'Not specified',
+                'origin': origin_display_name(origin),
                 'check_in': check_in,
                 'check_out': check_out,
                 'nights': nights,
@@ -392,16 +590,87 @@ class TravelRecommendationService:
                 'attractions': len(attractions)
             },
             'data_source': self.api_mode,  # Tell frontend which data source was used
-            'budget_applied': budget is not None and budget > 0
+            'budget_applied': budget is not None and budget > 0,
+            'partial_results': bool(timed_out),
+            'timed_out_providers': timed_out
         }
         
-        return {
+        response = {
             'summary': summary,
             'hotels': hotels,
             'transports': transports,  # Inter-city transport (flights, trains, buses)
             'local_transports': local_transports,  # Local transport (car rental, taxi, metro)
             'attractions': attractions
         }
+        if bundles is not None:
+            response['bundles'] = bundles  # Best-scoring trips within budget
+        return response
+    
+    def _fetch_providers(self, tasks: Dict[str, tuple]) -> tuple:
+        """
+        Run provider calls and return (results, timed_out_names).
+        
+        In concurrent mode every call is submitted to the shared pool and the
+        whole batch waits at most SEARCH_DEADLINE_SECONDS, so latency is that of
+        the slowest provider rather than the sum. Providers that miss the
+        deadline contribute an empty list and their result is discarded.
+        Amadeus HTTP timeouts are cut to the same deadline, so those threads
+        are freed soon after it rather than holding the pool for a full read
+        timeout.
+        
+        Args:
+            tasks: Mapping of result name to (callable, args)
+        """
+        if not self.concurrent:
+            return {name: func(*args) for name, (func, args) in tasks.items()}, []
+        
+        if self.amadeus_service is not None:
+            self.amadeus_service.deadline = time.monotonic() + self.deadline
+        
+        executor = get_provider_executor()
+        futures = {
+            name: executor.submit(_run_provider, func, *args)
+            for name, (func, args) in tasks.items()
+        }
+        done, _ = wait(futures.values(), timeout=self.deadline)
+        
+        results = {}
+        timed_out = []
+        for name, future in futures.items():
+            if future in done:
+                results[name] = future.result()
+            else:
+                future.cancel()
+                timed_out.append(name)
+                results[name] = []
+                print(f"Provider '{name}' missed the {self.deadline}s search deadline, returning partial results")
+        
+        return results, timed_out
+    
+    async def _afetch_providers(self, coroutines: Dict[str, Any]) -> tuple:
+        """
+        Async version of _fetch_providers: await all coroutines under the
+        overall deadline, cancelling the ones that miss it. Providers that
+        end up cancelled are reported as timed out too.
+        """
+        tasks = {name: asyncio.ensure_future(coro) for name, coro in coroutines.items()}
+        done, _ = await asyncio.wait(tasks.values(), timeout=self.deadline)
+        
+        results = {}
+        timed_out = []
+        for name, task in tasks.items():
+            if task in done and not task.cancelled():
+                results[name] = task.result()
+            else:
+                # Cancelled providers are dropped like ones that missed the
+                # deadline (CancelledError isn't an Exception, so it would
+                # otherwise fail the whole search)
+                task.cancel()
+                timed_out.append(name)
+                results[name] = []
+                print(f"Provider '{name}' missed the {self.deadline}s search deadline or was cancelled, returning partial results")
+        
+        return results, timed_out
     
     def _get_hotels(self, city: str, check_in: str, check_out: str, adults: int, rooms: int) -> List[Dict]:
         """Get hotels from configured source"""
@@ -414,7 +683,7 @@ class TravelRecommendationService:
                 print(f"Amadeus hotel search failed, falling back to mock: {e}")
         
         # Fallback to mock data
-        return self.hotel_service.get_hotels(city)
+        return self.hotel_service.get_hotels(city, check_in=check_in, check_out=check_out)
     
     def _get_transports(self, origin: str, destination: str, departure_date: str, return_date: str, adults: int) -> List[Dict]:
         """Get transport options from configured source"""
@@ -429,7 +698,9 @@ class TravelRecommendationService:
                 )
                 if flights:
                     # Add mock ground transport options to flight results
-                    ground_transport = self.transport_service.get_transport_options(origin, destination, num_results=3)
+                    ground_transport = self.transport_service.get_transport_options(
+                        origin, destination, num_results=3, departure_date=departure_date, return_date=return_date
+                    )
                     # Filter out flights from mock to avoid duplicates
                     ground_transport = [t for t in ground_transport if t['type'] != 'flight']
                     return flights + ground_transport
@@ -437,7 +708,45 @@ class TravelRecommendationService:
                 print(f"Amadeus flight search failed, falling back to mock: {e}")
         
         # Fallback to mock data
-        return self.transport_service.get_transport_options(origin, destination)
+        return self.transport_service.get_transport_options(
+            origin, destination, departure_date=departure_date, return_date=return_date
+        )
+    
+    async def _aget_hotels(self, city: str, check_in: str, check_out: str, adults: int, rooms: int) -> List[Dict]:
+        """Async version of _get_hotels"""
+        if self.api_mode == 'amadeus' and self.amadeus_service and self.amadeus_service.is_configured():
+            try:
+                hotels = await self.amadeus_service.asearch_hotels(city, check_in, check_out, adults, rooms)
+                if hotels:
+                    return hotels
+            except Exception as e:
+                print(f"Amadeus hotel search failed, falling back to mock: {e}")
+        
+        return self.hotel_service.get_hotels(city, check_in=check_in, check_out=check_out)
+    
+    async def _aget_transports(self, origin: str, destination: str, departure_date: str, return_date: str, adults: int) -> List[Dict]:
+        """Async version of _get_transports"""
+        if self.api_mode in ['amadeus', 'hybrid'] and self.amadeus_service and self.amadeus_service.is_configured():
+            try:
+                flights = await self.amadeus_service.asearch_flights(
+                    origin or 'NYC',
+                    destination,
+                    departure_date,
+                    return_date,
+                    adults
+                )
+                if flights:
+                    ground_transport = self.transport_service.get_transport_options(
+                        origin, destination, num_results=3, departure_date=departure_date, return_date=return_date
+                    )
+                    ground_transport = [t for t in ground_transport if t['type'] != 'flight']
+                    return flights + ground_transport
+            except Exception as e:
+                print(f"Amadeus flight search failed, falling back to mock: {e}")
+        
+        return self.transport_service.get_transport_options(
+            origin, destination, departure_date=departure_date, return_date=return_date
+        )
     
     def _map_kinds_to_category(self, kinds: str) -> str:
         """Map OpenTripMap kinds to our category choices"""
@@ -463,29 +772,35 @@ class TravelRecommendationService:
     
     def _generate_mock_attractions(self, destination: str) -> List[Dict]:
         """Generate mock attractions when API is unavailable"""
-        templates = [
-            {'name': 'City Museum', 'category': 'museum', 'price': 15},
-            {'name': 'Central Park', 'category': 'nature', 'price': 0},
-            {'name': 'Historic Castle', 'category': 'landmark', 'price': 20},
-            {'name': 'Local Market', 'category': 'shopping', 'price': 0},
-            {'name': 'Beach Resort', 'category': 'beach', 'price': 10},
-            {'name': 'Adventure Park', 'category': 'adventure', 'price': 45},
-            {'name': 'Cultural Center', 'category': 'cultural', 'price': 12},
-            {'name': 'Botanical Garden', 'category': 'nature', 'price': 8},
-            {'name': 'Art Gallery', 'category': 'museum', 'price': 18},
-            {'name': 'Food Street', 'category': 'food', 'price': 0},
-        ]
-        
-        attractions = []
-        for i, template in enumerate(templates):
-            attractions.append({
+        return mock_inventory(
+            ('attractions', destination),
+            lambda: self._build_mock_attractions(mock_rng('attractions', destination), destination)
+        )
+    
+    MOCK_ATTRACTIONS = (
+        AttractionTemplate('City Museum', 'museum', 15),
+        AttractionTemplate('Central Park', 'nature', 0),
+        AttractionTemplate('Historic Castle', 'landmark', 20),
+        AttractionTemplate('Local Market', 'shopping', 0),
+        AttractionTemplate('Beach Resort', 'beach', 10),
+        AttractionTemplate('Adventure Park', 'adventure', 45),
+        AttractionTemplate('Cultural Center', 'cultural', 12),
+        AttractionTemplate('Botanical Garden', 'nature', 8),
+        AttractionTemplate('Art Gallery', 'museum', 18),
+        AttractionTemplate('Food Street', 'food', 0),
+    )
+    
+    def _build_mock_attractions(self, rng: random.Random, destination: str) -> List[Dict]:
+        rand = rng.random
+        return [
+            {
                 'id': f'mock_{i}',
-                'name': f"{destination} {template['name']}",
-                'category': template['category'],
-                'price_per_person': template['price'],
+                'name': f"{destination} {template.name}",
+                'category': template.category,
+                'price_per_person': template.price,
                 'currency': 'USD',
-                'rating': round(random.uniform(7.0, 9.5), 1),
-                'description': f"Visit the famous {template['name']} in {destination}"
-            })
-        
-        return attractions
+                'rating': round(7.0 + 2.5 * rand(), 1),
+                'description': f"Visit the famous {template.name} in {destination}"
+            }
+            for i, template in enumerate(self.MOCK_ATTRACTIONS)
+        ]
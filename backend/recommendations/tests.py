@@ -0,0 +1,890 @@
+import asyncio
+import base64
+import json
+import random
+import re
+from itertools import combinations, product
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import models
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .amadeus_service import AmadeusService
+from .bundles import HOTEL_RATING_WEIGHT, TRANSPORT_RATING_WEIGHT, best_bundles
+from .caching import SingleFlight, TTLCache
+from .history_writer import SearchHistoryWriter, search_history_writer
+from .models import Destination, Hotel, Transport, Attraction, TravelPackage, SearchHistory
+from .pagination import KeysetPagination
+from .pricing import evaluate_prices
+from .services import TravelRecommendationService
+from .views import (
+    AttractionViewSet, HotelViewSet, TransportViewSet, TravelPackageViewSet, destination_filter,
+)
+
+
+ROWS = 25
+
+# Queries per list request (page-number mode includes the COUNT query);
+# a count that grows with the page size is an N+1
+PAGE_QUERIES = {
+    '/api/hotels/': 2,
+    '/api/transports/': 2,
+    '/api/attractions/': 2,
+    '/api/packages/': 5,  # plus one prefetch per M2M relation
+}
+CURSOR_QUERIES = {
+    '/api/hotels/': 1,
+    '/api/transports/': 1,
+    '/api/attractions/': 1,
+}
+FEATURED_QUERIES = 4
+
+
+class CatalogQueryCountTests(TestCase):
+    """Catalog list endpoints run a fixed number of queries whatever the page size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        origin = Destination.objects.create(name='Origin', city='Origin City', country='Testland')
+        destination = Destination.objects.create(name='Destination', city='Destination City', country='Testland')
+        hotels = Hotel.objects.bulk_create([
+            Hotel(name=f'Hotel {i}', destination=destination, address='1 Main Street', price_per_night=100 + i)
+            for i in range(ROWS)
+        ])
+        transports = Transport.objects.bulk_create([
+            Transport(name=f'Transport {i}', transport_type='flight', origin=origin,
+                      destination=destination, price_per_person=200 + i)
+            for i in range(ROWS)
+        ])
+        attractions = Attraction.objects.bulk_create([
+            Attraction(name=f'Attraction {i}', destination=destination, category='museum', price_per_person=10 + i)
+            for i in range(ROWS)
+        ])
+        for i in range(ROWS):
+            package = TravelPackage.objects.create(
+                name=f'Package {i}', destination=destination, base_price=1000 + i, is_featured=True
+            )
+            package.hotels.set(hotels)
+            package.transports.set(transports)
+            package.attractions.set(attractions)
+
+    def assert_list_queries(self, url, expected, rows):
+        with self.assertNumQueries(expected):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        if isinstance(results, dict):
+            results = results['results']
+        self.assertEqual(len(results), rows)
+
+    def test_cursor_pagination_query_count(self):
+        for path, expected in CURSOR_QUERIES.items():
+            for page_size in (1, ROWS):
+                with self.subTest(path=path, page_size=page_size):
+                    self.assert_list_queries(f'{path}?pagination=cursor&page_size={page_size}', expected, page_size)
+
+    def test_page_number_pagination_query_count(self):
+        # A full page of 20 rows, then the last page of 5
+        for path, expected in PAGE_QUERIES.items():
+            for page, rows in ((1, 20), (2, ROWS - 20)):
+                with self.subTest(path=path, page=page):
+                    self.assert_list_queries(f'{path}?pagination=page&page={page}', expected, rows)
+
+    def test_featured_packages_query_count(self):
+        self.assert_list_queries('/api/packages/featured/', FEATURED_QUERIES, 6)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages walk the whole list in both directions across duplicate sort values"""
+
+    @classmethod
+    def setUpTestData(cls):
+        destination = Destination.objects.create(name='Destination', city='Destination City', country='Testland')
+        prices = [100, 100, 100, 200, 200, 300, 300, 300, 400]
+        Hotel.objects.bulk_create([
+            Hotel(name=f'Hotel {i}', destination=destination, address='1 Main Street',
+                  price_per_night=price, rating=4 + i % 2, star_rating=3 + i % 3)
+            for i, price in enumerate(prices)
+        ])
+
+    def get_page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self, url, link):
+        """Ids of every row reached by following `link` from url, page by page"""
+        pages = []
+        while url:
+            page = self.get_page(url)
+            pages.append([row['id'] for row in page['results']])
+            url = page[link]
+        return pages
+
+    def test_walk_forward_and_back(self):
+        orderings = {
+            'price': ('price_per_night', 'id'),
+            'rating': ('-rating', '-id'),
+            'stars': ('-star_rating', '-id'),
+        }
+        for sort, order_by in orderings.items():
+            expected = list(Hotel.objects.order_by(*order_by).values_list('id', flat=True))
+            for page_size in (1, 2, 4):
+                with self.subTest(sort=sort, page_size=page_size):
+                    url = f'/api/hotels/?pagination=cursor&sort={sort}&page_size={page_size}'
+                    forward = self.walk(url, 'next')
+                    self.assertEqual(sum(forward, []), expected)
+                    self.assertTrue(all(len(page) == page_size for page in forward[:-1]))
+
+                    # Back from the last page to the first one, page for page
+                    last = self.get_page(url)
+                    while last['next']:
+                        last = self.get_page(last['next'])
+                    backward = self.walk(last['previous'], 'previous')
+                    self.assertEqual(backward, forward[-2::-1])
+
+    def test_first_and_last_pages_have_no_outer_links(self):
+        first = self.get_page('/api/hotels/?pagination=cursor&page_size=9')
+        self.assertEqual((first['next'], first['previous'], len(first['results'])), (None, None, 9))
+
+    def test_tampered_cursor_is_rejected(self):
+        paginator = KeysetPagination()
+        paginator.ordering = ['price_per_night', 'id']
+        cursors = [
+            'not-a-cursor',
+            base64.urlsafe_b64encode(b'{"v": [100]').decode(),
+            paginator.encode_cursor(['100.00']),  # Wrong number of sort values
+            base64.urlsafe_b64encode(b'{"values": ["100.00", 1]}').decode(),
+            base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f'/api/hotels/?pagination=cursor&sort=price&cursor={cursor}')
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
+
+
+class FastListOutputTests(TestCase):
+    """The values() list path returns exactly what the model serializers return"""
+
+    @classmethod
+    def setUpTestData(cls):
+        paris = Destination.objects.create(name='Paris', city='Paris', country='France',
+                                           latitude='48.8566000', longitude='2.3522000')
+        rome = Destination.objects.create(name='Rome', city='Rome', country='Italy')
+        hotels = [
+            Hotel.objects.create(name='Grand', destination=paris, address='1 Rue', price_per_night='249.99',
+                                 star_rating=5, rating='4.5', amenities=['wifi', 'spa']),
+            Hotel.objects.create(name='Budget', destination=rome, address='2 Via', price_per_night=40),
+        ]
+        transports = [
+            Transport.objects.create(name='AF 1', transport_type='flight', origin=rome, destination=paris,
+                                     price_per_person='120.50', duration_minutes=125),
+            Transport.objects.create(name='Bus', transport_type='bus', destination=rome, price_per_person=15),
+        ]
+        attractions = [
+            Attraction.objects.create(name='Louvre', destination=paris, category='museum', price_per_person=22,
+                                      duration_hours='3.5', latitude='48.8606000', longitude='2.3376000', rating='4.8'),
+            Attraction.objects.create(name='Forum', destination=rome, category='historical'),
+        ]
+        package = TravelPackage.objects.create(name='Paris week', destination=paris, base_price='1999.00',
+                                               discount_percentage='12.50', duration_days=7, is_featured=True)
+        package.hotels.set(hotels)
+        package.transports.set(transports)
+        package.attractions.set(attractions[:1])
+        TravelPackage.objects.create(name='Rome weekend', destination=rome, base_price=499, is_featured=True)
+
+    def test_fast_list_matches_serializer(self):
+        urls = {
+            HotelViewSet: ['/api/hotels/', '/api/hotels/?nights=3&rooms=2&sort=total',
+                           '/api/hotels/?pagination=cursor&page_size=1'],
+            TransportViewSet: ['/api/transports/', '/api/transports/?people=3&pagination=cursor'],
+            AttractionViewSet: ['/api/attractions/', '/api/attractions/?people=2&free=true'],
+            TravelPackageViewSet: ['/api/packages/', '/api/packages/featured/'],
+        }
+        for viewset, paths in urls.items():
+            self.assertTrue(viewset.fast_list)
+            for path in paths:
+                with self.subTest(path=path):
+                    fast = self.client.get(path)
+                    with mock.patch.object(viewset, 'fast_list', False):
+                        regular = self.client.get(path)
+                    self.assertEqual(fast.status_code, 200)
+                    self.assertEqual(fast.json(), regular.json())
+                    self.assertEqual(fast.content, regular.content)
+
+
+class SearchResponseCacheTests(TestCase):
+    """Cached /api/search/ responses read the same as freshly computed ones"""
+
+    search = {'destination': 'Paris', 'check_in': '2026-05-01', 'check_out': '2026-05-04', 'people': 2}
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(search_history_writer, 'enabled', False))
+        cache.clear()
+
+    def post_search(self, **overrides):
+        return self.client.post('/api/search/', {**self.search, **overrides}, content_type='application/json')
+
+    def test_hit_matches_miss_without_origin(self):
+        miss = self.post_search()
+        hit = self.post_search()
+        self.assertEqual((miss['X-Cache'], hit['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(hit.json(), miss.json())
+        self.assertEqual(hit.json()['summary']['origin']['name'], 'Not specified')
+
+    def test_hit_echoes_request_names(self):
+        self.post_search(origin='Hanoi')
+        hit = self.post_search(origin='HANOI', destination='paris')
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        summary = hit.json()['summary']
+        self.assertEqual(summary['origin']['name'], 'HANOI')
+        self.assertEqual(summary['trip_details']['origin'], 'HANOI')
+        self.assertEqual(summary['destination']['name'], 'paris')
+        self.assertEqual(summary['destination']['coordinates']['name'], 'paris')
+
+
+class PlannerSearchReuseTests(TestCase):
+    """The planner reuses a search_id only for a search made for the same trip"""
+
+    # The planner books one room per two people
+    search = {'origin': 'Hanoi', 'destination': 'Rome', 'check_in': '2026-05-01', 'check_out': '2026-05-04',
+              'people': 2, 'rooms': 1, 'budget': 3000}
+    plan = {'origin': 'HANOI ', 'destination': 'rome', 'travel_type': 'culture', 'budget': 3000,
+            'num_days': 3, 'num_people': 2}
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(search_history_writer, 'enabled', False))
+        cache.clear()
+        self.search_id = self.post_search()
+
+    def post_search(self, **overrides):
+        response = self.client.post('/api/search/', {**self.search, **overrides}, content_type='application/json')
+        return response.json()['search_id']
+
+    def post_plan(self, **overrides):
+        return self.client.post('/api/ai-planner/', {**self.plan, 'search_id': self.search_id, **overrides},
+                                content_type='application/json')
+
+    def test_matching_search_is_reused(self):
+        self.assertEqual(self.post_plan()['X-Cache'], 'HIT')
+
+    def test_different_trip_is_not_reused(self):
+        for overrides in ({'num_people': 6}, {'budget': 8000}, {'num_days': 5}, {'destination': 'Milan'},
+                          {'origin': 'Paris'}, {'origin': ''}):
+            with self.subTest(**overrides):
+                self.assertEqual(self.post_plan(**overrides)['X-Cache'], 'MISS')
+
+    def test_different_rooms_are_not_reused(self):
+        search_id = self.post_search(rooms=2)
+        self.assertEqual(self.post_plan(search_id=search_id)['X-Cache'], 'MISS')
+
+
+class AmadeusDeadlineTests(SimpleTestCase):
+    """Amadeus HTTP calls made for a search end by the search deadline"""
+
+    def setUp(self):
+        self.service = AmadeusService()
+        self.service.timeout = (5, 30)
+
+    @mock.patch('recommendations.amadeus_service.time.monotonic', return_value=100.0)
+    def test_timeout_is_cut_to_the_deadline(self, monotonic):
+        self.assertEqual(self.service.request_timeout(), (5, 30))
+        self.service.deadline = 112.0
+        self.assertEqual(self.service.request_timeout(), (5, 12.0))
+        self.service.deadline = 102.0
+        self.assertEqual(self.service.request_timeout(), (2.0, 2.0))
+        self.service.deadline = 100.0
+        self.assertIsNone(self.service.request_timeout())
+
+    @mock.patch('recommendations.amadeus_service.time.monotonic', return_value=100.0)
+    def test_no_call_after_the_deadline(self, monotonic):
+        self.service.deadline = 99.0
+        with mock.patch.object(self.service, '_get_access_token', return_value='token'), \
+                mock.patch.object(self.service.session, 'get') as get:
+            self.assertIsNone(self.service._make_request('/v1/test'))
+        get.assert_not_called()
+
+    @override_settings(API_MODE='amadeus', SEARCH_DEADLINE_SECONDS=7)
+    @mock.patch('recommendations.services.time.monotonic', return_value=50.0)
+    def test_fetch_providers_sets_the_deadline(self, monotonic):
+        service = TravelRecommendationService()
+        results, timed_out = service._fetch_providers({'hotels': (lambda: ['hotel'], ())})
+        self.assertEqual((results, timed_out), ({'hotels': ['hotel']}, []))
+        self.assertEqual(service.amadeus_service.deadline, 57.0)
+
+
+class InlineExecutor:
+    """Runs submitted calls immediately, so background refreshes are synchronous"""
+
+    def submit(self, func, *args):
+        func(*args)
+
+
+class TTLCacheTests(SimpleTestCase):
+    """Expiry, stale-while-revalidate and stats of the provider TTL cache"""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.enterContext(mock.patch('recommendations.caching.time.monotonic', side_effect=lambda: self.now))
+        self.enterContext(mock.patch('recommendations.caching._get_refresh_executor', return_value=InlineExecutor()))
+        self.cache = TTLCache('test', ttl=10, stale_ttl=5)
+        self.loads = 0
+
+    def loader(self, value=None):
+        def load():
+            self.loads += 1
+            return value if value is not None else [f'value {self.loads}']
+        return load
+
+    def test_fresh_hit_and_expiry(self):
+        self.assertEqual(self.cache.get_or_load('k', self.loader()), ['value 1'])
+        self.now += 9.9
+        self.assertEqual(self.cache.get_or_load('k', self.loader()), ['value 1'])
+        self.now += 5.1  # past ttl + stale_ttl
+        self.assertEqual(self.cache.get_or_load('k', self.loader()), ['value 2'])
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 1))
+        self.assertEqual(stats['hit_ratio'], round(1 / 3, 4))
+
+    def test_stale_entry_is_served_then_refreshed(self):
+        self.cache.get_or_load('k', self.loader())
+        self.now += 12
+        # The stale value is returned right away; the refresh stores the new one
+        self.assertEqual(self.cache.get_or_load('k', self.loader()), ['value 1'])
+        self.assertEqual(self.cache.get_or_load('k', self.loader()), ['value 2'])
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['stale_hits'], stats['refreshes']), (1, 1, 1))
+        # The refreshed entry is fresh for a full ttl from the refresh
+        self.now += 9
+        self.cache.get_or_load('k', self.loader())
+        self.assertEqual(self.loads, 2)
+
+    def test_failed_refresh_keeps_stale_value(self):
+        self.cache.get_or_load('k', self.loader())
+        self.now += 12
+
+        def failing():
+            raise RuntimeError('provider down')
+
+        with self.assertLogs('recommendations.caching', 'ERROR'):
+            self.assertEqual(self.cache.get_or_load('k', failing), ['value 1'])
+        self.assertEqual(self.cache.stats()['refresh_errors'], 1)
+        self.assertEqual(self.cache.get_or_load('k', self.loader()), ['value 1'])
+
+    def test_empty_results_and_zero_ttl_are_not_cached(self):
+        self.cache.get_or_load('k', self.loader([]))
+        self.cache.get_or_load('k', self.loader([]))
+        self.assertEqual((self.loads, self.cache.stats()['size']), (2, 0))
+        disabled = TTLCache('off', ttl=0)
+        disabled.get_or_load('k', self.loader())
+        disabled.get_or_load('k', self.loader())
+        self.assertEqual(self.loads, 4)
+
+    def test_least_recently_stored_entry_is_evicted(self):
+        cache = TTLCache('small', ttl=10, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.get_or_load(key, self.loader())
+        cache.get_or_load('a', self.loader())
+        self.assertEqual(self.loads, 4)
+        self.assertEqual(cache.stats()['size'], 2)
+
+    async def test_async_stale_entry_is_refreshed_in_a_task(self):
+        async def load():
+            self.loads += 1
+            return [f'value {self.loads}']
+
+        await self.cache.aget_or_load('k', load)
+        self.now += 12
+        self.assertEqual(await self.cache.aget_or_load('k', load), ['value 1'])
+        await asyncio.gather(*self.cache._tasks)
+        self.assertEqual(await self.cache.aget_or_load('k', load), ['value 2'])
+        self.assertEqual(self.cache.stats()['refreshes'], 1)
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Coalesced async provider calls"""
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        flight = SingleFlight('test')
+        release = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return ['offer']
+
+        leader = asyncio.ensure_future(flight.ado('key', load))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado('key', load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        self.assertEqual(await follower, ['offer'])
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertEqual(calls, 1)
+        self.assertEqual(flight.stats(), {'calls': 1, 'coalesced': 1, 'in_flight': 0})
+
+    async def test_failure_is_shared(self):
+        flight = SingleFlight('test')
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            raise RuntimeError('upstream error')
+
+        callers = [asyncio.ensure_future(flight.ado('key', load)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        self.assertEqual([type(result) for result in results], [RuntimeError, RuntimeError])
+        self.assertEqual(flight.stats()['in_flight'], 0)
+
+
+class ProviderFanOutTests(SimpleTestCase):
+    """Provider fan-out under the search deadline"""
+
+    async def test_cancelled_provider_counts_as_timed_out(self):
+        async def hotels():
+            return ['hotel']
+
+        async def transports():
+            raise asyncio.CancelledError
+
+        service = TravelRecommendationService()
+        results, timed_out = await service._afetch_providers({'hotels': hotels(), 'transports': transports()})
+        self.assertEqual(results, {'hotels': ['hotel'], 'transports': []})
+        self.assertEqual(timed_out, ['transports'])
+
+
+@override_settings(SEARCH_HISTORY_BATCH_SIZE=3, SEARCH_HISTORY_FLUSH_INTERVAL=5, SEARCH_HISTORY_MAX_QUEUE=4)
+class SearchHistoryWriterTests(TestCase):
+    """The buffered writer, driven from the test thread instead of its background thread"""
+
+    def setUp(self):
+        self.writer = SearchHistoryWriter()
+        self.enterContext(mock.patch.object(self.writer, '_ensure_started'))
+        # Closing connections would break the test transaction
+        self.enterContext(mock.patch('recommendations.history_writer.close_old_connections'))
+
+    def entry(self, n):
+        return SearchHistory(destination_query=f'City {n}', check_in_date='2026-03-01', check_out_date='2026-03-04')
+
+    def test_collect_stops_at_batch_size(self):
+        for n in range(4):
+            self.assertTrue(self.writer.record(self.entry(n)))
+        batch = self.writer._collect()
+        self.assertEqual([e.destination_query for e in batch], ['City 0', 'City 1', 'City 2'])
+        self.assertEqual(self.writer.stats()['pending'], 1)
+
+    def test_collect_returns_partial_batch_after_interval(self):
+        self.writer.record(self.entry(0))
+        # deadline = 0 + 5; the first entry is read at 0, then the clock is past the deadline
+        with mock.patch('recommendations.history_writer.time.monotonic', side_effect=[0, 0, 6]):
+            batch = self.writer._collect()
+        self.assertEqual(len(batch), 1)
+
+    def test_full_queue_drops_entries(self):
+        results = [self.writer.record(self.entry(n)) for n in range(6)]
+        self.assertEqual(results, [True] * 4 + [False] * 2)
+        stats = self.writer.stats()
+        self.assertEqual((stats['queued'], stats['dropped'], stats['pending']), (4, 2, 4))
+
+    def test_flush_writes_queued_entries(self):
+        for n in range(2):
+            self.writer.record(self.entry(n))
+        self.writer.flush()
+        self.assertEqual(SearchHistory.objects.count(), 2)
+        stats = self.writer.stats()
+        self.assertEqual((stats['written'], stats['flushes'], stats['pending']), (2, 1, 0))
+        self.writer.flush()  # Nothing queued, nothing written
+        self.assertEqual(self.writer.stats()['flushes'], 1)
+
+    def test_write_error_counts_failed_entries(self):
+        for n in range(2):
+            self.writer.record(self.entry(n))
+        with mock.patch.object(SearchHistory.objects, 'bulk_create', side_effect=RuntimeError('db down')), \
+                self.assertLogs('recommendations.history_writer', 'ERROR') as logs:
+            self.writer.flush()
+        self.assertIn('Failed to write 2 search history entries: db down', logs.output[0])
+        stats = self.writer.stats()
+        self.assertEqual((stats['written'], stats['failed'], stats['flushes']), (0, 2, 1))
+
+    def test_disabled_writer_saves_immediately(self):
+        self.writer.enabled = False
+        self.assertTrue(self.writer.record(self.entry(0)))
+        self.assertEqual(SearchHistory.objects.count(), 1)
+        self.assertEqual(self.writer.stats()['pending'], 0)
+
+
+class DestinationNormalizedNameTests(TestCase):
+    """The normalized city/country columns behind destination_filter"""
+
+    def setUp(self):
+        Destination.objects.create(name='Paris', city='  Paris ', country='FRANCE')
+        Destination.objects.bulk_create([
+            Destination(name='Ho Chi Minh', city='Ho  Chi Minh City', country='Viet Nam'),
+            Destination(name='Nice', city='Nice', country='France'),
+        ])
+
+    def search(self, term, countries=True):
+        return sorted(Destination.objects.filter(destination_filter(term, countries)).values_list('name', flat=True))
+
+    def test_filter_ignores_case_and_whitespace(self):
+        self.assertEqual(self.search('PARIS'), ['Paris'])
+        self.assertEqual(self.search(' ho chi  MINH '), ['Ho Chi Minh'])
+        self.assertEqual(self.search('france'), ['Nice', 'Paris'])
+        self.assertEqual(self.search('france', countries=False), [])
+        self.assertEqual(self.search('ice'), ['Nice'])
+
+    def test_bulk_writes_keep_columns_in_sync(self):
+        Destination.objects.filter(name='Nice').update(city='  NICE  Côte ')
+        self.assertEqual(Destination.objects.get(name='Nice').city_normalized, 'nice côte')
+
+        paris = Destination.objects.get(name='Paris')
+        paris.country = 'République  Française'
+        Destination.objects.bulk_update([paris], ['country'])
+        self.assertEqual(self.search('république française'), ['Paris'])
+
+    def test_update_rejects_expressions(self):
+        with self.assertRaises(ValueError):
+            Destination.objects.update(city=models.F('name'))
+
+
+class EvaluatePricesTests(SimpleTestCase):
+    """The 60/30/10 budget split over hotels, transports and local transports"""
+
+    hotels = [{'id': 'h1', 'price_per_night': 150}, {'id': 'h2', 'price_per_night': 90},
+              {'id': 'h3', 'price_per_night': 200}, {'id': 'h4', 'price_per_night': 90}]
+    transports = [{'id': 't1', 'price_per_person': 200}, {'id': 't2', 'price_per_person': 70}]
+    local_transports = [{'id': 'l1', 'total_price': 120}, {'id': 'l2', 'total_price': 50}, {'id': 'l3'}]
+
+    def evaluate(self, budget, nights=2, people=2, rooms=1):
+        priced = evaluate_prices(self.hotels, self.transports, self.local_transports, nights, people, rooms, budget)
+        return {
+            kind: ([o['id'] for o in options], cheapest and cheapest['id'])
+            for kind, (options, cheapest) in priced._asdict().items()
+        }
+
+    def test_without_budget_keeps_everything(self):
+        expected = {
+            'hotels': (['h1', 'h2', 'h3', 'h4'], 'h2'),  # First of the tied cheapest
+            'transports': (['t1', 't2'], 't2'),
+            'local_transports': (['l1', 'l2', 'l3'], 'l3'),  # A missing total counts as free
+        }
+        for budget in (None, 0, -100):
+            with self.subTest(budget=budget):
+                self.assertEqual(self.evaluate(budget), expected)
+
+    def test_budget_split(self):
+        # Limits: hotels 300 for 2 nights, transports 150 for 2 people, local 50; totals at the limit are kept
+        self.assertEqual(self.evaluate(500), {
+            'hotels': (['h1', 'h2', 'h4'], 'h2'),
+            'transports': (['t2'], 't2'),
+            'local_transports': (['l2', 'l3'], 'l3'),
+        })
+        # Hotel totals are per room: with 2 rooms only the 360 totals fit within 420
+        self.assertEqual(self.evaluate(700, rooms=2)['hotels'], (['h2', 'h4'], 'h2'))
+
+    def test_nothing_within_budget(self):
+        self.local_transports = [{'id': 'l1', 'total_price': 120}, {'id': 'l2', 'total_price': 50}]
+        # Hotels fall back to every option by price; the others keep provider order
+        self.assertEqual(self.evaluate(100), {
+            'hotels': (['h2', 'h4', 'h1', 'h3'], 'h2'),
+            'transports': (['t1', 't2'], 't2'),
+            'local_transports': (['l1', 'l2'], 'l2'),
+        })
+
+    def test_empty_lists(self):
+        self.hotels = self.transports = self.local_transports = []
+        for budget in (None, 1000):
+            with self.subTest(budget=budget):
+                self.assertEqual(self.evaluate(budget), {
+                    'hotels': ([], None), 'transports': ([], None), 'local_transports': ([], None),
+                })
+
+
+def exhaustive_bundles(hotels, transports, local_transports, attractions, nights, people, rooms, budget, top_n):
+    """(score, cost before attractions) of the top bundles by brute force, for checking best_bundles"""
+    if not budget or budget <= 0:
+        return []
+    paid = [a for a in attractions if a['price_per_person'] > 0]
+    free_value = sum(a.get('rating') or 0 for a in attractions if a['price_per_person'] <= 0)
+    subsets = [
+        (sum(a['price_per_person'] for a in subset) * people, sum(a.get('rating') or 0 for a in subset))
+        for size in range(len(paid) + 1) for subset in combinations(paid, size)
+    ]
+    candidates = []
+    for hotel, transport, local in product(hotels or [None], transports or [None], local_transports or [None]):
+        cost = ((hotel['price_per_night'] * nights * rooms if hotel else 0)
+                + (transport['price_per_person'] * people if transport else 0)
+                + (local['total_price'] if local else 0))
+        if cost > budget:
+            continue
+        value = ((hotel.get('rating') or 0) * HOTEL_RATING_WEIGHT if hotel else 0) + sum(
+            (option.get('rating') or 0) * TRANSPORT_RATING_WEIGHT for option in (transport, local) if option)
+        extra = max(v for c, v in subsets if cost + c <= budget)
+        candidates.append((round(value + free_value + extra, 2), cost))
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+    return candidates[:top_n]
+
+
+class BestBundlesTests(SimpleTestCase):
+    """best_bundles against a brute-force search on small inputs"""
+
+    def random_trip(self, rng):
+        ratings = [None, 0, 3.5, 4.0, 4.0, 4.5]  # Repeated values make ties likely
+
+        def options(n, price_key, prices):
+            result = []
+            for i in range(n):
+                option = {'id': i, price_key: rng.choice(prices)}
+                rating = rng.choice(ratings)
+                if rating is not None:  # Some providers leave ratings out
+                    option['rating'] = rating
+                result.append(option)
+            return result
+        return dict(
+            hotels=options(rng.randint(0, 3), 'price_per_night', [60, 80, 80, 150]),
+            transports=options(rng.randint(0, 3), 'price_per_person', [50, 120, 120, 300]),
+            local_transports=options(rng.randint(0, 2), 'total_price', [0, 20, 40]),
+            attractions=options(rng.randint(0, 5), 'price_per_person', [0, 10, 25, 25, 60]),
+            nights=rng.randint(1, 3),
+            people=rng.randint(1, 3),
+            rooms=rng.randint(1, 2),
+            budget=rng.choice([0, 100, 400, 700, 1000, 1500, 3000]),
+            top_n=rng.randint(1, 4),
+        )
+
+    def ranking(self, bundles):
+        return [
+            (b['score'], round(b['price_breakdown']['total'] - b['price_breakdown']['attractions'], 2))
+            for b in bundles
+        ]
+
+    def assert_consistent(self, bundle, trip):
+        """A bundle's breakdown and score agree with the options it holds"""
+        people, breakdown = trip['people'], bundle['price_breakdown']
+        self.assertLessEqual(breakdown['total'], trip['budget'])
+        self.assertEqual(breakdown['attractions'], sum(a['price_per_person'] for a in bundle['attractions']) * people)
+        score = sum(a.get('rating') or 0 for a in bundle['attractions'])
+        if bundle['hotel']:
+            score += (bundle['hotel'].get('rating') or 0) * HOTEL_RATING_WEIGHT
+        for kind in ('transport', 'local_transport'):
+            if bundle[kind]:
+                score += (bundle[kind].get('rating') or 0) * TRANSPORT_RATING_WEIGHT
+        self.assertEqual(bundle['score'], round(score, 2))
+
+    def test_matches_exhaustive_search(self):
+        rng = random.Random(20)
+        for case in range(300):
+            trip = self.random_trip(rng)
+            with self.subTest(case=case, trip=trip):
+                bundles = best_bundles(**trip)
+                self.assertEqual(self.ranking(bundles), exhaustive_bundles(**trip))
+                for bundle in bundles:
+                    self.assert_consistent(bundle, trip)
+
+    def test_no_budget(self):
+        trip = dict(hotels=[{'price_per_night': 10}], transports=[], local_transports=[], attractions=[],
+                    nights=1, people=1, rooms=1)
+        for budget in (None, 0, -50):
+            with self.subTest(budget=budget):
+                self.assertEqual(best_bundles(**trip, budget=budget), [])
+        self.assertEqual(best_bundles(**trip, budget=100, top_n=0), [])
+
+    def test_empty_lists_are_left_out(self):
+        attractions = [{'id': 'free', 'price_per_person': 0, 'rating': 4.0}]
+        [bundle] = best_bundles([], [], [], attractions, nights=2, people=2, rooms=1, budget=500)
+        self.assertEqual((bundle['hotel'], bundle['transport'], bundle['local_transport']), (None, None, None))
+        self.assertEqual(bundle['attractions'], attractions)
+        self.assertEqual(bundle['score'], 4.0)
+        self.assertEqual(best_bundles([], [], [], [], nights=2, people=2, rooms=1, budget=500)[0]['score'], 0)
+
+    def test_nothing_fits(self):
+        hotels = [{'id': 1, 'price_per_night': 400, 'rating': 5}]
+        self.assertEqual(best_bundles(hotels, [], [], [], nights=2, people=1, rooms=1, budget=500), [])
+
+    def test_ties_go_to_the_cheaper_bundle(self):
+        hotels = [{'id': 'dear', 'price_per_night': 100, 'rating': 4.0},
+                  {'id': 'cheap', 'price_per_night': 80, 'rating': 4.0},
+                  {'id': 'twin', 'price_per_night': 80, 'rating': 4.0}]
+        bundles = best_bundles(hotels, [], [], [], nights=1, people=1, rooms=1, budget=200, top_n=3)
+        self.assertEqual([b['score'] for b in bundles], [20.0] * 3)
+        self.assertEqual([b['hotel']['id'] for b in bundles][-1], 'dear')
+        self.assertEqual({b['hotel']['id'] for b in bundles[:2]}, {'cheap', 'twin'})
+
+
+PLAN = {'origin': 'Hanoi', 'destination': 'Rome', 'travel_type': 'culture', 'budget': 3000,
+        'num_days': 3, 'num_people': 2}
+SSE_FRAME = re.compile(rb'event: (\w+)\ndata: (.*)\n\n')
+
+
+def parse_stream(response):
+    """(event, data) pairs of a streamed SSE or NDJSON response"""
+    content = b''.join(response.streaming_content)
+    return parse_frames(response['Content-Type'], content)
+
+
+def parse_frames(content_type, content):
+    if content_type.startswith('application/x-ndjson'):
+        return [(line['event'], line['data']) for line in map(json.loads, content.splitlines())]
+    frames = SSE_FRAME.findall(content)
+    assert b''.join(b'event: %s\ndata: %s\n\n' % frame for frame in frames) == content, 'malformed SSE framing'
+    return [(event.decode(), json.loads(data)) for event, data in frames]
+
+
+@override_settings(MOCK_DETERMINISTIC=True)
+class PlannerStreamTests(TestCase):
+    """Streamed plans send the JSON plan's content as ordered SSE/NDJSON events"""
+
+    def setUp(self):
+        cache.clear()
+        self.body = self.client.post('/api/ai-planner/', PLAN, content_type='application/json').json()
+
+    def assert_events_match_plan(self, events):
+        names = [event for event, _ in events]
+        self.assertEqual(names, ['summary', 'accommodation'] + ['day'] * PLAN['num_days']
+                         + ['costs', 'tips', 'recommendations', 'done'])
+        data = dict(events)  # The last day wins, checked with the others below
+        plan = self.body['plan']
+
+        summary = dict(data['summary'])
+        header = summary.pop('text')
+        self.assertEqual(summary, {key: plan[key] for key in summary})
+        self.assertEqual(set(plan) - set(summary), {
+            'budget_exceeded', 'budget_warning', 'itinerary', 'itinerary_text',
+            'accommodation', 'cost_breakdown', 'tips',
+        })
+        self.assertEqual(data['accommodation'], {'accommodation': plan['accommodation']})
+
+        days = [day for event, day in events if event == 'day']
+        texts = [day.pop('text') for day in days]
+        self.assertEqual(days, plan['itinerary'])
+        self.assertEqual('\n'.join([header] + texts), plan['itinerary_text'])
+
+        self.assertEqual(data['costs'], {key: plan[key] for key in ('budget_exceeded', 'budget_warning', 'cost_breakdown')})
+        self.assertEqual(data['tips'], {'tips': plan['tips']})
+        self.assertEqual(data['recommendations'], self.body['recommendations'])
+        self.assertEqual(data['done'], {'success': True})
+
+    def test_sync_stream(self):
+        requests = {
+            'sse': ('?format=sse', {}, 'text/event-stream'),
+            'ndjson': ('?format=ndjson', {}, 'application/x-ndjson'),
+            'accept': ('', {'HTTP_ACCEPT': 'application/x-ndjson'}, 'application/x-ndjson'),
+        }
+        for name, (query, headers, media_type) in requests.items():
+            with self.subTest(name):
+                response = self.client.post(f'/api/ai-planner/{query}', PLAN, content_type='application/json', **headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], f'{media_type}; charset=utf-8')
+                self.assertEqual(response['Cache-Control'], 'no-cache')
+                self.assert_events_match_plan(parse_stream(response))
+
+    async def test_async_stream(self):
+        for stream_format, media_type in (('sse', 'text/event-stream'), ('ndjson', 'application/x-ndjson')):
+            with self.subTest(stream_format):
+                response = await self.async_client.post(f'/api/async/ai-planner/?format={stream_format}', PLAN,
+                                                        content_type='application/json')
+                self.assertEqual(response['Content-Type'], f'{media_type}; charset=utf-8')
+                content = b''.join([chunk async for chunk in response.streaming_content])
+                self.assert_events_match_plan(parse_frames(media_type, content))
+
+    def test_failure_ends_stream_with_error_event(self):
+        with mock.patch('recommendations.ai_planner_service.TravelPlannerService._plan_costs',
+                        side_effect=RuntimeError('boom')), mock.patch('builtins.print'):
+            response = self.client.post('/api/ai-planner/?format=sse', PLAN, content_type='application/json')
+            events = parse_stream(response)
+        self.assertEqual([event for event, _ in events][-1], 'error')
+        self.assertNotIn('done', [event for event, _ in events])
+        self.assertEqual(events[-1][1], {'error': 'Failed to generate plan: boom'})
+
+
+@override_settings(MOCK_DETERMINISTIC=True)
+class ResponseFieldsTests(TestCase):
+    """?fields= / ?include= (or the body keys) trim search and planner responses"""
+
+    search = {'origin': 'Hanoi', 'destination': 'Rome', 'check_in': '2026-05-01', 'check_out': '2026-05-04',
+              'people': 2, 'budget': 3000}
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(search_history_writer, 'enabled', False))
+        cache.clear()
+        self.full_search = self.post('/api/search/', self.search).json()
+        self.full_plan = self.post('/api/ai-planner/', PLAN).json()
+
+    def post(self, path, data):
+        return self.client.post(path, data, content_type='application/json')
+
+    def test_search_fields(self):
+        full = self.full_search
+        cases = {
+            '?fields=hotels,bundles': {'hotels': full['hotels'], 'bundles': full['bundles']},
+            '?include=summary.trip_details': {'summary': {'trip_details': full['summary']['trip_details']}},
+            # Unknown names are ignored, also inside a section; lists are never split
+            '?fields=hotels.name,summary.bogus,bogus': {'hotels': full['hotels'], 'summary': {}},
+            '?fields=bogus': {},
+        }
+        for query, expected in cases.items():
+            for path in ('/api/search/', '/api/async/search/'):
+                with self.subTest(path=path, query=query):
+                    response = self.post(path + query, self.search)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.json(), {**expected, 'search_id': full['search_id']})
+
+    def test_search_fields_from_body_and_query(self):
+        body = self.post('/api/search/', {**self.search, 'include': ['attractions']}).json()
+        self.assertEqual(set(body), {'attractions', 'search_id'})
+        # The query string wins over the body
+        body = self.post('/api/search/?fields=transports', {**self.search, 'fields': 'attractions'}).json()
+        self.assertEqual(set(body), {'transports', 'search_id'})
+
+    def test_plan_fields(self):
+        full = self.full_plan
+        envelope = {key: full[key] for key in ('success', 'budget_exceeded', 'budget_warning')}
+        search_id = full['recommendations']['search_id']
+        cases = {
+            'cost_breakdown,tips': {'plan': {'cost_breakdown': full['plan']['cost_breakdown'], 'tips': full['plan']['tips']}},
+            'itinerary_text,recommendations.summary.destination': {
+                'plan': {'itinerary_text': full['plan']['itinerary_text']},
+                'recommendations': {
+                    'summary': {'destination': full['recommendations']['summary']['destination']},
+                    'search_id': search_id,
+                },
+            },
+            'recommendations.bogus': {'plan': {}, 'recommendations': {'search_id': search_id}},
+            'bogus': {'plan': {}},
+        }
+        for fields, expected in cases.items():
+            for path in ('/api/ai-planner/', '/api/async/ai-planner/'):
+                with self.subTest(path=path, fields=fields):
+                    response = self.post(path, {**PLAN, 'include': fields.split(',')})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.json(), {**envelope, **expected})
+
+    def test_streamed_plan_fields(self):
+        plan = self.full_plan['plan']
+        events = parse_stream(self.post('/api/ai-planner/?format=ndjson&fields=itinerary,recommendations.hotels', PLAN))
+        self.assertEqual([event for event, _ in events],
+                         ['summary'] + ['day'] * PLAN['num_days'] + ['costs', 'recommendations', 'done'])
+        data = dict(events)
+        self.assertEqual(data['summary'], {})
+        self.assertEqual([day for event, day in events if event == 'day'], plan['itinerary'])
+        self.assertEqual(data['costs'], {key: plan[key] for key in ('budget_exceeded', 'budget_warning')})
+        self.assertEqual(data['recommendations'], {
+            'hotels': self.full_plan['recommendations']['hotels'],
+            'search_id': self.full_plan['recommendations']['search_id'],
+        })
+
+        # Text only: days carry just their number and text
+        events = parse_stream(self.post('/api/ai-planner/?format=sse&fields=itinerary_text', PLAN))
+        self.assertEqual([event for event, _ in events], ['summary'] + ['day'] * PLAN['num_days'] + ['costs', 'done'])
+        days = [day for event, day in events if event == 'day']
+        self.assertEqual([set(day) for day in days], [{'day', 'text'}] * PLAN['num_days'])
+        self.assertEqual('\n'.join([events[0][1]['text']] + [day['text'] for day in days]), plan['itinerary_text'])
@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     DestinationViewSet, HotelViewSet, TransportViewSet,
     AttractionViewSet, TravelPackageViewSet, TravelSearchView,
-    health_check, api_info, api_status, AITravelPlannerView, ai_planner_status
+    health_check, api_info, api_status, AITravelPlannerView, ai_planner_status,
+    AsyncTravelSearchView, AsyncAITravelPlannerView
 )
 
 router = DefaultRouter()
@@ -20,6 +21,8 @@ urlpatterns = [
     path('search/', TravelSearchView.as_view(), name='travel-search'),
     path('ai-planner/', AITravelPlannerView.as_view(), name='ai-planner'),
     path('ai-planner/status/', ai_planner_status, name='ai-planner-status'),
+    path('async/search/', AsyncTravelSearchView.as_view(), name='travel-search-async'),
+    path('async/ai-planner/', AsyncAITravelPlannerView.as_view(), name='ai-planner-async'),
     path('', include(router.urls)),
 ]
 
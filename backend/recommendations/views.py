@@ -2,15 +2,107 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Q
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.db.models import F, FloatField, Prefetch, Q, Value
+from django.db.models.functions import Cast
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from datetime import datetime
+import json
 
 from .models import Destination, Hotel, Transport, Attraction, TravelPackage, SearchHistory
 from .serializers import (
     DestinationSerializer, HotelSerializer, TransportSerializer,
-    AttractionSerializer, TravelPackageSerializer, TravelSearchSerializer
+    AttractionSerializer, TravelPackageSerializer, TravelSearchSerializer,
+    PricingParamsSerializer
 )
 from .services import TravelRecommendationService
+from .history_writer import search_history_writer
+from .response_cache import search_response_cache, matches_search, with_request_names
+from .city_codes import normalize_city_name
+from .pagination import CatalogPaginationMixin
+from .fast_serializers import FastListMixin
+from .fields import parse_fields, project, subfields, wants
+from .renderers import (
+    CompressedResponseMixin, EventStreamRenderer, FastJSONRenderer, FastJsonResponse, NDJSONRenderer,
+    StreamRenderer, stream_renderer, stream_response
+)
+
+
+def destination_filter(term, countries=True):
+    """
+    Q matching destinations whose city (or country) contains term.
+    Filters on the normalized columns, which are indexed (trigram GIN on
+    PostgreSQL), instead of icontains on the raw ones.
+    """
+    term = normalize_city_name(term)
+    query = Q(city_normalized__contains=term)
+    if countries:
+        query |= Q(country_normalized__contains=term)
+    return query
+
+
+def matching_destinations(term, countries=True):
+    """
+    Subquery of destination ids for filtering related models.
+    Resolving the (small) destination table first lets the planner drive
+    the hotel/transport/attraction lookup from their destination indexes.
+    """
+    return Destination.objects.filter(destination_filter(term, countries)).values('pk')
+
+
+class QueryOptimizationMixin:
+    """
+    Applies the viewset's select_related/prefetch_related lookups so list
+    pages run a constant number of queries whatever the page size.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    
+    def optimize_queryset(self, queryset):
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+
+class TotalPriceQuerysetMixin:
+    """
+    Annotates total_price in SQL from the nights/rooms/people query params,
+    parsed once per request, so listings can filter (max_total) and sort
+    (sort=total) on the trip price.
+    """
+    price_field = None
+    price_multipliers = ()
+    
+    def get_pricing(self):
+        if not hasattr(self, '_pricing'):
+            params = PricingParamsSerializer(data=self.request.query_params)
+            params.is_valid(raise_exception=True)
+            self._pricing = params.validated_data
+        return self._pricing
+    
+    def annotate_total_price(self, queryset):
+        pricing = self.get_pricing()
+        multiplier = 1
+        for param in self.price_multipliers:
+            multiplier *= pricing[param]
+        queryset = queryset.annotate(
+            total_price=Cast(F(self.price_field) * Value(multiplier), FloatField())
+        )
+        if 'max_total' in pricing:
+            queryset = queryset.filter(total_price__lte=pricing['max_total'])
+        if self.request.query_params.get('sort') == 'total':
+            queryset = queryset.order_by('total_price')
+        return queryset
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['pricing'] = self.get_pricing()
+        return context
 
 
 class DestinationViewSet(viewsets.ModelViewSet):
@@ -23,9 +115,7 @@ class DestinationViewSet(viewsets.ModelViewSet):
         search = self.request.query_params.get('search', None)
         if search:
             queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(city__icontains=search) |
-                Q(country__icontains=search)
+                Q(name__icontains=search) | destination_filter(search)
             )
         popular = self.request.query_params.get('popular', None)
         if popular and popular.lower() == 'true':
@@ -40,20 +130,21 @@ class DestinationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class HotelViewSet(viewsets.ModelViewSet):
+class HotelViewSet(FastListMixin, CatalogPaginationMixin, TotalPriceQuerysetMixin, QueryOptimizationMixin, viewsets.ModelViewSet):
     """ViewSet for Hotel CRUD operations"""
     queryset = Hotel.objects.filter(is_available=True)
     serializer_class = HotelSerializer
+    fast_list = True
+    select_related_fields = ('destination',)
+    price_field = 'price_per_night'
+    price_multipliers = ('nights', 'rooms')
     
     def get_queryset(self):
-        queryset = Hotel.objects.filter(is_available=True)
+        queryset = self.optimize_queryset(Hotel.objects.filter(is_available=True))
         
         destination = self.request.query_params.get('destination', None)
         if destination:
-            queryset = queryset.filter(
-                Q(destination__city__icontains=destination) |
-                Q(destination__country__icontains=destination)
-            )
+            queryset = queryset.filter(destination__in=matching_destinations(destination))
         
         min_stars = self.request.query_params.get('min_stars', None)
         if min_stars:
@@ -71,39 +162,47 @@ class HotelViewSet(viewsets.ModelViewSet):
         elif sort_by == 'stars':
             queryset = queryset.order_by('-star_rating')
         
-        return queryset
+        return self.annotate_total_price(queryset)
 
 
-class TransportViewSet(viewsets.ModelViewSet):
+class TransportViewSet(FastListMixin, CatalogPaginationMixin, TotalPriceQuerysetMixin, QueryOptimizationMixin, viewsets.ModelViewSet):
     """ViewSet for Transport CRUD operations"""
     queryset = Transport.objects.filter(is_available=True)
     serializer_class = TransportSerializer
+    fast_list = True
+    select_related_fields = ('origin', 'destination')
+    price_field = 'price_per_person'
+    price_multipliers = ('people',)
     
     def get_queryset(self):
-        queryset = Transport.objects.filter(is_available=True)
+        queryset = self.optimize_queryset(Transport.objects.filter(is_available=True))
         
         destination = self.request.query_params.get('destination', None)
         if destination:
-            queryset = queryset.filter(destination__city__icontains=destination)
+            queryset = queryset.filter(destination__in=matching_destinations(destination, countries=False))
         
         transport_type = self.request.query_params.get('type', None)
         if transport_type:
             queryset = queryset.filter(transport_type=transport_type)
         
-        return queryset
+        return self.annotate_total_price(queryset)
 
 
-class AttractionViewSet(viewsets.ModelViewSet):
+class AttractionViewSet(FastListMixin, CatalogPaginationMixin, TotalPriceQuerysetMixin, QueryOptimizationMixin, viewsets.ModelViewSet):
     """ViewSet for Attraction CRUD operations"""
     queryset = Attraction.objects.filter(is_available=True)
     serializer_class = AttractionSerializer
+    fast_list = True
+    select_related_fields = ('destination',)
+    price_field = 'price_per_person'
+    price_multipliers = ('people',)
     
     def get_queryset(self):
-        queryset = Attraction.objects.filter(is_available=True)
+        queryset = self.optimize_queryset(Attraction.objects.filter(is_available=True))
         
         destination = self.request.query_params.get('destination', None)
         if destination:
-            queryset = queryset.filter(destination__city__icontains=destination)
+            queryset = queryset.filter(destination__in=matching_destinations(destination, countries=False))
         
         category = self.request.query_params.get('category', None)
         if category:
@@ -113,70 +212,188 @@ class AttractionViewSet(viewsets.ModelViewSet):
         if free_only and free_only.lower() == 'true':
             queryset = queryset.filter(price_per_person=0)
         
-        return queryset
+        return self.annotate_total_price(queryset)
 
 
-class TravelPackageViewSet(viewsets.ModelViewSet):
+class TravelPackageViewSet(FastListMixin, QueryOptimizationMixin, viewsets.ModelViewSet):
     """ViewSet for TravelPackage CRUD operations"""
     queryset = TravelPackage.objects.filter(is_available=True)
     serializer_class = TravelPackageSerializer
+    fast_list = True
+    select_related_fields = ('destination',)
+    prefetch_related_fields = (
+        Prefetch('hotels', queryset=Hotel.objects.select_related('destination')),
+        Prefetch('transports', queryset=Transport.objects.select_related('origin', 'destination')),
+        Prefetch('attractions', queryset=Attraction.objects.select_related('destination')),
+    )
+    
+    def get_queryset(self):
+        return self.optimize_queryset(TravelPackage.objects.filter(is_available=True))
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get featured travel packages"""
-        featured = TravelPackage.objects.filter(is_featured=True, is_available=True)[:6]
-        serializer = self.get_serializer(featured, many=True)
-        return Response(serializer.data)
+        featured = self.get_queryset().filter(is_featured=True)[:6]
+        return self.get_list_response(featured)
+
+
+class SearchHistoryMixin:
+    """Builds SearchHistory entries for the search views"""
+    
+    def _search_history(self, request, data):
+        return SearchHistory(
+            destination_query=data['destination'],
+            check_in_date=data['check_in'],
+            check_out_date=data['check_out'],
+            num_people=data['people'],
+            num_rooms=data['rooms'],
+            ip_address=self._get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+        )
+    
+    def _get_client_ip(self, request):
+        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if x_forwarded_for:
+            ip = x_forwarded_for.split(',')[0]
+        else:
+            ip = request.META.get('REMOTE_ADDR')
+        return ip
 
 
-class TravelSearchView(APIView):
+class TravelSearchView(CompressedResponseMixin, SearchHistoryMixin, APIView):
     """
     Main API endpoint for travel search and recommendations.
     POST /api/search/
+    
+    ?fields=summary,hotels (or ?include=) returns only those sections.
     """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     
     def post(self, request):
         serializer = TravelSearchSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
+        fields = _requested_fields(request, request.data)
         data = serializer.validated_data
         
-        # Log search history
+        # Log search history (queued, written in batches off the request path)
         try:
-            SearchHistory.objects.create(
-                destination_query=data['destination'],
-                check_in_date=data['check_in'],
-                check_out_date=data['check_out'],
-                num_people=data['people'],
-                num_rooms=data['rooms'],
-                ip_address=self._get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
-            )
+            search_history_writer.record(self._search_history(request, data))
         except Exception:
             pass  # Don't fail if history logging fails
         
+        search = _search_kwargs(data)
+        search_id = search_response_cache.search_id(search)
+        cache_key = search_response_cache.key_for(search_id) if search_response_cache.enabled else None
+        if cache_key:
+            cached = search_response_cache.get(cache_key)
+            if cached is not None:
+                return Response(_project_search(with_request_names(cached, search), fields),
+                                status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+        
         # Get recommendations
         service = TravelRecommendationService()
-        recommendations = service.get_recommendations(
-            origin=data.get('origin', ''),
-            destination=data['destination'],
-            check_in=str(data['check_in']),
-            check_out=str(data['check_out']),
-            people=data['people'],
-            rooms=data['rooms'],
-            budget=data.get('budget')
-        )
+        recommendations = service.get_recommendations(**search, fields=fields)
+        # Lets the AI planner reuse these results (see _stored_recommendations)
+        recommendations['search_id'] = search_id
+        if cache_key and _computes_all_sections(search, fields):
+            search_response_cache.set(cache_key, recommendations, search)
         
-        return Response(recommendations, status=status.HTTP_200_OK)
+        return Response(_project_search(recommendations, fields), status=status.HTTP_200_OK,
+                        headers={'X-Cache': 'MISS'})
+
+
+def _search_kwargs(data):
+    """get_recommendations arguments from validated TravelSearchSerializer data"""
+    return {
+        'origin': data.get('origin', ''),
+        'destination': data['destination'],
+        'check_in': str(data['check_in']),
+        'check_out': str(data['check_out']),
+        'people': data['people'],
+        'rooms': data['rooms'],
+        'budget': data.get('budget')
+    }
+
+
+def _requested_fields(request, data):
+    """Response fields selected with ?fields= / ?include= or the same body keys (None for all)"""
+    for source in (request.GET, data):
+        for key in ('fields', 'include'):
+            fields = parse_fields(source.get(key))
+            if fields is not None:
+                return fields
+    return None
+
+
+def _project_search(recommendations, fields):
+    """Search response with only the requested sections (search_id is always kept)"""
+    return project(recommendations, fields, always=('search_id',))
+
+
+def _computes_all_sections(search, fields):
+    """
+    Whether get_recommendations builds the whole response for these fields.
+    Only complete responses are cached, since the cache is shared by
+    requests selecting different fields.
+    """
+    return not search.get('budget') or wants(fields, 'bundles')
+
+
+def _parse_json_body(request):
+    """Decode a JSON request body for the plain Django async views"""
+    try:
+        return json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTravelSearchView(CompressedResponseMixin, SearchHistoryMixin, View):
+    """
+    Async variant of TravelSearchView for ASGI servers (e.g. uvicorn).
+    POST /api/async/search/
     
-    def _get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+    Provider calls await a non-blocking HTTP client, so a single worker can
+    hold many searches that are waiting on upstream I/O.
+    """
+    
+    async def post(self, request):
+        data = _parse_json_body(request)
+        if data is None:
+            return JsonResponse({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = TravelSearchSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        fields = _requested_fields(request, data)
+        data = serializer.validated_data
+        
+        # Log search history
+        try:
+            await search_history_writer.arecord(self._search_history(request, data))
+        except Exception:
+            pass  # Don't fail if history logging fails
+        
+        search = _search_kwargs(data)
+        search_id = search_response_cache.search_id(search)
+        cache_key = search_response_cache.key_for(search_id) if search_response_cache.enabled else None
+        if cache_key:
+            cached = await search_response_cache.aget(cache_key)
+            if cached is not None:
+                return FastJsonResponse(_project_search(with_request_names(cached, search), fields),
+                                        status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+        
+        service = TravelRecommendationService()
+        recommendations = await service.aget_recommendations(**search, fields=fields)
+        recommendations['search_id'] = search_id
+        if cache_key and _computes_all_sections(search, fields):
+            await search_response_cache.aset(cache_key, recommendations, search)
+        
+        return FastJsonResponse(_project_search(recommendations, fields), status=status.HTTP_200_OK,
+                                headers={'X-Cache': 'MISS'})
 
 
 @api_view(['GET'])
@@ -200,6 +417,9 @@ def api_info(request):
         'api_mode': getattr(settings, 'API_MODE', 'mock'),
         'endpoints': {
             'search': '/api/search/',
+            'search_async': '/api/async/search/',
+            'ai_planner_async': '/api/async/ai-planner/',
+            'ai_planner_stream': '/api/ai-planner/?format=sse (or ?format=ndjson)',
             'destinations': '/api/destinations/',
             'hotels': '/api/hotels/',
             'transports': '/api/transports/',
@@ -244,94 +464,275 @@ def api_status(request):
     else:
         status_info['amadeus']['message'] = 'API keys not set. Add AMADEUS_API_KEY and AMADEUS_API_SECRET to .env'
     
+    # Offer/response cache hit/miss and request coalescing counters
+    from .amadeus_service import flight_offer_cache, hotel_offer_cache, amadeus_calls
+    from .services import mock_inventory_cache
+    status_info['caches'] = {
+        'flight_offers': flight_offer_cache.stats(),
+        'hotel_offers': hotel_offer_cache.stats(),
+        'search_responses': search_response_cache.stats(),
+        'mock_inventory': mock_inventory_cache.stats(),
+    }
+    status_info['coalescing'] = amadeus_calls.stats()
+    status_info['search_history'] = search_history_writer.stats()
+    
     return Response(status_info)
 
 
-class AITravelPlannerView(APIView):
+PLANNER_REQUIRED_FIELDS = ['origin', 'destination', 'travel_type', 'budget', 'num_days', 'num_people']
+
+
+def _planner_missing_field(data):
+    """Return the first required planner field missing from data, if any"""
+    for field in PLANNER_REQUIRED_FIELDS:
+        if field not in data:
+            return field
+    return None
+
+
+def _planner_search_kwargs(data):
+    """get_recommendations arguments for a planner request"""
+    from datetime import datetime, timedelta
+    
+    # Calculate dates (use tomorrow as check_in for AI planning)
+    check_in = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+    check_out = (datetime.now() + timedelta(days=1 + int(data['num_days']))).strftime('%Y-%m-%d')
+    
+    return {
+        'origin': data.get('origin', ''),
+        'destination': data['destination'],
+        'check_in': check_in,
+        'check_out': check_out,
+        'people': int(data['num_people']),
+        'rooms': max(1, int(data['num_people']) // 2),
+        'budget': int(data.get('budget', 0))
+    }
+
+
+def _planner_cache_keys(data, search):
+    """
+    Cache keys that may hold recommendations for a planner request: the
+    search_id returned by a previous /api/search/, then the planner's own
+    search parameters. A stored search is only used if it matches the
+    planner's search (see matches_search).
+    """
+    keys = []
+    if data.get('search_id'):
+        keys.append(search_response_cache.key_for(data['search_id']))
+    keys.append(search_response_cache.make_key(search))
+    return [key for key in keys if key]
+
+
+def _stored_recommendations(data, search):
+    """Stored search results the planner can reuse without provider calls, if any"""
+    if not search_response_cache.enabled:
+        return None
+    for key in _planner_cache_keys(data, search):
+        cached = search_response_cache.get_entry(key)
+        if cached is not None and matches_search(cached.search, search):
+            return cached.response
+    return None
+
+
+async def _astored_recommendations(data, search):
+    """Async version of _stored_recommendations"""
+    if not search_response_cache.enabled:
+        return None
+    for key in _planner_cache_keys(data, search):
+        cached = await search_response_cache.aget_entry(key)
+        if cached is not None and matches_search(cached.search, search):
+            return cached.response
+    return None
+
+
+def _travel_plan_kwargs(data, recommendations):
+    """TravelPlannerService plan arguments from planner input and recommendations"""
+    # Debug: Log hotel count
+    print(f"AI Planner - Hotels found: {len(recommendations.get('hotels', []))}")
+    if recommendations.get('hotels'):
+        print(f"First hotel: {recommendations['hotels'][0].get('name')} - ${recommendations['hotels'][0].get('price_per_night')}/night")
+    
+    # Check if user explicitly set budget
+    user_set_budget = data.get('user_set_budget', False)
+    
+    return {
+        'origin': data['origin'],
+        'destination': data['destination'],
+        'travel_type': data['travel_type'],
+        'hotel_preference': data.get('hotel_preference', 'mid-range'),
+        'budget': int(data['budget']),
+        'num_days': int(data['num_days']),
+        'num_people': int(data['num_people']),
+        'hotels': recommendations.get('hotels', []),
+        'transports': recommendations.get('transports', []),
+        'attractions': recommendations.get('attractions', []),
+        'user_set_budget': user_set_budget
+    }
+
+
+def _build_travel_plan(data, recommendations, fields=None):
+    """Generate the smart travel plan from planner input and recommendations"""
+    from .ai_planner_service import TravelPlannerService
+    
+    # Generate smart travel plan
+    planner = TravelPlannerService()
+    plan = planner.generate_travel_plan(**_travel_plan_kwargs(data, recommendations), fields=fields)
+    
+    # Combine with recommendations
+    if wants(fields, 'recommendations'):
+        plan['recommendations'] = _project_search(recommendations, subfields(fields, 'recommendations'))
+    
+    return plan
+
+
+def _travel_plan_events(plan_kwargs, recommendations, fields=None):
+    """
+    (event, data) pairs of a streamed plan: the planner's summary,
+    accommodation, day, costs and tips events, then 'recommendations' and
+    'done'. A failure mid-stream ends it with an 'error' event.
+    """
+    from .ai_planner_service import TravelPlannerService
+    
+    try:
+        yield from TravelPlannerService().stream_travel_plan(**plan_kwargs, fields=fields)
+        if wants(fields, 'recommendations'):
+            yield 'recommendations', _project_search(recommendations, subfields(fields, 'recommendations'))
+        yield 'done', {'success': True}
+    except Exception as e:
+        import traceback
+        print(f"AI Planner Error: {str(e)}")
+        print(traceback.format_exc())
+        yield 'error', {'error': f'Failed to generate plan: {str(e)}'}
+
+
+def _planner_options():
+    """Conversation questions and travel types for the advanced search"""
+    from .ai_planner_service import TravelPlannerService
+    
+    planner = TravelPlannerService()
+    return {
+        'questions': planner.get_conversation_questions(),
+        'travel_types': planner.get_available_travel_types()
+    }
+
+
+class AITravelPlannerView(CompressedResponseMixin, APIView):
     """
     Smart travel planning endpoint using template-based generation.
     POST /api/ai-planner/
+    
+    With ?format=sse or ?format=ndjson (or a matching Accept header) the
+    plan is streamed day by day instead of returned as one JSON document.
+    ?fields=itinerary,cost_breakdown,recommendations.hotels (or ?include=)
+    limits the plan and recommendations to those fields.
     """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer, EventStreamRenderer, NDJSONRenderer]
     
     def get(self, request):
         """Get conversation questions for advanced search"""
-        from .ai_planner_service import TravelPlannerService
-        
-        planner = TravelPlannerService()
-        return Response({
-            'questions': planner.get_conversation_questions(),
-            'travel_types': planner.get_available_travel_types()
-        })
+        return Response(_planner_options())
     
     def post(self, request):
         """Generate smart travel plan"""
-        from .ai_planner_service import TravelPlannerService
-        
         try:
             data = request.data
             
             # Validate required fields
-            required_fields = ['origin', 'destination', 'travel_type', 'budget', 'num_days', 'num_people']
-            for field in required_fields:
-                if field not in data:
-                    return Response(
-                        {'error': f'Missing required field: {field}'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+            missing = _planner_missing_field(data)
+            if missing:
+                return Response(
+                    {'error': f'Missing required field: {missing}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
-            # Get travel recommendations first (hotels, transport, attractions)
-            service = TravelRecommendationService()
+            # Get travel recommendations first (hotels, transport, attractions),
+            # reusing a stored search when there is one
+            fields = _requested_fields(request, data)
+            search_fields = subfields(fields, 'recommendations')
+            search = _planner_search_kwargs(data)
+            recommendations = _stored_recommendations(data, search)
+            cache_status = 'HIT'
+            if recommendations is None:
+                cache_status = 'MISS'
+                service = TravelRecommendationService()
+                recommendations = service.get_recommendations(**search, fields=search_fields)
+                recommendations['search_id'] = search_response_cache.search_id(search)
+                if search_response_cache.enabled and _computes_all_sections(search, search_fields):
+                    search_response_cache.set(search_response_cache.make_key(search), recommendations, search)
             
-            # Calculate dates (use tomorrow as check_in for AI planning)
-            from datetime import datetime, timedelta
-            check_in = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
-            check_out = (datetime.now() + timedelta(days=1 + int(data['num_days']))).strftime('%Y-%m-%d')
+            if isinstance(request.accepted_renderer, StreamRenderer):
+                events = _travel_plan_events(_travel_plan_kwargs(data, recommendations), recommendations, fields)
+                return stream_response(request.accepted_renderer, events, headers={'X-Cache': cache_status})
             
-            recommendations = service.get_recommendations(
-                origin=data.get('origin', ''),
-                destination=data['destination'],
-                check_in=check_in,
-                check_out=check_out,
-                people=int(data['num_people']),
-                rooms=max(1, int(data['num_people']) // 2),
-                budget=int(data.get('budget', 0))
-            )
+            plan = _build_travel_plan(data, recommendations, fields)
             
-            # Debug: Log hotel count
-            print(f"AI Planner - Hotels found: {len(recommendations.get('hotels', []))}")
-            if recommendations.get('hotels'):
-                print(f"First hotel: {recommendations['hotels'][0].get('name')} - ${recommendations['hotels'][0].get('price_per_night')}/night")
+            return Response(plan, status=status.HTTP_200_OK, headers={'X-Cache': cache_status})
+        
+        except Exception as e:
+            import traceback
+            print(f"AI Planner Error: {str(e)}")
+            print(traceback.format_exc())
+            return Response(
+                {'error': f'Failed to generate plan: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAITravelPlannerView(CompressedResponseMixin, View):
+    """
+    Async variant of AITravelPlannerView for ASGI servers.
+    POST /api/async/ai-planner/
+    
+    Streams like AITravelPlannerView with ?format=sse|ndjson or a matching
+    Accept header.
+    """
+    
+    async def get(self, request):
+        """Get conversation questions for advanced search"""
+        return FastJsonResponse(_planner_options())
+    
+    async def post(self, request):
+        """Generate smart travel plan"""
+        try:
+            data = _parse_json_body(request)
+            if data is None:
+                return JsonResponse({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Generate smart travel plan
-            planner = TravelPlannerService()
+            missing = _planner_missing_field(data)
+            if missing:
+                return JsonResponse(
+                    {'error': f'Missing required field: {missing}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
-            # Check if user explicitly set budget
-            user_set_budget = data.get('user_set_budget', False)
+            fields = _requested_fields(request, data)
+            search_fields = subfields(fields, 'recommendations')
+            search = _planner_search_kwargs(data)
+            recommendations = await _astored_recommendations(data, search)
+            cache_status = 'HIT'
+            if recommendations is None:
+                cache_status = 'MISS'
+                service = TravelRecommendationService()
+                recommendations = await service.aget_recommendations(**search, fields=search_fields)
+                recommendations['search_id'] = search_response_cache.search_id(search)
+                if search_response_cache.enabled and _computes_all_sections(search, search_fields):
+                    await search_response_cache.aset(search_response_cache.make_key(search), recommendations, search)
             
-            plan = planner.generate_travel_plan(
-                origin=data['origin'],
-                destination=data['destination'],
-                travel_type=data['travel_type'],
-                hotel_preference=data.get('hotel_preference', 'mid-range'),
-                budget=int(data['budget']),
-                num_days=int(data['num_days']),
-                num_people=int(data['num_people']),
-                hotels=recommendations.get('hotels', []),
-                transports=recommendations.get('transports', []),
-                attractions=recommendations.get('attractions', []),
-                user_set_budget=user_set_budget
-            )
+            renderer = stream_renderer(request)
+            if renderer is not None:
+                events = _travel_plan_events(_travel_plan_kwargs(data, recommendations), recommendations, fields)
+                return stream_response(renderer, events, asynchronous=True, headers={'X-Cache': cache_status})
             
-            # Combine with recommendations
-            plan['recommendations'] = recommendations
+            plan = _build_travel_plan(data, recommendations, fields)
             
-            return Response(plan, status=status.HTTP_200_OK)
+            return FastJsonResponse(plan, status=status.HTTP_200_OK, headers={'X-Cache': cache_status})
         
         except Exception as e:
             import traceback
             print(f"AI Planner Error: {str(e)}")
             print(traceback.format_exc())
-            return Response(
+            return JsonResponse(
                 {'error': f'Failed to generate plan: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
@@ -74,6 +74,23 @@ else:
         }
     }
 
+# Cache - Redis when REDIS_URL is set (shared by all workers, needs the
+# 'redis' package), otherwise per-process local memory
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -135,6 +152,18 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# Default pagination for hotel/transport/attraction listings: 'page'
+# (page numbers with a total count) or 'cursor' (keyset, constant cost
+# for deep pages). Clients can override it with ?pagination=page|cursor
+CATALOG_PAGINATION = os.getenv('CATALOG_PAGINATION', 'page')
+
+# Search/planner responses: render JSON with orjson when installed, and
+# gzip/brotli-compress them when the client accepts it (streaming and
+# responses under the minimum size are sent as is)
+FAST_JSON_RENDERER = os.getenv('FAST_JSON_RENDERER', 'True').lower() == 'true'
+RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True').lower() == 'true'
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', '1024'))
+
 # ===========================================
 # API CONFIGURATION
 # ===========================================
@@ -145,8 +174,75 @@ REST_FRAMEWORK = {
 # - hybrid: Use Amadeus for flights, mock for hotels
 API_MODE = os.getenv('API_MODE', 'mock')
 
+# Seed mock data from the search key (same search, same results) with a
+# per-request RNG, and memoize generated inventories per (city, dates).
+# Useful for caching, load tests and comparable benchmark runs.
+MOCK_DETERMINISTIC = os.getenv('MOCK_DETERMINISTIC', 'False').lower() == 'true'
+MOCK_INVENTORY_CACHE_TTL = int(os.getenv('MOCK_INVENTORY_CACHE_TTL', '3600'))
+MOCK_INVENTORY_CACHE_SIZE = int(os.getenv('MOCK_INVENTORY_CACHE_SIZE', '1000'))
+
 # Amadeus API credentials
 AMADEUS_API_KEY = os.getenv('AMADEUS_API_KEY', '')
 AMADEUS_API_SECRET = os.getenv('AMADEUS_API_SECRET', '')
 AMADEUS_PRODUCTION = os.getenv('AMADEUS_PRODUCTION', 'False').lower() == 'true'
 
+
+# ===========================================
+# SEARCH PIPELINE
+# ===========================================
+
+# Run provider calls (hotels, transport, local transport, attractions)
+# concurrently on a shared thread pool instead of one after another.
+SEARCH_CONCURRENT = os.getenv('SEARCH_CONCURRENT', 'True').lower() == 'true'
+SEARCH_MAX_WORKERS = int(os.getenv('SEARCH_MAX_WORKERS', '16'))
+# Overall deadline for one search; providers that miss it return no results.
+# Amadeus HTTP timeouts are cut to the time left before it.
+SEARCH_DEADLINE_SECONDS = float(os.getenv('SEARCH_DEADLINE_SECONDS', '20'))
+# Number of budget-optimal bundles (hotel + transport + local transport +
+# attractions) returned by searches with a budget (0 disables)
+SEARCH_BUNDLES = int(os.getenv('SEARCH_BUNDLES', '3'))
+
+# Amadeus HTTP client: pooled keep-alive connections with retries on 429/5xx
+AMADEUS_POOL_SIZE = int(os.getenv('AMADEUS_POOL_SIZE', '20'))
+AMADEUS_MAX_RETRIES = int(os.getenv('AMADEUS_MAX_RETRIES', '3'))
+AMADEUS_BACKOFF_FACTOR = float(os.getenv('AMADEUS_BACKOFF_FACTOR', '0.5'))
+AMADEUS_CONNECT_TIMEOUT = float(os.getenv('AMADEUS_CONNECT_TIMEOUT', '5'))
+AMADEUS_READ_TIMEOUT = float(os.getenv('AMADEUS_READ_TIMEOUT', '30'))
+
+# OAuth token cache: 'local' (per process) or 'django' (Django cache framework,
+# shared by all workers when CACHES points at Redis)
+AMADEUS_TOKEN_CACHE = os.getenv('AMADEUS_TOKEN_CACHE', 'local')
+# Seconds before expiry at which a token is refreshed
+AMADEUS_TOKEN_REFRESH_MARGIN = int(os.getenv('AMADEUS_TOKEN_REFRESH_MARGIN', '60'))
+
+# In-memory LRU size for city name -> IATA code lookups (backed by the
+# CityCode table; preload with `python manage.py load_city_codes file.csv`)
+CITY_CODE_CACHE_SIZE = int(os.getenv('CITY_CODE_CACHE_SIZE', '2048'))
+
+# Flight/hotel offer caches (seconds, 0 disables). Stale entries are served
+# for OFFER_CACHE_STALE_TTL more seconds while a background refresh runs.
+FLIGHT_OFFER_CACHE_TTL = int(os.getenv('FLIGHT_OFFER_CACHE_TTL', '300'))
+HOTEL_OFFER_CACHE_TTL = int(os.getenv('HOTEL_OFFER_CACHE_TTL', '900'))
+OFFER_CACHE_STALE_TTL = int(os.getenv('OFFER_CACHE_STALE_TTL', '600'))
+OFFER_CACHE_MAX_ENTRIES = int(os.getenv('OFFER_CACHE_MAX_ENTRIES', '1000'))
+
+# Whole /api/search/ responses, cached in CACHES[SEARCH_RESPONSE_CACHE_ALIAS]
+# per API_MODE and keyed on the normalized search (seconds, 0 disables)
+SEARCH_RESPONSE_CACHE_TTL = int(os.getenv('SEARCH_RESPONSE_CACHE_TTL', '120'))
+SEARCH_RESPONSE_CACHE_ALIAS = os.getenv('SEARCH_RESPONSE_CACHE_ALIAS', 'default')
+
+# Batched hotel pricing: price up to AMADEUS_HOTEL_MAX_CANDIDATES hotels per
+# search in chunks of AMADEUS_HOTEL_BATCH_SIZE IDs, fetched concurrently.
+# Off by default because each chunk counts against the Amadeus quota.
+AMADEUS_HOTEL_BATCHING = os.getenv('AMADEUS_HOTEL_BATCHING', 'False').lower() == 'true'
+AMADEUS_HOTEL_MAX_CANDIDATES = int(os.getenv('AMADEUS_HOTEL_MAX_CANDIDATES', '50'))
+AMADEUS_HOTEL_BATCH_SIZE = int(os.getenv('AMADEUS_HOTEL_BATCH_SIZE', '10'))
+AMADEUS_HOTEL_BATCH_CONCURRENCY = int(os.getenv('AMADEUS_HOTEL_BATCH_CONCURRENCY', '4'))
+
+# Search history is queued in memory and written with bulk_create in batches
+# of SEARCH_HISTORY_BATCH_SIZE or every SEARCH_HISTORY_FLUSH_INTERVAL seconds.
+# Entries beyond SEARCH_HISTORY_MAX_QUEUE are dropped (see /api/api-status/).
+SEARCH_HISTORY_BUFFERED = os.getenv('SEARCH_HISTORY_BUFFERED', 'True').lower() == 'true'
+SEARCH_HISTORY_BATCH_SIZE = int(os.getenv('SEARCH_HISTORY_BATCH_SIZE', '100'))
+SEARCH_HISTORY_FLUSH_INTERVAL = float(os.getenv('SEARCH_HISTORY_FLUSH_INTERVAL', '2'))
+SEARCH_HISTORY_MAX_QUEUE = int(os.getenv('SEARCH_HISTORY_MAX_QUEUE', '10000'))
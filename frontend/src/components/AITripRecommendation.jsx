@@ -70,6 +70,7 @@ function AITripRecommendation({ searchData, results }) {
         num_people: searchData.people || 2,
         budget: budget,
         user_set_budget: userSetBudget, // Flag to indicate if user explicitly set budget
+        search_id: results?.search_id, // Reuse this search's hotels/transports instead of fetching again
       };
       
       console.log('Generating AI trip plan:', planData);